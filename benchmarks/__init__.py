@@ -0,0 +1 @@
+"""성능 측정 모음. 실행 방법은 benchmarks/run.py 참고."""
@@ -0,0 +1,75 @@
+"""
+측정용 Gemini 대역(stub)
+
+google.generativeai.GenerativeModel.generate_content 를 바꿔 끼워 네트워크 없이 항상 같은 응답을 돌려준다.
+응답은 요청한 response_schema 에 맞는 JSON(없으면 글머리 기호 두 줄)이며, 프롬프트에 따라서만 정해진다.
+스키마는 최상위 속성 이름으로 구분하므로 REST 요청 본문의 responseSchema 에도 그대로 쓸 수 있다
+(benchmarks/mock_gemini.py).
+latency 초만큼 기다린 뒤 응답하고, 스트리밍은 첫 조각까지 latency, 이후 조각마다 chunk_latency 를 기다린다.
+"""
+import hashlib
+import json
+import time
+from types import SimpleNamespace
+
+import google.generativeai as genai
+
+ALL_MONTHS = [f"{m}월" for m in (3, 4, 5, 6, 7, 8, 9, 10, 11, 12)]
+STREAM_CHUNKS = 4
+
+
+def _tag(prompt):
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:6]
+
+
+def stub_text(prompt, response_schema=None):
+    """프롬프트와 스키마에 대한 고정 응답."""
+    tag = _tag(prompt)
+    activity = {"name": "활동", "description": f"교사의 시범을 보고 따라 하기 ({tag})"}
+    properties = set((response_schema or {}).get("properties") or ())
+    if "monthly_goals" in properties:
+        data = {
+            "semester_goal": f"일상생활에서 필요한 기능을 익혀 스스로 수행할 수 있다. ({tag})",
+            "monthly_goals": [
+                {"month": month, "goal": f"{month}에는 교사의 도움을 받아 과제를 수행할 수 있다.", "standards": []}
+                for month in ALL_MONTHS
+            ],
+        }
+    elif "monthly_activities" in properties:
+        data = {"monthly_activities": [{"month": month, "activities": [activity, activity]} for month in ALL_MONTHS]}
+    elif "goal" in properties:
+        data = {"goal": f"교사의 도움을 받아 과제를 수행할 수 있다. ({tag})", "standards": []}
+    elif "activities" in properties:
+        data = {"activities": [activity, activity]}
+    else:
+        return f"- 주어진 과제를 교사의 도움을 받아 수행함 ({tag})\n- 활동에 적극적으로 참여함"
+    return json.dumps(data, ensure_ascii=False)
+
+
+def install(latency=0.0, chunk_latency=0.0):
+    """generate_content 를 대역으로 바꾼다. 반환값: 호출된 프롬프트를 모으는 목록."""
+    calls = []
+
+    def usage(prompt, text):
+        return SimpleNamespace(prompt_token_count=len(prompt) // 2, candidates_token_count=len(text) // 2)
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        calls.append(prompt)
+        text = stub_text(prompt, (generation_config or {}).get("response_schema"))
+        time.sleep(latency)
+        if not stream:
+            return SimpleNamespace(text=text, usage_metadata=usage(prompt, text))
+
+        size = -(-len(text) // STREAM_CHUNKS)
+        parts = [text[i:i + size] for i in range(0, len(text), size)]
+
+        def chunks():
+            for i, part in enumerate(parts):
+                if i:
+                    time.sleep(chunk_latency)
+                last = i == len(parts) - 1
+                yield SimpleNamespace(text=part, usage_metadata=usage(prompt, text) if last else None)
+        return chunks()
+
+    genai.GenerativeModel.generate_content = generate_content
+    return calls
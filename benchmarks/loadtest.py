@@ -0,0 +1,412 @@
+"""
+다중 사용자 부하 시험
+
+교사 N명이 동시에 앱을 쓰는 상황을 한 프로세스 안에서 흉내 낸다. 세션마다 스레드 하나가
+Streamlit AppTest 로 실제 페이지 스크립트를 순서대로 실행하고, Gemini 는 benchmarks.mock_gemini 의
+로컬 대역 서버(REST)로 보낸다. 스케줄러·응답 캐시·API 키별 클라이언트는 실제 서버처럼 세션들이 함께 쓴다.
+
+    python -m benchmarks.loadtest --sessions 1 4 8 16 --latency 1.5 --jitter 0.5 --error-rate 0.05 --out load.json
+
+세션 하나의 순서 (단계 이름)
+    login                사용자 확인(check_user)
+    planning_setup       계획 페이지 열기, 교과·학년군 선택
+    planning_checklist   ① 체크리스트 평가 입력
+    planning_generate    ② ~ ⑥ 전체 자동 생성
+    planning_export      ⑦ IEP 문서 만들기
+    evaluation_month     평가 페이지에서 한 달 평가초점·종합 평가 생성 (--months 번)
+    evaluation_semester  학기 종합 평가 생성
+    evaluation_export    평가 보고서 문서 만들기
+    meeting_generate     회의록 의결 사항 보완 생성
+    meeting_export       회의록 문서 만들기
+
+동시 세션 수(--sessions)마다 단계별 p50/p99 지연 시간과 오류율, 처리량, 세션당 메모리(RSS 증가분),
+대역 서버가 받은 요청·429 수, utils.telemetry 의 Gemini 호출 집계를 JSON 으로 낸다.
+
+세션마다 다른 API 키를 쓰므로(교사가 메인 화면에서 각자 키를 넣는 경우) 키별 분당 요청 제한은
+세션마다 따로 걸린다. 학교 키 하나를 함께 쓰는 경우는 --shared-key 로 잰다.
+AppTest 는 실행할 때마다 Streamlit 의 전역 Runtime·secrets 와 스크립트 캐시를 새로 만들므로, 여러 세션을
+동시에 돌리려고 이들은 시작할 때 한 번만 만들어 두고 모든 세션이 함께 쓴다(실제 서버도 하나씩만 둔다).
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+_WORK_DIR = tempfile.mkdtemp(prefix="iep-load-")
+for _name, _file in (("IEP_LLM_CACHE_PATH", "llm_responses.sqlite"), ("IEP_LLM_EVENTS_PATH", "llm_events.jsonl"),
+                     ("IEP_DRAFTS_PATH", "drafts.sqlite")):
+    os.environ.setdefault(_name, os.path.join(_WORK_DIR, _file))
+
+import streamlit as st  # noqa: E402
+from streamlit import config  # noqa: E402
+from streamlit.components.v2.component_manager import BidiComponentManager  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner  # noqa: E402
+
+from benchmarks.mock_gemini import MockGeminiServer  # noqa: E402
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(ROOT_DIR, "main_app.py")
+MEETING_PAGE = os.path.join(ROOT_DIR, "pages", "1_iep_meeting.py")
+PLANNING_PAGE = os.path.join(ROOT_DIR, "pages", "2_iep_planning.py")
+EVALUATION_PAGE = os.path.join(ROOT_DIR, "pages", "3_iep_evaluation.py")
+
+APP_TIMEOUT = 900
+LOADTEST_ORG = "부하시험학교"
+SHARED_API_KEY = "loadtest-shared"
+PLANNING_SUBJECT = "국어"
+EVALUATION_MONTHS = ["3월", "4월", "5월", "6월", "7월"]
+STEPS = (
+    "login", "planning_setup", "planning_checklist", "planning_generate", "planning_export",
+    "evaluation_month", "evaluation_semester", "evaluation_export", "meeting_generate", "meeting_export",
+)
+MEMORY_SAMPLE_SECONDS = 0.2
+
+
+class StepFailed(Exception):
+    """단계가 화면에 오류를 내거나 기대한 결과를 만들지 못함."""
+
+
+# --- Streamlit 전역 상태 ---
+def install_shared_runtime(num_users):
+    """모든 세션이 함께 쓸 Runtime·secrets·스크립트 캐시를 한 번 설치하고, AppTest 가 실행마다 바꾸지 않게 한다."""
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    components = BidiComponentManager()
+    components.discover_and_register_components(start_file_watching=False)
+    runtime.bidi_component_registry = components
+    Runtime._instance = runtime
+    app_test.Runtime = SimpleNamespace(_instance=runtime)
+    # 스크립트는 한 번만 컴파일함 (여러 스레드가 동시에 ast.parse 하면 Python 3.11 에서 깨짐)
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+    secrets = Secrets()
+    secrets._secrets = {
+        "GEMINI_API_KEY": SHARED_API_KEY,
+        "approved_users": {f"user{i}": {"org": LOADTEST_ORG, "name": f"교사{i}"} for i in range(num_users)},
+    }
+    st.secrets = secrets
+    config.set_option("global.appTest", True)
+
+
+# --- 세션 ---
+class TeacherSession:
+    def __init__(self, index, months, think_time, shared_key, record):
+        self.index = index
+        self.name = f"교사{index}"
+        self.months = months
+        self.think_time = think_time
+        self.shared_key = shared_key
+        self.record = record  # record(단계, ms, 오류 문자열 또는 None)
+        self.random = random.Random(index)
+        self.state = {}
+
+    def app(self, script):
+        at = AppTest.from_file(script, default_timeout=APP_TIMEOUT)
+        for key, value in self.state.items():
+            at.session_state[key] = value
+        return at
+
+    @contextmanager
+    def step(self, name, at=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+            if at is not None:
+                if at.exception:
+                    raise StepFailed(at.exception[0].value)
+                if at.error:
+                    raise StepFailed(at.error[0].value)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.record(name, (time.perf_counter() - started) * 1000, error)
+        if error:
+            raise StepFailed(error)
+        if self.think_time:
+            time.sleep(self.random.uniform(0, 2 * self.think_time))
+
+    def run(self):
+        """한 교사의 전체 작업. 한 단계가 실패하면 그 세션의 나머지는 건너뛴다."""
+        try:
+            self.login()
+            self.planning()
+            self.evaluation()
+            self.meeting()
+            return True
+        except StepFailed:
+            return False
+
+    def login(self):
+        at = AppTest.from_file(MAIN_SCRIPT, default_timeout=APP_TIMEOUT)
+        with self.step("login", at):
+            at.run()
+            at.text_input[0].set_value(LOADTEST_ORG)
+            at.text_input[1].set_value(self.name)
+            at.button[0].click().run()
+            if not at.session_state["is_approved"]:
+                raise StepFailed("사용자 확인 실패")
+        self.state = {
+            "is_approved": True,
+            "approved_user": at.session_state["approved_user"],
+            "draft_label": f"학생{self.index}",
+        }
+        if not self.shared_key:
+            self.state["user_api_key"] = f"loadtest-{self.index}"
+
+    def planning(self):
+        at = self.app(PLANNING_PAGE)
+        with self.step("planning_setup", at):
+            at.run()
+            at.selectbox(key="subject_selector").set_value(PLANNING_SUBJECT).run()
+            grades = at.multiselect(key="grades_selector").options
+            at.multiselect(key="grades_selector").set_value([self.random.choice(grades)]).run()
+
+        with self.step("planning_checklist", at):
+            # 학생마다 다른 평가 결과 → 프롬프트가 달라 응답 캐시를 함께 쓰지 않음
+            for radio in (r for r in at.radio if r.key and r.key.startswith("[")):
+                radio.set_value(self.random.choice(radio.options))
+            at.run()
+
+        with self.step("planning_generate", at):
+            at.button(key="btn_pipeline").click().run()
+            if not at.session_state["evaluation_plan"]:
+                raise StepFailed("평가계획이 생성되지 않음")
+
+        with self.step("planning_export", at):
+            at.text_input(key="student_name").set_value(f"학생{self.index}")
+            at.text_input(key="student_class_info").set_value("3-2")
+            next(b for b in at.button if b.label.startswith("📄 IEP 문서")).click().run()
+            if not at.get("download_button"):
+                raise StepFailed("IEP 문서가 생성되지 않음")
+
+    def evaluation(self):
+        at = self.app(EVALUATION_PAGE)
+        at.run()
+        for month in EVALUATION_MONTHS[:self.months]:
+            with self.step("evaluation_month", at):
+                at.text_area(key=f"goal_{month}").set_value(f"{month} 목표: 낱말 읽기 ({self.name})")
+                at.text_area(key=f"instructional_{month}").set_value(f"{month} 그림 카드로 낱말 읽기 활동")
+                at.run()
+                at.button(key=f"btn_gen_focus_{month}").click().run()
+                at.button(key=f"btn_ai_{month}").click().run()
+                if month not in at.session_state["evaluations_ai"]:
+                    raise StepFailed(f"{month} 평가가 생성되지 않음")
+
+        with self.step("evaluation_semester", at):
+            at.button(key="btn_semester_eval").click().run()
+
+        with self.step("evaluation_export", at):
+            at.button(key="btn_download_eval").click().run()
+            if not at.get("download_button"):
+                raise StepFailed("평가 보고서가 생성되지 않음")
+
+    def meeting(self):
+        at = self.app(MEETING_PAGE)
+        at.run()
+        with self.step("meeting_generate", at):
+            at.text_area(key="resolution_input").set_value(f"{self.name} 학생 지원 방안을 협의함").run()
+            at.button(key="btn_resolution_ai").click().run()
+
+        with self.step("meeting_export", at):
+            next(b for b in at.button if b.label.startswith("📄 워드 파일")).click().run()
+            if not at.get("download_button"):
+                raise StepFailed("회의록 문서가 생성되지 않음")
+
+
+# --- 측정 ---
+def current_rss_mb():
+    """현재 RSS(MB). /proc 이 없으면 최대 RSS 로 대신한다."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MemorySampler:
+    def __init__(self):
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(MEMORY_SAMPLE_SECONDS):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+def step_summary(samples):
+    from utils.telemetry import percentile
+
+    summary = {}
+    for name in STEPS:
+        rows = samples.get(name, [])
+        if not rows:
+            continue
+        latencies = [ms for ms, error in rows if error is None]
+        errors = [error for _, error in rows if error is not None]
+        summary[name] = {
+            "count": len(rows),
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(rows), 4),
+            "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+            "sample_error": errors[0] if errors else None,
+        }
+    return summary
+
+
+def run_level(num_sessions, args, server):
+    from utils.llm_cache import get_response_cache
+    from utils.telemetry import load_events, summarize
+
+    # 단계마다 새 응답을 받도록 이전 단계의 캐시를 비움
+    get_response_cache().clear()
+    server.reset_stats()
+    gc.collect()
+    base_rss = current_rss_mb()
+    samples = {}
+    lock = threading.Lock()
+
+    def record(step, ms, error):
+        with lock:
+            samples.setdefault(step, []).append((ms, error))
+
+    def run_session(index):
+        # 한꺼번에 몰리지 않도록 --ramp 초 동안 나눠 시작
+        time.sleep(args.ramp * index / max(1, num_sessions))
+        completed = 0
+        for _ in range(args.iterations):
+            completed += TeacherSession(index, args.months, args.think_time, args.shared_key, record).run()
+        return completed
+
+    started_at = time.time()
+    started = time.perf_counter()
+    with MemorySampler() as memory, ThreadPoolExecutor(max_workers=num_sessions) as executor:
+        completed = sum(executor.map(run_session, range(num_sessions)))
+    elapsed = time.perf_counter() - started
+
+    steps = sum(len(rows) for rows in samples.values())
+    failed = sum(1 for rows in samples.values() for _, error in rows if error is not None)
+    return {
+        "sessions": num_sessions,
+        "elapsed_s": round(elapsed, 2),
+        "sessions_completed": completed,
+        "sessions_failed": num_sessions * args.iterations - completed,
+        "throughput_sessions_per_min": round(completed / elapsed * 60, 2),
+        "throughput_steps_per_s": round(steps / elapsed, 3),
+        "error_rate": round(failed / steps, 4) if steps else 0.0,
+        "memory": {
+            "base_rss_mb": round(base_rss, 1),
+            "peak_rss_mb": round(memory.peak, 1),
+            "per_session_mb": round((memory.peak - base_rss) / num_sessions, 2),
+        },
+        "steps": step_summary(samples),
+        "mock_server": server.stats(),
+        "llm": summarize(load_events(since=started_at), "page"),
+    }
+
+
+def print_level(level):
+    print(
+        f"\n== {level['sessions']} sessions: {level['elapsed_s']}s, "
+        f"{level['throughput_sessions_per_min']} sessions/min, error rate {level['error_rate']:.1%}, "
+        f"{level['memory']['per_session_mb']} MB/session, "
+        f"429s {level['mock_server']['rate_limited']}/{level['mock_server']['requests']}",
+        file=sys.stderr
+    )
+    print(f"{'step':<22}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}", file=sys.stderr)
+    for name, row in level["steps"].items():
+        p50 = f"{row['p50_ms']:.0f}" if row["p50_ms"] is not None else "-"
+        p99 = f"{row['p99_ms']:.0f}" if row["p99_ms"] is not None else "-"
+        print(f"{name:<22}{row['count']:>7}{p50:>10}{p99:>10}{row['errors']:>8}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IEP 앱 다중 사용자 부하 시험 (로컬 Gemini 대역 서버 사용)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="차례로 잴 동시 세션 수")
+    parser.add_argument("--iterations", type=int, default=1, help="세션마다 전체 작업을 되풀이할 횟수")
+    parser.add_argument("--months", type=int, default=2, choices=range(1, len(EVALUATION_MONTHS) + 1),
+                        help="평가 페이지에서 생성할 월 수")
+    parser.add_argument("--think-time", type=float, default=0.0, help="단계 사이 평균 대기(초)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="세션 시작을 나눠 둘 시간(초)")
+    parser.add_argument("--shared-key", action="store_true", help="모든 세션이 secrets 의 키 하나를 함께 씀")
+    parser.add_argument("--latency", type=float, default=1.0, help="대역 서버 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="지연 흔들림(± 초)")
+    parser.add_argument("--chunk-latency", type=float, default=0.05, help="스트리밍 조각 사이 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버가 429 로 답할 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 파일 (생략하면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    server = MockGeminiServer(
+        latency=args.latency, jitter=args.jitter, chunk_latency=args.chunk_latency,
+        error_rate=args.error_rate, seed=args.seed
+    ).start()
+    # utils.llm 은 가져올 때 주소를 읽으므로 앱 모듈을 불러오기 전에 정해 둠
+    os.environ["IEP_GEMINI_ENDPOINT"] = server.url
+    install_shared_runtime(max(args.sessions))
+
+    levels = []
+    try:
+        # 모듈·성취기준 인덱스·템플릿을 먼저 불러 두어 첫 단계의 시간과 메모리에 섞이지 않게 함
+        print("[load] warm-up session ...", file=sys.stderr, flush=True)
+        TeacherSession(0, 1, 0.0, args.shared_key, lambda *row: None).run()
+        for num_sessions in args.sessions:
+            print(f"[load] {num_sessions} sessions ...", file=sys.stderr, flush=True)
+            levels.append(run_level(num_sessions, args, server))
+            print_level(levels[-1])
+    finally:
+        server.stop()
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "mock": {"latency": args.latency, "jitter": args.jitter, "chunk_latency": args.chunk_latency,
+                     "error_rate": args.error_rate},
+            "iterations": args.iterations,
+            "months": args.months,
+            "think_time": args.think_time,
+            "shared_key": args.shared_key,
+        },
+        "levels": levels,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+부하 시험용 Gemini 대역 서버
+
+Gemini REST API 의 generateContent / streamGenerateContent 만 흉내 내는 로컬 HTTP 서버.
+응답 내용은 benchmarks.genai_stub.stub_text 와 같고, 지연 시간과 429 오류를 일부러 넣을 수 있다.
+앱은 IEP_GEMINI_ENDPOINT=http://127.0.0.1:<port> 로 이 서버를 쓴다(utils.llm 이 REST 로 연결).
+
+    python -m benchmarks.mock_gemini --port 8765 --latency 1.5 --jitter 0.5 --error-rate 0.05
+
+- latency/jitter : 응답 전 latency ± jitter 초 기다림. 스트리밍은 첫 조각 전에 기다리고 조각 사이에는 chunk_latency.
+- error_rate     : 이 비율의 요청에 429 RESOURCE_EXHAUSTED 로 답함(지연 없이).
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.genai_stub import STREAM_CHUNKS, stub_text
+
+_PATH_RE = re.compile(r"^/v1beta/models/[^:/]+:(generateContent|streamGenerateContent)")
+
+
+def _response_body(text, prompt, final=True):
+    body = {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+    if final:
+        body["candidates"][0]["finishReason"] = "STOP"
+        body["usageMetadata"] = {
+            "promptTokenCount": len(prompt) // 2,
+            "candidatesTokenCount": len(text) // 2,
+            "totalTokenCount": (len(prompt) + len(text)) // 2,
+        }
+    return body
+
+
+class MockGeminiServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, chunk_latency=0.0, error_rate=0.0,
+                 seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_latency = chunk_latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "streams": 0, "rate_limited": 0, "in_flight": 0, "max_in_flight": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.update(requests=0, streams=0, rate_limited=0, max_in_flight=self._stats["in_flight"])
+
+    def _admit(self, stream):
+        """요청 하나를 세고, (429 로 답할지, 기다릴 시간)을 정한다."""
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["streams"] += int(stream)
+            if self._random.random() < self.error_rate:
+                self._stats["rate_limited"] += 1
+                return True, 0.0
+            self._stats["in_flight"] += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._stats["in_flight"])
+            return False, max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _done(self):
+        with self._lock:
+            self._stats["in_flight"] -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                match = _PATH_RE.match(self.path)
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                if match is None:
+                    self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+                    return
+
+                stream = match.group(1) == "streamGenerateContent"
+                limited, delay = server._admit(stream)
+                if limited:
+                    self._send_json(429, {"error": {
+                        "code": 429, "message": "Resource has been exhausted (mock).", "status": "RESOURCE_EXHAUSTED"
+                    }})
+                    return
+
+                try:
+                    prompt = "".join(
+                        part.get("text", "") for content in request.get("contents") or [] for part in content.get("parts") or []
+                    )
+                    schema = (request.get("generationConfig") or {}).get("responseSchema")
+                    text = stub_text(prompt, schema)
+                    time.sleep(delay)
+                    if not stream:
+                        self._send_json(200, _response_body(text, prompt))
+                        return
+                    self._stream(text, prompt)
+                finally:
+                    server._done()
+
+            def _stream(self, text, prompt):
+                # REST 스트리밍 응답은 JSON 배열을 조금씩 보내는 형태
+                size = -(-len(text) // STREAM_CHUNKS)
+                parts = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                self.wfile.write(b"[")
+                for i, part in enumerate(parts):
+                    if i:
+                        time.sleep(server.chunk_latency)
+                        self.wfile.write(b",\r\n")
+                    body = _response_body(part, prompt, final=i == len(parts) - 1)
+                    self.wfile.write(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"]")
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="부하 시험용 Gemini 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 흔들림(± 초)")
+    parser.add_argument("--chunk-latency", type=float, default=0.05, help="스트리밍 조각 사이 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 로 답할 요청 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockGeminiServer(args.host, args.port, args.latency, args.jitter, args.chunk_latency, args.error_rate,
+                              args.seed)
+    print(f"mock Gemini: {server.url}  (IEP_GEMINI_ENDPOINT={server.url})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
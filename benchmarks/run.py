@@ -0,0 +1,272 @@
+"""
+성능 측정 실행기
+
+화면 없이(Streamlit AppTest) 페이지를 돌리고 주요 함수를 재어, 결과를 JSON 으로 내보낸다.
+Gemini 는 benchmarks.genai_stub 의 대역으로 바꾸므로 API 키나 네트워크가 필요 없다.
+
+    python -m benchmarks.run --out bench_before.json
+    python -m benchmarks.run --out bench_after.json --compare bench_before.json
+    python -m benchmarks.run --only docx --repeat 20
+    python -m benchmarks.run --latency 0.5 --only pipeline
+
+측정 항목
+- planning_rerun[grades=N] : 학년군 N개(1/2/4)를 고른 상태에서 2_iep_planning.py 전체 다시 실행
+- planning_pipeline        : ② ~ ⑥ 전체 자동 생성 (대역 지연 --latency 포함)
+- curriculum_load          : data/ 전체로 성취기준 인덱스 새로 만들기
+- parse_monthly_data       : ⑤ 탭의 월별 계획 묶기(build_monthly_plan), 10개 월
+- docx_iep / docx_evaluation / docx_meeting : 실제 크기의 문서 한 건 만들기 (렌더 캐시를 거치지 않음)
+
+각 항목은 --warmup 번 버린 뒤 --repeat 번 잰 값(ms)의 최소·중앙값·평균·최대를 기록한다.
+캐시와 임시 저장 파일은 임시 폴더에 만들어 실제 .cache/ 를 건드리지 않는다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_WORK_DIR = tempfile.mkdtemp(prefix="iep-bench-")
+for _name, _file in (("IEP_LLM_CACHE_PATH", "llm_responses.sqlite"), ("IEP_LLM_EVENTS_PATH", "llm_events.jsonl"),
+                     ("IEP_DRAFTS_PATH", "drafts.sqlite")):
+    os.environ.setdefault(_name, os.path.join(_WORK_DIR, _file))
+os.environ.setdefault("IEP_LLM_RATE_PER_MINUTE", "100000")
+os.environ.setdefault("IEP_LLM_RATE_BURST", "1000")
+
+import streamlit  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks import genai_stub  # noqa: E402
+from utils.curriculum import DATA_DIR, CurriculumIndex  # noqa: E402
+from utils.documents import (  # noqa: E402
+    build_evaluation_docx,
+    build_evaluation_report,
+    build_iep_docx,
+    build_meeting_docx,
+    build_plan_rows,
+)
+from utils.llm_cache import get_response_cache  # noqa: E402
+from utils.planning import MONTHS_IN_SEMESTER, RATING_VALUES, build_monthly_plan  # noqa: E402
+
+PLANNING_PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "2_iep_planning.py")
+PLANNING_SUBJECT = "국어"
+GRADE_COUNTS = (1, 2, 4)
+APP_TIMEOUT = 300
+ALL_MONTHS = MONTHS_IN_SEMESTER["1학기"] + MONTHS_IN_SEMESTER["2학기"]
+
+# 실제 문서 한 칸에 들어가는 정도의 글
+GOAL_TEXT = "교사의 언어적 촉진과 시각 자료의 도움을 받아 일상생활에서 자주 쓰는 낱말을 읽고 뜻을 말할 수 있다. " * 2
+CONTENT_TEXT = "\n".join(
+    f"**활동 {i}:** 그림 카드와 실물을 짝지으며 낱말을 소리 내어 읽고, 친구와 번갈아 묻고 답하기" for i in range(1, 5)
+)
+CRITERIA_TEXT = "\n".join(f"- 평가 초점 {i}: 교사의 도움 정도에 따라 과제 수행 여부를 관찰하여 기록함" for i in range(1, 4))
+EVAL_TEXT = "\n".join(f"- 교사의 시범 후 {i}단계 과제를 스스로 수행하는 모습을 보임" for i in range(1, 6))
+
+
+# --- 측정 ---
+def measure(fn, repeat, warmup):
+    """fn(i) 를 warmup 번 버리고 repeat 번 잰 ms 목록."""
+    for i in range(warmup):
+        fn(-1 - i)
+    runs = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        runs.append((time.perf_counter() - started) * 1000)
+    return runs
+
+
+def summarize_runs(runs):
+    return {
+        "runs_ms": [round(ms, 4) for ms in runs],
+        "min_ms": round(min(runs), 4),
+        "median_ms": round(statistics.median(runs), 4),
+        "mean_ms": round(statistics.fmean(runs), 4),
+        "max_ms": round(max(runs), 4),
+    }
+
+
+# --- 항목 ---
+def planning_app(grade_count):
+    """학년군 grade_count 개를 고르고 한 번 그린 planning 페이지."""
+    at = AppTest.from_file(PLANNING_PAGE, default_timeout=APP_TIMEOUT)
+    at.secrets["GEMINI_API_KEY"] = "benchmark"
+    at.run()
+    at.selectbox(key="subject_selector").set_value(PLANNING_SUBJECT).run()
+    grades = at.multiselect(key="grades_selector").options[:grade_count]
+    if len(grades) < grade_count:
+        raise RuntimeError(f"{PLANNING_SUBJECT} 학년군이 {grade_count}개보다 적습니다.")
+    at.multiselect(key="grades_selector").set_value(grades).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def bench_planning_rerun(grade_count):
+    at = planning_app(grade_count)
+    return lambda i: at.run()
+
+
+def bench_planning_pipeline():
+    at = planning_app(1)
+    for i, radio in enumerate(r for r in at.radio if r.key and r.key.startswith("[")):
+        radio.set_value(RATING_VALUES[i % len(RATING_VALUES)])
+    at.run()
+
+    def run(i):
+        # 매번 Gemini 대역까지 가도록 응답 캐시를 비움
+        get_response_cache().clear()
+        at.button(key="btn_pipeline").click().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return run
+
+
+def bench_curriculum_load():
+    return lambda i: CurriculumIndex(DATA_DIR)
+
+
+def sample_goal_plan():
+    return {
+        "semester": "1학기",
+        "semester_goal": GOAL_TEXT,
+        "months": {month: {"goal": GOAL_TEXT, "standards": ["[6국01-01]", "[6국01-02]"]} for month in ALL_MONTHS},
+    }
+
+
+def bench_parse_monthly_data(number=1000):
+    goal_plan = sample_goal_plan()
+    content_plan = {month: CONTENT_TEXT for month in ALL_MONTHS}
+
+    def run(i):
+        for _ in range(number):
+            build_monthly_plan(goal_plan, content_plan, ALL_MONTHS)
+    return run, number
+
+
+def bench_docx_iep():
+    monthly_plan = {
+        month: {"goal": GOAL_TEXT, "content": CONTENT_TEXT, "methods": ["직접 교수법", "모델링 (시범)"], "other_method": ""}
+        for month in ALL_MONTHS
+    }
+    evaluation_plan = {month: {"methods": ["관찰누가기록", "체크리스트"], "criteria": CRITERIA_TEXT} for month in ALL_MONTHS}
+    rows = build_plan_rows(PLANNING_SUBJECT, monthly_plan, evaluation_plan)
+    summary = "\n".join(f"- {GOAL_TEXT}" for _ in range(6))
+    # 학생 이름을 바꿔 렌더 캐시를 거치지 않고 매번 새로 만듦
+    return lambda i: build_iep_docx(f"학생{i}", "3-2", PLANNING_SUBJECT, summary, rows)
+
+
+def bench_docx_evaluation():
+    evaluations = {
+        month: {"goal": GOAL_TEXT, "instructional": CONTENT_TEXT, "evaluation": EVAL_TEXT}
+        for month in MONTHS_IN_SEMESTER["1학기"]
+    }
+    report = build_evaluation_report("학생", "1학기", MONTHS_IN_SEMESTER["1학기"], evaluations, EVAL_TEXT * 2)
+    return lambda i: build_evaluation_docx(dict(report, label=f"학생{i}"))
+
+
+def bench_docx_meeting():
+    sections = [(f"{n}. 협의 안건 {n}", EVAL_TEXT) for n in range(1, 7)]
+    return lambda i: build_meeting_docx(
+        "2025-03-10 15:00", f"특수학급 교실 {i}", ["교육과정 협의", "개별화교육계획 협의"],
+        "담임교사, 특수교사, 보호자, 교감", sections, EVAL_TEXT
+    )
+
+
+def benchmarks():
+    """(이름, 인자, 만드는 함수) 목록. 만드는 함수는 측정할 fn 또는 (fn, 한 번에 부르는 횟수)를 반환한다."""
+    items = [(f"planning_rerun[grades={n}]", {"grades": n}, lambda n=n: bench_planning_rerun(n)) for n in GRADE_COUNTS]
+    items += [
+        ("planning_pipeline", {"grades": 1}, bench_planning_pipeline),
+        ("curriculum_load", {"data_dir": DATA_DIR}, bench_curriculum_load),
+        ("parse_monthly_data", {"months": len(ALL_MONTHS)}, bench_parse_monthly_data),
+        ("docx_iep", {"rows": len(ALL_MONTHS)}, bench_docx_iep),
+        ("docx_evaluation", {"months": len(MONTHS_IN_SEMESTER["1학기"])}, bench_docx_evaluation),
+        ("docx_meeting", {"sections": 6}, bench_docx_meeting),
+    ]
+    return items
+
+
+# --- 실행 ---
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat, warmup, only=None, latency=0.0, chunk_latency=0.0):
+    calls = genai_stub.install(latency, chunk_latency)
+    results = {}
+    for name, params, setup in benchmarks():
+        if only and not any(part in name for part in only):
+            continue
+        print(f"[bench] {name} ...", file=sys.stderr, flush=True)
+        made = setup()
+        fn, number = made if isinstance(made, tuple) else (made, 1)
+        calls_before = len(calls)
+        runs = [ms / number for ms in measure(fn, repeat, warmup)]
+        results[name] = dict(params=params, **summarize_runs(runs))
+        if len(calls) > calls_before:
+            results[name]["llm_calls"] = len(calls) - calls_before
+        print(f"[bench] {name}: median {results[name]['median_ms']:.2f} ms", file=sys.stderr, flush=True)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "streamlit": streamlit.__version__,
+            "repeat": repeat,
+            "warmup": warmup,
+            "latency": latency,
+            "chunk_latency": chunk_latency,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(result, baseline):
+    """중앙값 기준 비교표 문자열. 기준 결과에 없는 항목은 빼고 보여준다."""
+    lines = [f"{'benchmark':<28}{'before':>12}{'after':>12}{'change':>10}"]
+    for name, after in result["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            continue
+        change = (after["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+        lines.append(f"{name:<28}{before['median_ms']:>10.2f}ms{after['median_ms']:>10.2f}ms{change:>+10.1%}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IEP 앱 성능 측정 (Gemini 대역 사용)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목마다 잴 횟수 (기본 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="재기 전에 버릴 횟수 (기본 1)")
+    parser.add_argument("--only", nargs="*", help="이름에 이 글자가 들어간 항목만 잼")
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 응답 지연(초). 스트리밍은 첫 조각까지")
+    parser.add_argument("--chunk-latency", type=float, default=0.0, help="스트리밍 조각 사이 지연(초)")
+    parser.add_argument("--out", help="결과 JSON 파일 (생략하면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    result = run_benchmarks(args.repeat, args.warmup, args.only, args.latency, args.chunk_latency)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print(compare(result, json.load(f)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from utils.ui import is_admin_user
+
 # -------------------------------
 # 페이지 기본 설정
 # -------------------------------
@@ -21,6 +23,8 @@ def show_main_page():
     st.page_link("pages/1_iep_meeting.py", label="📋 협의회 회의록 작성하기", icon="➡️")
     st.page_link("pages/2_iep_planning.py", label="📄 개별화교육계획 수립하기", icon="➡️")
     st.page_link("pages/3_iep_evaluation.py", label="📝 개별화교육평가 진행하기", icon="➡️")
+    if is_admin_user():
+        st.page_link("pages/4_llm_metrics.py", label="📊 Gemini 호출 현황 (관리자)", icon="➡️")
 
     st.markdown("---")
     st.markdown(
@@ -91,6 +95,8 @@ else:
         if submitted:
             if check_user(organization, name):
                 st.session_state.is_approved = True
+                # 임시 저장(utils.drafts)은 승인된 사용자별로 구분함
+                st.session_state.approved_user = f"{organization.strip()}/{name.strip()}"
                 st.success("확인되었습니다. 잠시 후 앱으로 이동합니다.")
                 st.rerun()
             else:
@@ -1,11 +1,16 @@
-import io
 from datetime import datetime
 
-import google.generativeai as genai
 import streamlit as st
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Pt
+
+from utils.documents import DOCX_MIME, build_meeting_docx
+from utils.drafts import DraftSpec
+from utils.ui import (
+    autosave_draft,
+    generate_with_progress,
+    render_draft_panel,
+    render_streaming_toggle,
+    require_gemini_client,
+)
 
 
 # =========================
@@ -19,28 +24,14 @@ st.set_page_config(
 
 
 # =========================
-# Gemini 설정
+# Gemini 설정 (API 키별 공용 클라이언트)
 # =========================
-def configure_gemini():
-    api_key = None
-
-    if "user_api_key" in st.session_state and st.session_state.user_api_key:
-        api_key = st.session_state.user_api_key
-    elif "GEMINI_API_KEY" in st.secrets:
-        api_key = st.secrets["GEMINI_API_KEY"]
-
-    if not api_key:
-        st.warning(
-            "Gemini API 키가 설정되지 않았습니다. "
-            "메인 화면에서 API 키를 입력하거나, secrets.toml에 GEMINI_API_KEY를 설정해 주세요."
-        )
-        st.stop()
-
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("gemini-2.0-flash")
-
-
-model = configure_gemini()
+gemini = require_gemini_client(
+    "Gemini API 키가 설정되지 않았습니다. "
+    "메인 화면에서 API 키를 입력하거나, secrets.toml에 GEMINI_API_KEY를 설정해 주세요.",
+    page="meeting"
+)
+render_streaming_toggle()
 
 
 # =========================
@@ -62,6 +53,17 @@ def init_session_state():
 
 init_session_state()
 
+# 의견·의결 사항 입력창은 meeting_contents 에서 다시 채워지므로 원본만 임시 저장함
+DRAFT_SPEC = DraftSpec(
+    page="meeting",
+    keys=("meeting_contents", "other_opinion_author", "other_author_input"),
+    derived_prefixes=(
+        "parent_opinion_input", "teacher_opinion_input", "special_teacher_opinion_input",
+        "other_opinion_input", "resolution_input",
+    ),
+)
+render_draft_panel(DRAFT_SPEC)
+
 
 # =========================
 # 공통 유틸
@@ -98,8 +100,9 @@ def get_ai_refinement(prompt_text, content_type):
 """
 
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip() if response and response.text else prompt_text
+        # 버튼을 누를 때마다 새로 보완받음
+        text = generate_with_progress(gemini, prompt, content_type, "AI가 내용을 보완하고 있습니다...", refresh=True)
+        return text.strip() if text else prompt_text
     except Exception as e:
         st.error(f"AI 응답 생성 중 오류가 발생했습니다: {e}")
         return prompt_text
@@ -112,8 +115,7 @@ def queue_ai_refinement(input_key, content_type):
         st.session_state[f"{input_key}_feedback"] = "내용을 먼저 입력해 주세요."
         return
 
-    with st.spinner("AI가 내용을 보완하고 있습니다..."):
-        refined_text = get_ai_refinement(current_text, content_type)
+    refined_text = get_ai_refinement(current_text, content_type)
 
     st.session_state[f"{input_key}_pending"] = refined_text
 
@@ -145,20 +147,6 @@ def render_feedback(input_key):
             st.info(message)
 
 
-def normalize_bullet_line(line: str) -> str:
-    clean = line.strip()
-    if clean.startswith("- "):
-        clean = clean[2:].strip()
-    return clean
-
-
-def add_bullet_paragraphs(document, content: str):
-    for line in content.split("\n"):
-        clean_line = normalize_bullet_line(line)
-        if clean_line:
-            document.add_paragraph(clean_line, style="List Bullet")
-
-
 def render_ai_refinement_section(
     title,
     expander_label,
@@ -293,89 +281,39 @@ if st.button("📄 워드 파일(.docx) 생성 및 다운로드"):
         st.error("의결 사항을 먼저 작성해주세요.")
     else:
         with st.spinner("회의록 Word 문서를 생성 중입니다..."):
-            document = Document()
-
-            style = document.styles["Normal"]
-            style.font.name = "맑은 고딕"
-            style.font.size = Pt(11)
-
-            title = document.add_heading("개별화교육지원팀 협의회 회의록", level=0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            document.add_paragraph()
-
-            # 1. 기본 정보
-            p = document.add_paragraph("1. 협의회 기본 정보")
-            p.runs[0].font.bold = True
-
             final_meeting_types = [m for m in meeting_type if m != "기타 (직접 작성)"]
             if other_method_text.strip():
                 final_meeting_types.append(other_method_text.strip())
 
-            table = document.add_table(rows=4, cols=2)
-            table.style = "Table Grid"
-
-            table.cell(0, 0).text = "일시"
-            table.cell(0, 1).text = f"{date_of_meeting} {time_of_meeting}"
-
-            table.cell(1, 0).text = "장소"
-            table.cell(1, 1).text = location
-
-            table.cell(2, 0).text = "방식"
-            table.cell(2, 1).text = ", ".join(final_meeting_types)
-
-            table.cell(3, 0).text = "참석자"
-            table.cell(3, 1).text = attendees
-
-            for row in table.rows:
-                if row.cells[0].paragraphs and row.cells[0].paragraphs[0].runs:
-                    row.cells[0].paragraphs[0].runs[0].font.bold = True
-
-            document.add_paragraph()
-
-            # 2. 회의 내용
-            p = document.add_paragraph("2. 회의 내용")
-            p.runs[0].font.bold = True
-
+            sections = []
             for section, content in st.session_state.meeting_contents.items():
                 if section == "의결 사항":
                     continue
-                if not content.strip():
-                    continue
-
                 section_title = (
                     f"- {st.session_state.other_opinion_author} 의견"
                     if section == "기타 의견" and st.session_state.other_opinion_author.strip()
                     else f"- {section}"
                 )
+                sections.append((section_title, content))
 
-                p = document.add_paragraph(section_title)
-                p.runs[0].font.bold = True
-
-                add_bullet_paragraphs(document, content)
-
-            document.add_paragraph()
-
-            # 3. 의결 사항
-            p = document.add_paragraph("3. 의결 사항")
-            p.runs[0].font.bold = True
-
-            add_bullet_paragraphs(document, st.session_state.meeting_contents["의결 사항"])
-
-            # 파일 저장
-            file_stream = io.BytesIO()
-            document.save(file_stream)
-            file_stream.seek(0)
+            docx_bytes = build_meeting_docx(
+                f"{date_of_meeting} {time_of_meeting}", location, final_meeting_types, attendees,
+                sections, st.session_state.meeting_contents["의결 사항"]
+            )
 
             st.success("✅ 회의록 문서 생성이 완료되었습니다.")
             now_str = datetime.now().strftime("%Y%m%d")
 
             st.download_button(
                 label="📥 Word 파일(.docx) 다운로드",
-                data=file_stream,
+                data=docx_bytes,
                 file_name=f"협의회_회의록_{now_str}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                mime=DOCX_MIME
             )
 
+# 이번 실행에서 바뀐 작성 내용을 임시 저장함
+autosave_draft(DRAFT_SPEC)
+
 st.markdown("---")
 st.markdown(
     "<p style='text-align: center; color: grey;'>Copyright © 2025 신하영(천안가온중학교), "
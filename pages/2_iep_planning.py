@@ -1,30 +1,57 @@
 import streamlit as st
-import pandas as pd
-import google.generativeai as genai
-import os
-import json
 from datetime import datetime
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import io
-import re
-
-# API 키 보안 설정
-# 페이지를 직접 실행할 경우 secrets.toml에서 키를 로드 시도
-# 메인 앱에서 실행될 경우 st.session_state에 저장된 키를 사용
-if 'user_api_key' in st.session_state and st.session_state.user_api_key:
-    genai.configure(api_key=st.session_state.user_api_key)
-else:
-    try:
-        genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    except Exception as e:
-        st.error("Gemini API 키가 설정되지 않았습니다.")
-        st.stop()
-
-# 유효한 모델 이름으로 설정
-model = genai.GenerativeModel('gemini-2.0-flash')
 
+from utils.curriculum import (
+    CURRICULUM_SHORT_NAMES,
+    SUBJECTS_BY_CURRICULUM,
+    curriculum_file_path,
+    get_curriculum_index,
+    standard_key,
+)
+from utils.documents import DOCX_MIME, build_iep_docx, build_plan_rows
+from utils.llm import DEFAULT_MAX_WORKERS
+from utils.pipeline import run_pipeline
+from utils.planning import (
+    DEFAULT_EVAL_METHODS,
+    EVAL_METHODS,
+    MONTHS_IN_SEMESTER,
+    RATING_VALUES,
+    achieved_items,
+    budgeted_content_prompt,
+    build_planning_stages,
+    build_monthly_plan,
+    clean_summary,
+    expand_ratings,
+    format_content_text,
+    format_goal_text,
+    learning_items,
+    month_context_items,
+    parse_content_plan,
+    parse_goal_plan,
+    parse_month_activities,
+    parse_month_goal,
+    target_items,
+)
+from utils.prompts import (
+    CONTENT_RESPONSE_SCHEMA,
+    GOAL_RESPONSE_SCHEMA,
+    MONTH_CONTENT_RESPONSE_SCHEMA,
+    MONTH_GOAL_RESPONSE_SCHEMA,
+    build_eval_plan_prompt,
+    build_goal_prompt,
+    build_month_content_prompt,
+    build_month_goal_prompt,
+    build_summary_prompt,
+)
+from utils.standards_db import search_standards
+from utils.drafts import DraftSpec
+from utils.ui import (
+    autosave_draft,
+    generate_with_progress,
+    render_draft_panel,
+    render_streaming_toggle,
+    require_gemini_client,
+)
 
 st.set_page_config(
     page_title="개별화교육계획 수립",
@@ -32,6 +59,75 @@ st.set_page_config(
     layout="wide"
 )
 
+# API 키 보안 설정
+# 메인 앱에서 입력한 키(st.session_state)를 우선 사용하고, 없으면 secrets.toml에서 로드
+gemini = require_gemini_client("Gemini API 키가 설정되지 않았습니다.", page="planning")
+render_streaming_toggle()
+
+# 연결이 끊겨도 다시 생성하지 않도록 선택·진단·생성 결과를 학생별로 임시 저장함
+DRAFT_SPEC = DraftSpec(
+    page="planning",
+    keys=(
+        "curriculums", "subject_selector", "grades_selector",
+        "previous_curriculums", "previous_subject", "previous_grades",
+        "selected_domains", "ratings", "summary", "goal_plan", "goal_output", "content_plan", "content_output",
+        "monthly_plan", "evaluation_plan", "selected_months", "semester_radio", "student_name", "student_class_info",
+    ),
+    derived_prefixes=(
+        "[", "checklist_page:", "summary_editor", "goal_editor", "content_editor", "ms_", "ta_", "methods_", "criteria_",
+    ),
+)
+render_draft_panel(DRAFT_SPEC)
+
+
+# --- 구조화된 교육목표·교육내용 저장 ---
+# goal_plan / content_plan 이 원본이고, goal_output / content_output 은 여기서 만든 글 보기임
+def store_goal_plan(goal_plan):
+    st.session_state.goal_plan = goal_plan
+    st.session_state.goal_output = format_goal_text(goal_plan)
+    # 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+    for key in [k for k in st.session_state.keys() if k.startswith("goal_editor")]:
+        del st.session_state[key]
+
+
+def store_content_plan(content_plan):
+    st.session_state.content_plan = content_plan
+    st.session_state.content_output = format_content_text(content_plan)
+    for key in [k for k in st.session_state.keys() if k.startswith("content_editor")]:
+        del st.session_state[key]
+
+
+# --- ① 성취기준 체크리스트 ---
+# 영역마다 따로 다시 그려지는 fragment 로 나누고 한 번에 CHECKLIST_PAGE_SIZE 개씩만 그림
+# (평가 하나를 누를 때 페이지 전체가 아니라 그 영역만 다시 실행됨)
+# 진단 결과는 {standard_key: 평가 코드} 로만 세션에 두고, 내용·해설은 필요할 때 공용 인덱스에서 펼침
+CHECKLIST_PAGE_SIZE = 10
+
+
+def current_evaluation():
+    """프롬프트·표에 쓸 진단 결과 항목 사전. 쓸 때마다 ratings 에서 새로 만듦."""
+    return expand_ratings(st.session_state.get('ratings', {}))
+
+
+@st.fragment
+def render_domain_checklist(domain, title, items):
+    st.markdown(f"##### 🟦 {title} 영역")
+    page_count = (len(items) + CHECKLIST_PAGE_SIZE - 1) // CHECKLIST_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.number_input(
+            f"페이지 (1~{page_count}, 성취기준 {len(items)}개)", min_value=1, max_value=page_count,
+            step=1, key=f"checklist_page:{domain}"
+        )
+    start = (page - 1) * CHECKLIST_PAGE_SIZE
+    for item in items[start:start + CHECKLIST_PAGE_SIZE]:
+        key = standard_key(item)
+        # 다른 페이지에 있다가 돌아온 항목은 위젯 상태가 지워졌으므로 저장된 평가로 다시 그림
+        val = st.radio(item['내용'], RATING_VALUES, index=st.session_state.ratings.get(key, 0), key=key, horizontal=True)
+        st.session_state.ratings[key] = RATING_VALUES.index(val)
+    autosave_draft(DRAFT_SPEC)
+
+
 st.title("📄 AI 기반 개별화교육계획 수립 시스템")
 st.markdown("---")
 
@@ -49,15 +145,10 @@ with st.container(border=True):
     )
     st.session_state.curriculums = curriculums
 
-    subjects_by_curriculum = {
-        "기본교육과정": ["국어", "수학", "생활영어", "진로와직업", "체육", "정보통신활용", "보건"],
-        "공통교육과정": ["국어", "수학", "실과", "정보", "체육", "기술가정"]
-    }
-    
-    curriculum_short_names = {
-        "기본교육과정": "기본",
-        "공통교육과정": "공통"
-    }
+    # 성취기준 인덱스는 프로세스당 한 번 만들어 모든 세션이 공유함
+    curriculum_index = get_curriculum_index()
+    subjects_by_curriculum = SUBJECTS_BY_CURRICULUM
+    curriculum_short_names = CURRICULUM_SHORT_NAMES
 
     subject_to_curriculum = {}
     for cur, sub_list in subjects_by_curriculum.items():
@@ -89,28 +180,45 @@ with st.container(border=True):
     )
     st.session_state.subject = subject
 
-    all_possible_grades = ["초등학교 1-2학년군", "초등학교 3-4학년군", "초등학교 5-6학년군", "중학교 1-3학년군"]
     available_grades = []
     if subject:
-        grade_set = set()
         relevant_curriculums = [
             cur for cur, sub_list in subjects_by_curriculum.items() if subject in sub_list
         ]
-        for curriculum in relevant_curriculums:
-            for grade in all_possible_grades:
-                file_path = f"data/{curriculum}/{subject}_{grade}.json"
-                if os.path.exists(file_path):
-                    grade_set.add(grade)
-        available_grades = sorted(list(grade_set), key=all_possible_grades.index)
+        available_grades = curriculum_index.available_grades(relevant_curriculums, subject)
 
     grades = st.multiselect(
         "3. 학년군 선택",
         options=available_grades,
-        default=[]
+        key="grades_selector"
     )
     st.markdown("---")
     st.info("위 항목을 선택한 후, 아래 탭에서 단계를 진행하세요.")
 
+# --- 성취기준 검색 (전체 교육과정·학년군) ---
+with st.expander("🔎 성취기준 검색 (전체 교육과정·학년군)"):
+    search_query = st.text_input(
+        "성취기준 내용, 해설 또는 ID로 검색하세요.",
+        key="standard_search_query",
+        placeholder="예: 낱말 읽기, 분수, 9국01"
+    )
+    if search_query.strip():
+        search_started = datetime.now()
+        search_results = search_standards(search_query)
+        elapsed_ms = (datetime.now() - search_started).total_seconds() * 1000
+        if search_results:
+            st.caption(f"검색 결과 {len(search_results)}건 ({elapsed_ms:.0f} ms)")
+            st.dataframe(
+                [
+                    {"교육과정": r['교육과정'], "교과": r['교과'], "학년군": r['학년군'],
+                     "영역": r['영역'], "성취기준 ID": r['id'], "내용": r['내용']}
+                    for r in search_results
+                ],
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("검색 결과가 없습니다. 다른 검색어를 입력해 보세요.")
+
 tabs = st.tabs([
     "① 현행수준 진단", "② 현행수준 작성", "③ 교육목표 수립",
     "④ 교육내용 생성", "⑤ 교육 방법 선택", "⑥ 평가계획 수립", "⑦ 최종 IEP 생성"
@@ -131,7 +239,7 @@ with tabs[0]:
             st.session_state.previous_subject != subject or
             st.session_state.previous_curriculums != curriculums):
         
-        keys_to_reset = ['evaluation', 'summary', 'goal_output', 'content_output', 'monthly_plan', 'selected_domains', 'evaluation_plan']
+        keys_to_reset = ['ratings', 'summary', 'goal_plan', 'goal_output', 'content_plan', 'content_output', 'monthly_plan', 'selected_domains', 'evaluation_plan']
         for key in keys_to_reset:
             if key in st.session_state:
                 del st.session_state[key]
@@ -150,23 +258,15 @@ with tabs[0]:
         for curriculum in curriculums:
             if subject in subjects_by_curriculum.get(curriculum, []):
                 for grade in grades:
-                    file_path = f"data/{curriculum}/{subject}_{grade}.json"
-                    if os.path.exists(file_path):
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            try:
-                                data = json.load(f)
-                                for item in data:
-                                    domain = item.get('영역', '기타')
-                                    if domain not in domain_to_curriculum:
-                                        domain_to_curriculum[domain] = set()
-                                    domain_to_curriculum[domain].add(curriculum)
-                                    
-                                    if domain not in criteria_by_domain:
-                                        criteria_by_domain[domain] = []
-                                    item['출처'] = f"[{curriculum}] {grade}" 
-                                    criteria_by_domain[domain].append(item)
-                            except json.JSONDecodeError:
-                                st.error(f"❌ JSON 파일 형식 오류: {file_path}")
+                    file_path = curriculum_file_path(curriculum, subject, grade)
+                    if curriculum_index.has_file(curriculum, subject, grade):
+                        for domain in curriculum_index.domains(curriculum, subject, grade):
+                            domain_to_curriculum.setdefault(domain, set()).add(curriculum)
+                            criteria_by_domain.setdefault(domain, []).extend(
+                                curriculum_index.domain_items(curriculum, subject, grade, domain)
+                            )
+                    elif file_error := curriculum_index.file_error(curriculum, subject, grade):
+                        st.error(f"❌ 성취기준 파일을 읽지 못함: {file_path} ({file_error})")
                     else:
                         st.warning(f"⚠️ 성취기준 파일이 존재하지 않음: `{file_path}`")
 
@@ -199,24 +299,19 @@ with tabs[0]:
             st.markdown("---")
             st.subheader("2. 성취기준 기반 진단")
 
-            if 'evaluation' not in st.session_state:
-                st.session_state.evaluation = {}
+            if 'ratings' not in st.session_state:
+                st.session_state.ratings = {}
             
             for domain in selected_domains:
-                st.markdown(f"##### 🟦 {format_domain(domain)} 영역")
                 items = criteria_by_domain.get(domain, [])
+                # 지금 페이지에 보이지 않는 항목도 진단 결과에 들어가도록 '예'(코드 0)로 채워 둠
                 for item in items:
-                    key = f"[{item['출처']}] {item['id']}"
-                    label_text = item['내용']
-                    val = st.radio(label_text, ["예", "아니오", "관찰 필요"], key=key, horizontal=True)
-                    st.session_state.evaluation[key] = {
-                        "grade": item['출처'], "domain": domain, "id": item['id'],
-                        "content": item['내용'], "value": val, "해설": item.get("해설", "")
-                    }
+                    st.session_state.ratings.setdefault(standard_key(item), 0)
+                render_domain_checklist(domain, format_domain(domain), items)
     
     with st.container(border=True):
         st.subheader("🧐 '관찰 필요' 항목 진단 문항 생성")
-        observation_needed = [v for v in st.session_state.get('evaluation', {}).values() if v.get('value') == "관찰 필요" and v.get('domain') in st.session_state.get('selected_domains', [])]
+        observation_needed = [v for v in current_evaluation().values() if v.get('value') == "관찰 필요" and v.get('domain') in st.session_state.get('selected_domains', [])]
         if observation_needed:
             st.markdown("'관찰 필요'로 체크된 항목에 대해 학생의 현행 수준을 판단할 수 있는 객관적인 문항을 생성합니다.")
             if st.button("객관적 진단 문항 생성"):
@@ -228,48 +323,117 @@ with tabs[0]:
                 **[성취기준 목록]**
                 {obs_text}
                 """
-                with st.spinner('Gemini가 객관적 진단 문항을 생성하고 있습니다...'):
-                    response = model.generate_content(prompt_objective)
-                    obj_questions = response.text
+                # 생성한 문항은 화면에만 보이고 저장하지 않으므로, 누를 때마다 새 문항을 받음
+                obj_questions = generate_with_progress(
+                    gemini, prompt_objective, "objective_items", 'Gemini가 객관적 진단 문항을 생성하고 있습니다...',
+                    refresh=True
+                )
+                if obj_questions is not None:
                     st.success("📄 **생성된 객관적 진단 문항**")
                     st.markdown(obj_questions)
         else:
             st.info("현재 선택된 영역에서 '관찰 필요'로 체크된 항목이 없습니다.")
 
+    # 진단이 끝나면 ②~⑥ 생성 단계를 의존 관계에 따라 동시에 실행함
+    # (현행수준 ∥ 교육목표 → 교육내용 → 월별 평가초점 동시 생성)
+    with st.container(border=True):
+        st.subheader("🚀 전체 자동 생성 (파이프라인)")
+        pipeline_targets = target_items(current_evaluation(), st.session_state.get('selected_domains', []))
+        if pipeline_targets:
+            st.markdown("진단 결과로 ② 현행수준부터 ⑥ 평가초점까지 한 번에 생성합니다. 생성된 내용은 각 탭에서 그대로 수정할 수 있습니다.")
+            pipeline_semester = st.session_state.get('semester_radio', "1학기")
+            pipeline_months = st.session_state.get('selected_months') or MONTHS_IN_SEMESTER[pipeline_semester]
+            st.caption(f"대상: {pipeline_semester} {', '.join(pipeline_months)} (③ 교육 목표 수립 탭에서 변경)")
+            pipeline_methods = st.multiselect(
+                "평가 방법이 정해지지 않은 월에 사용할 평가 방법",
+                options=EVAL_METHODS,
+                default=DEFAULT_EVAL_METHODS,
+                key="pipeline_eval_methods"
+            )
+
+            if st.button("🚀 전체 자동 생성 시작", key="btn_pipeline"):
+                if not pipeline_methods:
+                    st.error("평가 방법을 1개 이상 선택해주세요.")
+                else:
+                    existing_plan = st.session_state.get('evaluation_plan', {})
+                    eval_methods = {
+                        month: existing_plan.get(month, {}).get('methods') or pipeline_methods
+                        for month in pipeline_months
+                    }
+                    # 이미 만든 결과가 있으면 다시 생성이므로 캐시된 응답을 쓰지 않음
+                    stages = build_planning_stages(
+                        gemini, st.session_state.subject, current_evaluation(),
+                        st.session_state.get('selected_domains', []), pipeline_semester, pipeline_months, eval_methods,
+                        refresh=any(key in st.session_state for key in ('summary', 'goal_plan', 'content_plan'))
+                    )
+                    stage_labels = {"summary": "② 현행수준", "goal": "③ 교육목표", "content": "④ 교육내용"}
+                    stage_labels.update({f"eval:{month}": f"⑥ {month} 평가초점" for month in pipeline_months})
+
+                    results, failed_stages = {}, []
+                    with st.status("Gemini가 IEP 전체를 생성하고 있습니다...", expanded=True) as status:
+                        progress = st.progress(0.0)
+                        for done, (name, result, error) in enumerate(
+                            run_pipeline(stages, max_workers=DEFAULT_MAX_WORKERS), start=1
+                        ):
+                            if error is not None:
+                                failed_stages.append(stage_labels[name])
+                                st.write(f"❌ {stage_labels[name]}: {error}")
+                            else:
+                                results[name] = result
+                                st.write(f"✅ {stage_labels[name]} 완료")
+                            progress.progress(done / len(stages), text=f"{done}/{len(stages)}단계 완료")
+                        status.update(
+                            label="일부 단계를 생성하지 못했습니다." if failed_stages else "전체 자동 생성이 완료되었습니다!",
+                            state="error" if failed_stages else "complete",
+                            expanded=bool(failed_stages)
+                        )
+
+                    # 각 탭의 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+                    if results.get('summary'):
+                        st.session_state.summary = results['summary']
+                        st.session_state.pop("summary_editor", None)
+                    if 'goal' in results:
+                        store_goal_plan(results['goal'])
+                        st.session_state.selected_months = pipeline_months
+                    if 'content' in results:
+                        store_content_plan(results['content'])
+                    for month in pipeline_months:
+                        if f"eval:{month}" in results:
+                            st.session_state.setdefault('evaluation_plan', {})[month] = {
+                                'methods': eval_methods[month], 'criteria': results[f"eval:{month}"]
+                            }
+                            st.session_state.pop(f"criteria_{month}", None)
+                            st.session_state.pop(f"methods_{month}", None)
+
+                    if failed_stages:
+                        st.warning(f"{', '.join(failed_stages)} 단계는 해당 탭에서 다시 생성해주세요.")
+        else:
+            st.info("'아니오' 또는 '관찰 필요'로 진단한 항목이 있어야 전체 자동 생성을 할 수 있습니다.")
+
 # ---------------------------------------------------
 # ② 현행수준 작성
 # ---------------------------------------------------
 with tabs[1]:
     with st.container(border=True):
         st.header("② 현행수준 작성")
-        if 'evaluation' in st.session_state and st.session_state.get('evaluation'):
-            selected = {k: v for k, v in st.session_state.get('evaluation', {}).items() if v.get('value') == "예" and v.get('domain') in st.session_state.get('selected_domains', [])}
+        if st.session_state.get('ratings'):
+            selected = achieved_items(current_evaluation(), st.session_state.get('selected_domains', []))
             if selected:
                 st.markdown("✔️ **학생이 성취한 기준 요약:**")
-                df = pd.DataFrame([{"학년군": v['grade'], "영역": v['domain'], "성취기준 ID": v['id'], "내용": v['content']} for v in selected.values()])
-                st.dataframe(df, use_container_width=True, hide_index=True)
+                rows = [{"학년군": v['grade'], "영역": v['domain'], "성취기준 ID": v['id'], "내용": v['content']} for v in selected]
+                st.dataframe(rows, use_container_width=True, hide_index=True)
                 st.markdown("---")
                 st.markdown("🧠 **Gemini를 이용해 현행수준 요약문 생성**")
                 if st.button("현행수준 문장 생성"):
-                    input_text = "\n".join(f"- ({v['domain']} 영역) {v['content']}" for v in selected.values())
-                    
-                    prompt_template = f"""
-                    당신은 특수교사를 돕는 IEP 작성 전문가입니다. 다음은 특수교육 대상학생의 {st.session_state.subject} 교과 성취기준 평가 결과 중 '예'로 체크된 항목입니다.
-                    이를 바탕으로 학생의 강점을 보여주는 '현행학습수준'을 **하나의 자연스러운 종합 문단**으로 작성해 주세요.
-
-                    **[학생이 성취한 기준 목록]**
-                    {input_text}
-                    
-                    **[출력 규칙]**
-                    - 각 영역(예: 읽기, 쓰기)의 강점들을 자연스럽게 연결하여 하나의 완성된 글로 작성하세요.
-                    - **절대로 영역별로 목록을 나누거나 글머리 기호('-', '*')를 사용하지 마세요.**
-                    - 학생의 강점을 나타내는 긍정적인 어조를 사용하세요.
-                    - '~을 할 수 있으며, ~하는 능력을 보임.'과 같이 완전한 문장 형태로 자연스럽게 서술하세요.
-                    """
-                    with st.spinner('Gemini가 현행수준을 생성하고 있습니다...'):
-                        response = model.generate_content(prompt_template)
-                        summary = response.text.replace('*', '').replace('#', '').strip()
-                        st.session_state.summary = summary
+                    prompt_template = build_summary_prompt(st.session_state.subject, selected)
+                    summary = generate_with_progress(
+                        gemini, prompt_template, "summary", 'Gemini가 현행수준을 생성하고 있습니다...',
+                        refresh='summary' in st.session_state
+                    )
+                    if summary is not None:
+                        st.session_state.summary = clean_summary(summary)
+                        # 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+                        st.session_state.pop("summary_editor", None)
                 
                 if 'summary' in st.session_state:
                     st.success("📝 **Gemini 기반 현행학습수준 (아래 상자에서 수정 가능)**")
@@ -289,62 +453,67 @@ with tabs[1]:
 with tabs[2]:
     with st.container(border=True):
         st.header("③ 교육 목표 수립")
-        if 'evaluation' in st.session_state and st.session_state.get('evaluation'):
-            targets = [v for v in st.session_state.get('evaluation', {}).values() if v.get('value') in ["아니오", "관찰 필요"] and v.get('domain') in st.session_state.get('selected_domains', [])]
+        if st.session_state.get('ratings'):
+            targets = target_items(current_evaluation(), st.session_state.get('selected_domains', []))
             if targets:
                 st.markdown("✔️ **교육목표 수립 대상 (미도달 성취기준):**")
-                df_targets = pd.DataFrame([{"학년군": v['grade'], "영역": v['domain'], "내용": v['content']} for v in targets])
-                st.dataframe(df_targets, use_container_width=True, hide_index=True)
+                target_rows = [{"학년군": v['grade'], "영역": v['domain'], "내용": v['content']} for v in targets]
+                st.dataframe(target_rows, use_container_width=True, hide_index=True)
                 st.markdown("---")
                 st.markdown("🎯 **AI 기반 학기/월별 교육목표 자동 생성**")
                 semester = st.radio("대상 학기 선택", ["1학기", "2학기"], horizontal=True, key="semester_radio")
-                months_in_semester = {"1학기": ["3월", "4월", "5월", "6월", "7월"], "2학기": ["8월", "9월", "10월", "11월", "12월"]}
-                selected_months = st.multiselect("목표를 생성할 월을 선택하세요", months_in_semester[semester], default=months_in_semester[semester])
+                selected_months = st.multiselect("목표를 생성할 월을 선택하세요", MONTHS_IN_SEMESTER[semester], default=MONTHS_IN_SEMESTER[semester])
                 st.session_state.selected_months = selected_months
                 if st.button("✏️ Gemini에게 교육목표 생성 요청"):
                     if not selected_months:
                         st.error("목표를 생성할 월을 1개 이상 선택해주세요.")
                     else:
-                        criteria_text = "\n".join(f"- {v['id']} {v['content']}" for v in targets)
-                        
-                        prompt = f"""
-                        당신은 IEP 교육목표를 작성하는 특수교육 전문가입니다.
-                        
-                        **[분석 자료]**
-                        - 교과: {st.session_state.subject}, 대상 학기: {semester}, 목표 수립 월: {', '.join(selected_months)}
-                        - 미도달 성취기준: {criteria_text}
-                        
-                        **[과업 지시]**
-                        1. **학기 목표 생성**: 미도달 성취기준 전체를 아우르는 **{semester} 학기 목표**를 생성합니다.
-                        2. **월별 목표 생성**: **{', '.join(selected_months)}** 각각에 해당하는 **월별 목표**를 구체적으로 생성합니다. 이때, 목표는 학생이 달성해야 할 '성취 상태'를 나타내도록 **'~할 수 있다', '~한다'** 와 같이 측정 가능한 **학생 중심**의 결과로 서술해 주세요.
-                        
-                        **[출력 형식 규칙]**
-                        - 제목은 **'[1학기 학기 목표]', '[3월 목표]'와 같이 대괄호로 묶어서** 표시해주세요.
-                        - **절대로 '#', '*'와 같은 다른 특수기호는 사용하지 마세요.**
-                        - 각 월별 목표 다음 줄에는 '근거 성취기준:' 이라는 문구와 함께 관련 ID를 명시합니다.
-
-                        **[출력 예시]**
-                        [1학기 학기 목표]
-                        일상생활 속 다양한 상황과 자료를 활용하여 자신의 생각과 느낌을 적절하게 표현하고, 타인과 바르고 고운 언어로 소통하며 즐겁게 국어 활동에 참여할 수 있다.
-
-                        [3월 목표]
-                        자신의 외모, 감정, 행동을 나타내는 간단한 단어와 짧은 문장을 사용하여 자신을 소개할 수 있다. 또한, 그림 자료를 통해 제시된 짧은 문장의 주요 내용을 파악할 수 있다.
-                        근거 성취기준: 6국어01-02, 6국어02-03
-                        """
-                        with st.spinner('Gemini가 교육 목표를 생성하고 있습니다...'):
-                            response = model.generate_content(prompt)
-                            goal_output = response.text.replace('#### ', '').replace('### ', '')
-                            st.session_state.goal_output = goal_output
+                        prompt = build_goal_prompt(st.session_state.subject, semester, selected_months, targets)
+                        goal_output = generate_with_progress(
+                            gemini, prompt, "goal", 'Gemini가 교육 목표를 생성하고 있습니다...',
+                            response_schema=GOAL_RESPONSE_SCHEMA, refresh='goal_plan' in st.session_state
+                        )
+                        if goal_output is not None:
+                            try:
+                                store_goal_plan(parse_goal_plan(goal_output, semester, selected_months))
+                            except ValueError as e:
+                                st.error(str(e))
                 
-                if 'goal_output' in st.session_state:
+                if 'goal_plan' in st.session_state:
+                    goal_plan = st.session_state.goal_plan
                     st.success("🧠 **Gemini 기반 학기/월별 목표 (아래 상자에서 수정 가능)**")
-                    edited_goal = st.text_area(
-                        "생성된 교육 목표를 수정하거나 보완하세요.",
-                        value=st.session_state.goal_output,
-                        height=400,
-                        key="goal_editor"
+                    goal_plan['semester_goal'] = st.text_area(
+                        f"{goal_plan['semester']} 학기 목표",
+                        value=goal_plan['semester_goal'],
+                        height=100,
+                        key="goal_editor_semester"
                     )
-                    st.session_state.goal_output = edited_goal
+                    for month, month_goal in goal_plan['months'].items():
+                        # 이 달의 목표만 작은 프롬프트로 다시 받아 기존 계획에 끼워 넣음
+                        if st.button(f"🔄 {month} 목표만 다시 생성", key=f"btn_regen_goal_{month}"):
+                            prompt_month = build_month_goal_prompt(
+                                st.session_state.subject, goal_plan['semester_goal'], month, month_goal['goal'],
+                                month_context_items(targets, month_goal.get('standards', []))
+                            )
+                            month_output = generate_with_progress(
+                                gemini, prompt_month, "goal_month", f'Gemini가 {month} 목표를 다시 생성하고 있습니다...',
+                                response_schema=MONTH_GOAL_RESPONSE_SCHEMA, refresh=True
+                            )
+                            if month_output is not None:
+                                try:
+                                    month_goal = goal_plan['months'][month] = parse_month_goal(month_output)
+                                    st.session_state.pop(f"goal_editor_{month}", None)
+                                except ValueError as e:
+                                    st.error(str(e))
+                        month_goal['goal'] = st.text_area(
+                            f"{month} 목표",
+                            value=month_goal['goal'],
+                            height=100,
+                            key=f"goal_editor_{month}"
+                        )
+                        if month_goal.get('standards'):
+                            st.caption(f"근거 성취기준: {', '.join(month_goal['standards'])}")
+                    st.session_state.goal_output = format_goal_text(goal_plan)
             else:
                 st.info("선택하신 영역의 모든 성취기준을 성취했습니다.")
 
@@ -354,56 +523,58 @@ with tabs[2]:
 with tabs[3]:
     with st.container(border=True):
         st.header("④ 교육내용 생성")
-        if 'goal_output' in st.session_state:
+        if 'goal_plan' in st.session_state:
             st.subheader("- 수정한 교육 목표 확인")
             st.markdown(st.session_state.goal_output)
             st.markdown("---")
             st.subheader("- 월별 교육내용 생성")
             if st.button("📚 Gemini에게 교육내용 생성 요청"):
-                learning_goals_criteria = [v for v in st.session_state.get('evaluation', {}).values() if v.get('value') != "예" and v.get('domain') in st.session_state.get('selected_domains', [])]
-                
-                criteria_text_for_content = "\n".join(
-                    f"- {v['id']} {v['content']}\n  (해설: {v.get('해설', '없음')})" for v in learning_goals_criteria
+                learning_goals_criteria = learning_items(current_evaluation(), st.session_state.get('selected_domains', []))
+                prompt_content, budget_report = budgeted_content_prompt(
+                    st.session_state.goal_output, st.session_state.goal_plan, learning_goals_criteria
                 )
-                
-                prompt_content = f"""
-                당신은 학생 중심의 학습 활동을 설계하는 교육 전문가입니다. 아래 교육 목표를 달성하기 위해 학생이 직접 수행할 '주요 학습 활동' 목록을 생성해야 합니다.
-
-                **[참고 자료]**
-                1. **수립된 교육 목표:** {st.session_state.goal_output}
-                2. **관련 성취기준 및 해설:** {criteria_text_for_content}
-
-                **[과업 지시]**
-                - 각 월별 목표를 달성하기 위한 **학생 중심의 주요 학습 활동을 3가지씩 제안**합니다.
-                - 교사의 지도 내용이 아닌, 학생의 입장에서 수행하는 과제를 서술합니다.
-                - **모든 활동 설명은 '~하기'와 같은 명사형으로 끝나야 합니다.** (예: '...답하는 활동을 합니다.' (X) -> '...답하기' (O))
-
-                **[출력 형식 규칙]**
-                - 각 월별 주요 학습 활동 섹션의 제목은 '### 3월 주요 학습 활동'과 같은 형식이어야 합니다.
-                - 각 활동은 '**활동명:** 활동 설명' 형식으로 작성합니다.
-                - **절대로 문장 앞에 `*`, `-`, `#` 와 같은 특수 기호를 사용하지 마세요.**
-                - 각 활동은 반드시 줄을 바꿔서 작성합니다.
-
-                **[출력 예시]**
-                ### 3월 주요 학습 활동
-                **주인공 되어보기:** 그림책이나 짧은 이야기 글을 읽고, 주인공이 되어 인터뷰 질문에 답하기
-                **새로운 결말 상상하기:** 이야기의 결말을 자신만의 생각으로 새롭게 바꾸어 글이나 그림으로 표현하기
-                **등장인물 관계도 그리기:** 이야기 속 등장인물들의 관계를 선과 간단한 설명으로 연결하여 한눈에 파악하기
-                """
-                with st.spinner('Gemini가 월별 교육내용을 생성하고 있습니다...'):
-                    response = model.generate_content(prompt_content)
-                    content_output = response.text
-                    st.session_state.content_output = content_output
+                st.caption(budget_report.summary())
+                content_output = generate_with_progress(
+                    gemini, prompt_content, "content", 'Gemini가 월별 교육내용을 생성하고 있습니다...',
+                    response_schema=CONTENT_RESPONSE_SCHEMA, refresh='content_plan' in st.session_state
+                )
+                if content_output is not None:
+                    try:
+                        store_content_plan(parse_content_plan(content_output, list(st.session_state.goal_plan['months'])))
+                    except ValueError as e:
+                        st.error(str(e))
             
-            if 'content_output' in st.session_state:
+            if 'content_plan' in st.session_state:
+                content_plan = st.session_state.content_plan
                 st.success("🧠 **Gemini가 제안한 월별 지도 내용 및 방법 (아래 상자에서 수정 가능)**")
-                edited_content = st.text_area(
-                    "생성된 교육 내용을 수정하거나 보완하세요.",
-                    value=st.session_state.content_output,
-                    height=400,
-                    key="content_editor"
-                )
-                st.session_state.content_output = edited_content
+                for month, month_content in content_plan.items():
+                    if st.button(f"🔄 {month} 활동만 다시 생성", key=f"btn_regen_content_{month}"):
+                        goal_plan = st.session_state.goal_plan
+                        month_goal = goal_plan['months'].get(month, {})
+                        prompt_month = build_month_content_prompt(
+                            month, goal_plan['semester_goal'], month_goal.get('goal', ''),
+                            month_context_items(
+                                learning_items(current_evaluation(), st.session_state.get('selected_domains', [])),
+                                month_goal.get('standards', [])
+                            )
+                        )
+                        month_output = generate_with_progress(
+                            gemini, prompt_month, "content_month", f'Gemini가 {month} 활동을 다시 생성하고 있습니다...',
+                            response_schema=MONTH_CONTENT_RESPONSE_SCHEMA, refresh=True
+                        )
+                        if month_output is not None:
+                            try:
+                                month_content = content_plan[month] = parse_month_activities(month_output)
+                                st.session_state.pop(f"content_editor_{month}", None)
+                            except ValueError as e:
+                                st.error(str(e))
+                    content_plan[month] = st.text_area(
+                        f"{month} 주요 학습 활동",
+                        value=month_content,
+                        height=150,
+                        key=f"content_editor_{month}"
+                    )
+                st.session_state.content_output = format_content_text(content_plan)
         else:
             st.info("③ 교육목표 수립 탭에서 먼저 교육목표를 생성하고 수정해주세요.")
 
@@ -413,40 +584,22 @@ with tabs[3]:
 with tabs[4]:
     with st.container(border=True):
         st.header("⑤ 교육 방법 선택")
-        if 'goal_output' in st.session_state and 'content_output' in st.session_state:
+        if 'goal_plan' in st.session_state and 'content_plan' in st.session_state:
             if 'monthly_plan' not in st.session_state:
                 st.session_state.monthly_plan = {}
 
             def parse_monthly_data():
-                goals_text = st.session_state.get('goal_output', '')
-                contents_text = st.session_state.get('content_output', '')
-                selected_months = st.session_state.get('selected_months', [])
-                
-                monthly_data = {month: {} for month in selected_months}
-
-                goal_chunks = re.split(r'\[(\d{1,2}월) 목표\]', goals_text)[1:]
-                for i in range(0, len(goal_chunks), 2):
-                    month = goal_chunks[i]
-                    if month in monthly_data:
-                        goal_content = goal_chunks[i+1].strip()
-                        if '근거 성취기준:' in goal_content:
-                            goal_content = goal_content.split('근거 성취기준:')[0].strip()
-                        monthly_data[month]['goal'] = goal_content
-                
-                content_chunks = re.split(r'### (\d{1,2}월) 주요 학습 활동', contents_text)[1:]
-                for i in range(0, len(content_chunks), 2):
-                    month = content_chunks[i]
-                    if month in monthly_data:
-                        monthly_data[month]['content'] = content_chunks[i+1].strip()
-
+                # 구조화된 목표·내용에서 바로 가져오므로 글을 다시 해석하지 않음
+                selected_months = list(st.session_state.goal_plan['months'])
+                parsed = build_monthly_plan(st.session_state.goal_plan, st.session_state.content_plan, selected_months)
                 for month in selected_months:
                     st.session_state.monthly_plan[month] = {
-                        'goal': monthly_data.get(month, {}).get('goal', "파싱 실패: ③교육목표 탭을 확인해주세요."),
-                        'content': monthly_data.get(month, {}).get('content', "파싱 실패: ④교육내용 탭을 확인해주세요."),
+                        'goal': parsed[month]['goal'],
+                        'content': parsed[month]['content'],
                         'methods': st.session_state.monthly_plan.get(month, {}).get('methods', []),
                         'other_method': st.session_state.monthly_plan.get(month, {}).get('other_method', "")
                     }
-            
+
             parse_monthly_data()
             
             st.markdown("#### 월별 계획 및 교육 방법 선택")
@@ -486,15 +639,43 @@ with tabs[5]:
             if month not in st.session_state.evaluation_plan:
                 st.session_state.evaluation_plan[month] = {'methods': [], 'criteria': ''}
 
-        EVAL_METHODS = [
-            "관찰누가기록", "포트폴리오", "학습지/과제물 분석", 
-            "질의응답", "발표", "프로젝트", "자기평가/동료평가"
-        ]
-
         st.markdown("---")
         st.subheader("💡 AI 기반 평가계획 자동 생성")
         st.markdown("각 월별로 사용할 평가 방법을 먼저 선택한 후, '평가초점 생성' 버튼을 누르세요.")
 
+        # 모든 월의 평가초점을 동시에 요청하고, 끝나는 대로 월별 결과를 채움
+        if st.button("⚡ 모든 월 평가초점 한 번에 생성", key="btn_eval_plan_all"):
+            eval_plan_prompts = {}
+            for month, plan_data in st.session_state.monthly_plan.items():
+                month_methods = st.session_state.evaluation_plan[month].get('methods', [])
+                if not month_methods:
+                    st.warning(f"{month}: 평가 방법이 선택되지 않아 건너뜁니다.")
+                    continue
+                eval_plan_prompts[month] = build_eval_plan_prompt(plan_data['goal'], plan_data['content'], month_methods)
+
+            if eval_plan_prompts:
+                progress = st.progress(0.0, text=f"Gemini가 {len(eval_plan_prompts)}개 월의 평가초점을 동시에 생성하고 있습니다...")
+                failed_months = []
+                for done, (month, criteria, error) in enumerate(
+                    gemini.generate_many(
+                        eval_plan_prompts, "eval_plan", max_workers=DEFAULT_MAX_WORKERS,
+                        refresh=any(st.session_state.evaluation_plan[m].get('criteria') for m in eval_plan_prompts)
+                    ), start=1
+                ):
+                    if error is not None:
+                        failed_months.append(month)
+                        st.error(f"{month} 평가초점 생성 실패: {error}")
+                    else:
+                        st.session_state.evaluation_plan[month]['criteria'] = criteria
+                        # 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+                        st.session_state.pop(f"criteria_{month}", None)
+                    progress.progress(done / len(eval_plan_prompts), text=f"{done}/{len(eval_plan_prompts)}개 월 완료")
+
+                if failed_months:
+                    st.warning(f"{', '.join(failed_months)} 평가초점은 생성하지 못했습니다. 해당 월의 버튼으로 다시 시도해주세요.")
+                else:
+                    st.success("모든 월의 평가초점 생성이 완료되었습니다!")
+
         for month, plan_data in st.session_state.monthly_plan.items():
             with st.expander(f"**{month} 평가계획 수립**", expanded=True):
                 
@@ -513,31 +694,21 @@ with tabs[5]:
 
                 with col2:
                     st.markdown("<br/>", unsafe_allow_html=True)
-                    if st.button(f"**{month} 평가초점 생성**", key=f"btn_{month}", use_container_width=True):
-                        if not selected_methods:
-                            st.warning(f"{month} 평가 방법을 먼저 1개 이상 선택해주세요.")
-                        else:
-                            with st.spinner(f"Gemini가 {month} 평가초점을 생성하고 있습니다..."):
-                                selected_methods_text = ", ".join(selected_methods)
-                                
-                                prompt_eval_plan = f"""
-                                당신은 개별화교육계획(IEP) 전문가입니다.
-                                아래는 학생의 월별 교육 목표와 내용이며, 이를 평가하기 위한 방법으로 '{selected_methods_text}'가 선택되었습니다.
-
-                                - **월별 교육 목표**: {plan_data['goal']}
-                                - **주요 교육 내용**: {plan_data['content']}
-                                - **선택된 평가 방법**: {selected_methods_text}
-
-                                **[과업 지시]**
-                                선택된 평가 방법에 가장 적합한 **'평가 초점'**을 구체적인 질문 또는 확인 항목의 형태로 3~4가지 제안해 주세요.
-                                
-                                **[출력 규칙]**
-                                - 마크다운 리스트(`- `) 형식으로 평가 초점만 간결하게 작성하세요.
-                                - 각 항목은 학생의 성취 여부를 명확히 확인할 수 있는 내용이어야 합니다.
-                                """
-                                response = model.generate_content(prompt_eval_plan)
-                                st.session_state.evaluation_plan[month]['criteria'] = response.text
-                                st.success(f"{month} 평가초점 생성이 완료되었습니다!")
+                    generate_clicked = st.button(f"**{month} 평가초점 생성**", key=f"btn_{month}", use_container_width=True)
+
+                if generate_clicked:
+                    if not selected_methods:
+                        st.warning(f"{month} 평가 방법을 먼저 1개 이상 선택해주세요.")
+                    else:
+                        prompt_eval_plan = build_eval_plan_prompt(plan_data['goal'], plan_data['content'], selected_methods)
+                        criteria = generate_with_progress(
+                            gemini, prompt_eval_plan, "eval_plan", f"Gemini가 {month} 평가초점을 생성하고 있습니다...",
+                            refresh=bool(current_eval_data.get('criteria'))
+                        )
+                        if criteria is not None:
+                            st.session_state.evaluation_plan[month]['criteria'] = criteria
+                            st.session_state.pop(f"criteria_{month}", None)
+                            st.success(f"{month} 평가초점 생성이 완료되었습니다!")
 
                 if st.session_state.evaluation_plan[month].get('criteria'):
                     st.markdown("---")
@@ -568,26 +739,11 @@ with tabs[6]:
     st.markdown(f"```\n{summary_text}\n```")
 
     st.subheader("3. 학기별 교육 계획")
-    plan_data = []
-    subject_name = st.session_state.get('subject', '')
-    for month, data in st.session_state.get('monthly_plan', {}).items():
-        methods_list = data.get('methods', [])
-        other_method = data.get('other_method', '')
-        if "기타 (직접 작성)" in methods_list and other_method:
-            methods_list = [m if m != "기타 (직접 작성)" else other_method for m in methods_list]
-        
-        eval_data = st.session_state.get('evaluation_plan', {}).get(month, {})
-        eval_methods = ", ".join(eval_data.get('methods', []))
-        eval_criteria = eval_data.get('criteria', '').strip()
-        eval_text = f"▪︎ 평가 방법: {eval_methods}\n▪︎ 평가 초점:\n{eval_criteria}"
-
-        plan_data.append({
-            "교과(영역)": f"{subject_name} ({month})",
-            "장기 교육 목표 및 수립 근거": data.get('goal', ''),
-            "교육 내용": data.get('content', ''),
-            "교육 방법": ", ".join(methods_list),
-            "평가 계획": eval_text
-        })
+    plan_data = build_plan_rows(
+        st.session_state.get('subject', ''),
+        st.session_state.get('monthly_plan', {}),
+        st.session_state.get('evaluation_plan', {})
+    )
 
     if plan_data:
         for month_plan in plan_data:
@@ -625,52 +781,25 @@ with tabs[6]:
         
         if all_ready:
             with st.spinner("IEP Word 문서를 생성 중입니다..."):
-                document = Document()
-                style = document.styles['Normal']; style.font.name = '맑은 고딕'; style.font.size = Pt(11)
-
-                title = document.add_heading('개별화교육계획(IEP)', level=0); title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                document.add_paragraph()
-
-                document.add_heading('1. 인적사항', level=1)
-                table_info = document.add_table(rows=2, cols=4); table_info.style = 'Table Grid'
-                table_info.cell(0, 0).text = '학생명'; table_info.cell(0, 1).text = st.session_state.get('student_name', '')
-                table_info.cell(0, 2).text = '학년/반'; table_info.cell(0, 3).text = st.session_state.get('student_class_info', '')
-                table_info.cell(1, 0).text = '교과'; table_info.cell(1, 1).text = st.session_state.get('subject', '')
-                table_info.cell(1, 1).merge(table_info.cell(1, 3))
-                for row in table_info.rows:
-                    row.cells[0].paragraphs[0].runs[0].font.bold = True
-                    if len(row.cells) > 2: row.cells[2].paragraphs[0].runs[0].font.bold = True
-                document.add_paragraph()
-
-                document.add_heading('2. 현행학습수준', level=1)
-                document.add_paragraph(st.session_state.get('summary', ''))
-                document.add_paragraph()
-                
-                document.add_heading('3. 학기별 교육 계획', level=1)
-                plan_table = document.add_table(rows=1, cols=5); plan_table.style = 'Table Grid'
-                headers = ['교과(영역)', '교육 목표', '교육 내용', '교육 방법', '평가 계획']
-                for i, header in enumerate(headers):
-                    plan_table.rows[0].cells[i].text = header
-                    plan_table.rows[0].cells[i].paragraphs[0].runs[0].font.bold = True
-                
-                for month_plan in plan_data:
-                    row_cells = plan_table.add_row().cells
-                    row_cells[0].text = month_plan['교과(영역)']
-                    row_cells[1].text = month_plan['교육 목표']
-                    row_cells[2].text = month_plan['교육 내용']
-                    row_cells[3].text = month_plan['교육 방법']
-                    row_cells[4].text = month_plan['평가 계획']
-                
-                file_stream = io.BytesIO(); document.save(file_stream); file_stream.seek(0)
+                docx_bytes = build_iep_docx(
+                    st.session_state.get('student_name', ''),
+                    st.session_state.get('student_class_info', ''),
+                    st.session_state.get('subject', ''),
+                    st.session_state.get('summary', ''),
+                    plan_data
+                )
                 st.success("✅ IEP 문서 생성이 완료되었습니다.")
                 now_str = datetime.now().strftime("%Y%m%d")
                 st.download_button(
                     label="📥 Word 파일(.docx) 다운로드",
-                    data=file_stream,
+                    data=docx_bytes,
                     file_name=f"IEP_{st.session_state.student_name}_{now_str}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    mime=DOCX_MIME
                 )
 
+# 이번 실행에서 바뀐 작성 내용을 임시 저장함
+autosave_draft(DRAFT_SPEC)
+
 # --- 저작권 표시 ---
 st.markdown("---")
 st.markdown("<p style='text-align: center; color: grey;'>Copyright © 2025 신하영(천안가온중학교), 성현준(청양고등학교). All Rights Reserved.</p>", unsafe_allow_html=True)
\ No newline at end of file
@@ -1,39 +1,55 @@
 import streamlit as st
-import google.generativeai as genai
 from datetime import datetime
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import io
+
+from utils.documents import (
+    DOCX_MIME,
+    build_evaluation_docx,
+    build_docx_zip,
+    build_evaluation_report,
+    evaluation_report_filename,
+)
+from utils.llm import DEFAULT_MAX_WORKERS
+from utils.prompts import build_month_eval_prompt
+from utils.drafts import DraftSpec
+from utils.ui import (
+    autosave_draft,
+    generate_with_progress,
+    render_draft_panel,
+    render_streaming_toggle,
+    require_gemini_client,
+)
 
 # --- 🔄 세션 데이터 초기화 함수 ---
 def reset_student_data():
-    """새로운 학생 평가를 위해 모든 입력값과 세션 상태를 초기화함."""
+    """새로운 학생 평가를 위해 모든 입력값과 세션 상태를 초기화함. 보고서 대기열과 사용자 확인은 유지함."""
     for key in list(st.session_state.keys()):
-        if key not in ['user_api_key', 'GEMINI_API_KEY']:
+        if key not in ['user_api_key', 'GEMINI_API_KEY', 'report_queue', 'is_approved', 'approved_user']:
             del st.session_state[key]
     st.rerun()
 
-# --- 🔑 API 키 및 AI 모델 설정 ---
-if 'user_api_key' in st.session_state and st.session_state.user_api_key:
-    genai.configure(api_key=st.session_state.user_api_key)
-else:
-    try:
-        genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    except Exception as e:
-        st.error("Gemini API 키가 설정되지 않았음. 환경 변수나 사이드바 설정을 확인해야 함.")
-        st.stop()
-
-model = genai.GenerativeModel('gemini-2.0-flash')
-
 st.set_page_config(
     page_title="AI 기반 개별화교육평가",
     page_icon="📝",
     layout="wide"
 )
 
-# --- ✨ 평가초점 생성 콜백 함수 (논리적 불일치 해결 및 서두 제거) ---
-def generate_focus_callback(month, goal, content):
+# --- 🔑 API 키 및 AI 모델 설정 (API 키별 공용 클라이언트) ---
+gemini = require_gemini_client("Gemini API 키가 설정되지 않았음. 환경 변수나 사이드바 설정을 확인해야 함.", page="evaluation")
+
+render_streaming_toggle()
+
+# 월별 입력·평가 결과와 학기 종합 평가를 학생별로 임시 저장함
+DRAFT_SPEC = DraftSpec(
+    page="evaluation",
+    keys=("evaluations_ai", "semester_evaluation", "semester_radio_eval", "report_student_label"),
+    prefixes=("status_", "goal_", "instructional_", "eval_focus_", "rating_"),
+    derived_prefixes=("ai_edit_", "semester_eval_editor"),
+)
+render_draft_panel(DRAFT_SPEC)
+
+# --- ✨ 평가초점 생성 함수 (논리적 불일치 해결 및 서두 제거) ---
+# 생성 결과는 입력창을 그리기 전에 바로 입력창 상태에 넣음
+def generate_focus(month, goal, content, placeholder):
     if not goal or not content:
         st.error("평가초점을 생성하려면 먼저 해당 월의 교육 목표와 내용을 입력해야 함.")
         return
@@ -51,12 +67,80 @@ def generate_focus_callback(month, goal, content):
     3. 모든 문장은 반드시 '~함' 또는 '~임'으로 끝나는 명사형 종결 어미를 사용하십시오.
     4. 각 항목을 줄바꿈으로 구분하여 리스트 형태로 출력하십시오.
     """
-    with st.spinner(f"{month} 평가초점을 생성하는 중임..."):
-        try:
-            response = model.generate_content(prompt_focus)
-            st.session_state[f"eval_focus_{month}"] = response.text.strip()
-        except Exception as e:
-            st.error(f"AI 생성 중 오류가 발생함: {e}")
+    try:
+        focus_text = generate_with_progress(
+            gemini, prompt_focus, "eval_focus", f"{month} 평가초점을 생성하는 중임...", placeholder=placeholder,
+            refresh=bool(st.session_state.get(f"eval_focus_{month}"))
+        )
+    except Exception as e:
+        st.error(f"AI 생성 중 오류가 발생함: {e}")
+        return
+    if focus_text is None:
+        return
+    st.session_state[f"eval_focus_{month}"] = focus_text.strip()
+
+# --- 📋 월별 평가 데이터 수집 ---
+def split_focus_items(eval_focus_text):
+    return [item.strip() for item in eval_focus_text.split('\n') if item.strip()]
+
+
+def collect_focus_ratings(month, eval_focus_items):
+    return [
+        (item, st.session_state.get(f"rating_{month}_{i}", "평가되지 않음"))
+        for i, item in enumerate(eval_focus_items)
+    ]
+
+
+def set_month_evaluation(month, goal, instructional, evaluation):
+    st.session_state.evaluations_ai[month] = {
+        "goal": goal,
+        "instructional": instructional,
+        "evaluation": evaluation
+    }
+    # 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+    st.session_state.pop(f"ai_edit_{month}", None)
+
+
+# --- ⚡ 준비된 모든 월 종합 평가 일괄 생성 ---
+def generate_ready_months(months, max_workers):
+    """정상 수업 월은 동시에 AI 평가를 요청하고, 특이 상황 월은 API 호출 없이 템플릿 문구를 적용함."""
+    month_prompts = {}
+    month_inputs = {}
+    for month in months:
+        status = st.session_state.get(f"status_{month}", "정상 수업")
+        goal_text = st.session_state.get(f"goal_{month}", "")
+        instructional_text = st.session_state.get(f"instructional_{month}", "")
+
+        if status != "정상 수업":
+            set_month_evaluation(month, goal_text, instructional_text, SPECIAL_CASE_TEMPLATES.get(status))
+            continue
+
+        eval_focus_items = split_focus_items(st.session_state.get(f"eval_focus_{month}", ""))
+        if not goal_text or not eval_focus_items:
+            continue
+
+        month_inputs[month] = (goal_text, instructional_text)
+        month_prompts[month] = build_month_eval_prompt(goal_text, collect_focus_ratings(month, eval_focus_items))
+
+    if not month_prompts:
+        return [], []
+
+    done_months, failed_months = [], []
+    progress = st.progress(0.0, text=f"AI가 {len(month_prompts)}개 월의 평가 문구를 동시에 생성 중임...")
+    for done, (month, evaluation, error) in enumerate(
+        gemini.generate_many(
+            month_prompts, "eval_month", max_workers=max_workers,
+            refresh=any(month in st.session_state.evaluations_ai for month in month_prompts)
+        ), start=1
+    ):
+        if error is not None:
+            failed_months.append(month)
+            st.error(f"{month} 평가 생성 중 오류가 발생함: {error}")
+        else:
+            done_months.append(month)
+            set_month_evaluation(month, *month_inputs[month], evaluation)
+        progress.progress(done / len(month_prompts), text=f"{done}/{len(month_prompts)}개 월 완료")
+    return done_months, failed_months
 
 # --- 🚀 UI 구성 시작 ---
 st.title("📝 AI 기반 개별화교육평가")
@@ -87,102 +171,125 @@ SPECIAL_CASE_TEMPLATES = {
     "잦은 지각 및 결석으로 인한 수업 미참여": "잦은 출결 변동(지각·결석)으로 인해 실질적인 수업 참여가 불규칙하여, 목표 달성 여부를 확인하기 위한 객관적인 평가 자료가 미비함."
 }
 
+# --- 🗓️ 월별 평가 (월마다 독립 fragment) ---
+# 한 달 안의 입력·버튼은 그 달만 다시 실행함. 학기 단위 상태(evaluations_ai)는 hand_off_month 로만 넘김
+def hand_off_month(month, goal, instructional, evaluation, message):
+    """월 평가를 학기 단위 상태에 반영함. 처음 완료된 월이면 학기 완료 현황도 바뀌므로 전체를 다시 실행함."""
+    newly_done = month not in st.session_state.evaluations_ai
+    set_month_evaluation(month, goal, instructional, evaluation)
+    if newly_done:
+        st.session_state[f"eval_notice_{month}"] = message
+        st.rerun()
+    st.success(message)
+
+
+@st.fragment
+def render_month_evaluation(month):
+    with st.container(border=True):
+        st.subheader(f"✅ {month} 평가")
+
+        # 운영 상황 선택
+        status = st.selectbox(
+            f"🚩 {month} 수업 운영 상황",
+            ["정상 수업", "외부 행사 등으로 인한 수업 시수 부족", "치료 목적의 단축 수업(조퇴)", "잦은 지각 및 결석으로 인한 수업 미참여"],
+            key=f"status_{month}"
+        )
+
+        goal_text = st.text_area(f"{month} 교육 목표", key=f"goal_{month}", height=80)
+        instructional_text = st.text_area(f"{month} 교육 내용", key=f"instructional_{month}", height=100)
+
+        # 정상 수업일 때만 평가 초점 및 척도 활성화
+        if status == "정상 수업":
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                # 입력창 자리를 먼저 잡고 버튼을 처리한 뒤에 그려서, 생성 결과를 다시 실행 없이 바로 반영함
+                focus_slot = st.empty()
+                focus_stream_area = st.empty()
+            with col2:
+                st.write("")
+                st.write("")
+                if st.button(f"✨ 초점 생성", key=f"btn_gen_focus_{month}"):
+                    generate_focus(month, goal_text, instructional_text, focus_stream_area)
+            eval_focus_text = focus_slot.text_area(f"{month} 평가초점 (행동 중심)", key=f"eval_focus_{month}", height=100)
+
+            eval_focus_items = split_focus_items(eval_focus_text)
+
+            if eval_focus_items:
+                st.markdown("#### 항목별 성취도 평가")
+                for i, item in enumerate(eval_focus_items):
+                    st.markdown(f"**{i+1}. {item}**")
+                    st.radio(
+                        "성취도 선택",
+                        RATING_OPTIONS,
+                        key=f"rating_{month}_{i}",
+                        horizontal=True,
+                        label_visibility="collapsed"
+                    )
+
+            if st.button(f"🧠 {month} AI 종합 평가 생성", key=f"btn_ai_{month}"):
+                if not goal_text or not eval_focus_text:
+                    st.error("목표와 평가초점을 입력해야 함.")
+                else:
+                    prompt_eval = build_month_eval_prompt(goal_text, collect_focus_ratings(month, eval_focus_items))
+                    evaluation = generate_with_progress(
+                        gemini, prompt_eval, "eval_month", f"AI가 {month} 평가 문구를 생성 중임...",
+                        refresh=month in st.session_state.evaluations_ai
+                    )
+                    if evaluation is not None:
+                        hand_off_month(month, goal_text, instructional_text, evaluation, f"✔️ {month} 평가 문구 생성 완료!")
+
+        # 특이 상황일 때 (시수 부족 등)
+        else:
+            st.warning(f"'{status}' 상황임. 아래 버튼을 클릭하여 전문 문구를 적용함.")
+            if st.button(f"📋 {month} 특이사항 문구 적용", key=f"btn_special_{month}"):
+                hand_off_month(
+                    month, goal_text, instructional_text, SPECIAL_CASE_TEMPLATES.get(status), "✔️ 특이사항 문구가 적용되었음."
+                )
+
+        notice = st.session_state.pop(f"eval_notice_{month}", None)
+        if notice:
+            st.success(notice)
+
+        # 최종 평가 결과 노출 및 편집
+        if month in st.session_state.evaluations_ai:
+            st.session_state.evaluations_ai[month]["evaluation"] = st.text_area(
+                f"{month} 최종 평가 문구 (편집 가능)",
+                value=st.session_state.evaluations_ai[month]["evaluation"],
+                key=f"ai_edit_{month}", height=150
+            )
+
+    autosave_draft(DRAFT_SPEC)
+
+
 with st.container(border=True):
     st.subheader("🗓️ 월별 교육 목표 입력 및 평가")
     semester = st.radio("평가 대상 학기 선택", ["1학기", "2학기"], horizontal=True, key="semester_radio_eval")
     months = {"1학기": ["3월", "4월", "5월", "6월", "7월"], "2학기": ["8월", "9월", "10월", "11월", "12월"]}[semester]
+
+    col_batch, col_workers = st.columns([3, 1])
+    with col_workers:
+        max_workers = st.number_input(
+            "동시 생성 수", min_value=1, max_value=8, value=DEFAULT_MAX_WORKERS, key="batch_max_workers",
+            help="한 번에 Gemini에 보내는 요청 수. 요청 한도 오류가 잦으면 줄임."
+        )
+    with col_batch:
+        st.write("")
+        batch_clicked = st.button("⚡ 준비된 모든 월 종합 평가 한 번에 생성", key="btn_ai_all_months", use_container_width=True)
+    if batch_clicked:
+        done_months, failed_months = generate_ready_months(months, int(max_workers))
+        if done_months:
+            st.success(f"✔️ {', '.join(done_months)} 평가 문구 생성 완료!")
+        if not done_months and not failed_months:
+            st.info("AI 평가를 생성할 월이 없음. 정상 수업 월은 목표와 평가초점을 먼저 입력해야 함.")
     
     for month in months:
-        with st.container(border=True):
-            st.subheader(f"✅ {month} 평가")
-            
-            # 운영 상황 선택
-            status = st.selectbox(
-                f"🚩 {month} 수업 운영 상황",
-                ["정상 수업", "외부 행사 등으로 인한 수업 시수 부족", "치료 목적의 단축 수업(조퇴)", "잦은 지각 및 결석으로 인한 수업 미참여"],
-                key=f"status_{month}"
-            )
-            
-            goal_text = st.text_area(f"{month} 교육 목표", key=f"goal_{month}", height=80)
-            instructional_text = st.text_area(f"{month} 교육 내용", key=f"instructional_{month}", height=100)
-            
-            # 정상 수업일 때만 평가 초점 및 척도 활성화
-            if status == "정상 수업":
-                col1, col2 = st.columns([4, 1])
-                with col1:
-                    eval_focus_text = st.text_area(f"{month} 평가초점 (행동 중심)", key=f"eval_focus_{month}", height=100)
-                with col2:
-                    st.write("") 
-                    st.write("")
-                    st.button(f"✨ 초점 생성", key=f"btn_gen_focus_{month}", on_click=generate_focus_callback, args=(month, goal_text, instructional_text))
-                
-                eval_focus_items = [item.strip() for item in eval_focus_text.split('\n') if item.strip()]
-
-                if eval_focus_items:
-                    st.markdown("#### 항목별 성취도 평가")
-                    for i, item in enumerate(eval_focus_items):
-                        st.markdown(f"**{i+1}. {item}**")
-                        st.radio(
-                            "성취도 선택", 
-                            RATING_OPTIONS, 
-                            key=f"rating_{month}_{i}", 
-                            horizontal=True, 
-                            label_visibility="collapsed"
-                        )
-                
-                if st.button(f"🧠 {month} AI 종합 평가 생성", key=f"btn_ai_{month}"):
-                    if not goal_text or not eval_focus_text:
-                        st.error("목표와 평가초점을 입력해야 함.")
-                    else:
-                        full_eval_data = ""
-                        for i, item in enumerate(eval_focus_items):
-                            rating_label = st.session_state.get(f"rating_{month}_{i}", "평가되지 않음")
-                            full_eval_data += f"- 평가 초점: {item} / 성취 수준: {rating_label}\n"
-
-                        # 월별 평가 생성 시 '단순 나열' 방지를 위한 정교화된 프롬프트
-                        prompt_eval = f"""
-                        당신은 특수교육 전문가임. 제공된 자료로 학생 성취도를 전문적인 관찰 언어로 서술함.
-                        [작성 규칙]
-                        1. '초점+척도'를 단순히 합친 문장을 나열하지 마십시오.
-                        2. 비슷한 수행 수준을 보인 항목들을 유기적으로 묶어서 하나의 문단으로 구성하십시오.
-                        3. 강점과 보완점을 대조하는 연결어를 사용하여 문장의 흐름을 자연스럽게 만드십시오.
-                        4. 모든 문장은 반드시 '~함', '~임', '~하였음'과 같은 명사형 종결 어미를 사용하십시오.
-                        
-                        목표: {goal_text}
-                        관찰 데이터:
-                        {full_eval_data}
-                        """
-                        with st.spinner(f"AI가 {month} 평가 문구를 생성 중임..."):
-                            response = model.generate_content(prompt_eval)
-                            st.session_state.evaluations_ai[month] = {
-                                "goal": goal_text,
-                                "instructional": instructional_text,
-                                "evaluation": response.text
-                            }
-                        st.success(f"✔️ {month} 평가 문구 생성 완료!")
-
-            # 특이 상황일 때 (시수 부족 등)
-            else:
-                st.warning(f"'{status}' 상황임. 아래 버튼을 클릭하여 전문 문구를 적용함.")
-                if st.button(f"📋 {month} 특이사항 문구 적용", key=f"btn_special_{month}"):
-                    st.session_state.evaluations_ai[month] = {
-                        "goal": goal_text,
-                        "instructional": instructional_text,
-                        "evaluation": SPECIAL_CASE_TEMPLATES.get(status)
-                    }
-                    st.success(f"✔️ 특이사항 문구가 적용되었음.")
-
-            # 최종 평가 결과 노출 및 편집
-            if month in st.session_state.evaluations_ai:
-                st.session_state.evaluations_ai[month]["evaluation"] = st.text_area(
-                    f"{month} 최종 평가 문구 (편집 가능)",
-                    value=st.session_state.evaluations_ai[month]["evaluation"],
-                    key=f"ai_edit_{month}", height=150
-                )
+        render_month_evaluation(month)
 
 # ---------------- 🎓 학기 종합 평가 (요약 구조화 로직) ----------------
 st.markdown("---")
 st.subheader("🎓 학기 종합 평가")
+completed_months = [m for m in months if m in st.session_state.evaluations_ai]
+st.caption(f"월별 평가 완료: {', '.join(completed_months) or '없음'} ({len(completed_months)}/{len(months)}개 월)")
 if st.button("🧠 학기 종합 평가 생성", key="btn_semester_eval"):
     monthly_evals = {m: st.session_state.evaluations_ai[m] for m in months if m in st.session_state.evaluations_ai}
     if not monthly_evals:
@@ -207,10 +314,15 @@ if st.button("🧠 학기 종합 평가 생성", key="btn_semester_eval"):
         데이터:
         {full_semester_data}
         """
-        with st.spinner("학기 종합 요약 평가 생성 중..."):
-            response = model.generate_content(prompt_sem)
-            st.session_state.semester_evaluation[semester] = response.text
-        st.success("✔️ 학기 종합 요약 평가가 생성되었음!")
+        semester_text = generate_with_progress(
+            gemini, prompt_sem, "semester", "학기 종합 요약 평가 생성 중...",
+            refresh=bool(st.session_state.semester_evaluation.get(semester))
+        )
+        if semester_text is not None:
+            st.session_state.semester_evaluation[semester] = semester_text
+            # 편집 상자가 새 결과로 다시 그려지도록 이전 입력 상태를 지움
+            st.session_state.pop("semester_eval_editor", None)
+            st.success("✔️ 학기 종합 요약 평가가 생성되었음!")
 
 if st.session_state.semester_evaluation.get(semester):
     st.session_state.semester_evaluation[semester] = st.text_area(
@@ -222,50 +334,80 @@ if st.session_state.semester_evaluation.get(semester):
 # ---------------- 📥 결과 다운로드 및 초기화 ----------------
 st.markdown("---")
 st.subheader("📥 결과 다운로드 및 다음 학생 평가")
-col_down, col_reset = st.columns(2)
+if 'report_queue' not in st.session_state:
+    st.session_state.report_queue = []
+
+report_label = st.text_input("학생 이름 (파일 이름과 보고서에 표시됨)", key="report_student_label")
+
+def current_report():
+    return build_evaluation_report(
+        report_label.strip(), semester, months,
+        st.session_state.evaluations_ai, st.session_state.semester_evaluation.get(semester, "")
+    )
+
+col_down, col_queue, col_reset = st.columns(3)
 
 with col_down:
     if st.button("📄 Word 파일 생성", key="btn_download_eval", use_container_width=True):
         with st.spinner("Word 파일을 생성하는 중임..."):
-            document = Document()
-            # 폰트 설정
-            style = document.styles['Normal']
-            style.font.name = '맑은 고딕'
-            style.font.size = Pt(11)
-            
-            title = document.add_heading('개별화교육평가 결과 보고서', level=0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            document.add_paragraph(f"작성일: {datetime.now().strftime('%Y년 %m월 %d일')}\n")
-            
-            for month in months:
-                if month in st.session_state.evaluations_ai:
-                    data = st.session_state.evaluations_ai[month]
-                    document.add_heading(f"{month} 평가", level=2)
-                    document.add_paragraph(f"▪︎ 교육 목표: {data['goal']}")
-                    document.add_paragraph(f"▪︎ 주요 교육 내용:\n{data['instructional']}")
-                    document.add_paragraph(f"▪︎ 종합 평가 결과:\n{data['evaluation']}\n")
-            
-            if semester in st.session_state.semester_evaluation:
-                document.add_heading(f"{semester} 종합 요약 평가", level=1)
-                document.add_paragraph(st.session_state.semester_evaluation[semester])
-
-            # 메모리 내 저장 및 다운로드
-            file_stream = io.BytesIO()
-            document.save(file_stream)
-            file_stream.seek(0)
-            
+            report = current_report()
             st.download_button(
                 label="📥 Word 파일 다운로드",
-                data=file_stream,
-                file_name=f"IEP_Evaluation_{datetime.now().strftime('%Y%m%d')}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                data=build_evaluation_docx(report),
+                file_name=evaluation_report_filename(report) if report['label'] else f"IEP_Evaluation_{datetime.now().strftime('%Y%m%d')}.docx",
+                mime=DOCX_MIME,
                 use_container_width=True
             )
 
+with col_queue:
+    # 완료한 학생 보고서를 모아 두었다가 한 번에 ZIP 으로 내려받음
+    if st.button("📥 보고서 대기열에 추가", key="btn_queue_report", use_container_width=True):
+        if not report_label.strip():
+            st.error("대기열에 추가하려면 학생 이름을 입력해야 함.")
+        elif not any(m in st.session_state.evaluations_ai for m in months):
+            st.error("먼저 최소 한 달 이상의 평가를 생성해야 함.")
+        else:
+            report = current_report()
+            # 같은 학생·학기 보고서는 최신 내용으로 교체함
+            st.session_state.report_queue = [
+                r for r in st.session_state.report_queue
+                if (r['label'], r['semester']) != (report['label'], report['semester'])
+            ] + [report]
+            st.success(f"✔️ {report['label']} 보고서를 대기열에 추가함. (총 {len(st.session_state.report_queue)}건)")
+
 with col_reset:
     if st.button("🆕 새 학생 평가 시작 (데이터 초기화)", key="btn_main_reset", use_container_width=True, type="primary"):
         reset_student_data()
-    st.caption("⚠️ 클릭 시 입력된 모든 데이터가 삭제되며 초기 상태로 돌아감.")
+    st.caption("⚠️ 클릭 시 입력된 모든 데이터가 삭제되며 초기 상태로 돌아감. 보고서 대기열은 유지됨.")
+
+if st.session_state.report_queue:
+    with st.container(border=True):
+        queued = st.session_state.report_queue
+        st.markdown(f"**📦 보고서 대기열 ({len(queued)}건)**")
+        st.caption(", ".join(f"{r['label']}({r['semester']})" for r in queued))
+
+        def build_queue_zip(reports=tuple(queued)):
+            # 다운로드를 누를 때 작업 스레드에서 문서를 만들며 ZIP 을 차례로 써 나감.
+            # 완성된 ZIP 은 download_button 이 메모리에 올려 두고 내려보냄
+            return build_docx_zip(reports)
+
+        col_zip, col_clear = st.columns(2)
+        with col_zip:
+            st.download_button(
+                label="📦 대기열 전체 ZIP 다운로드",
+                data=build_queue_zip,
+                file_name=f"IEP_Evaluations_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip",
+                key="btn_download_queue_zip",
+                use_container_width=True
+            )
+        with col_clear:
+            if st.button("🗑️ 대기열 비우기", key="btn_clear_queue", use_container_width=True):
+                st.session_state.report_queue = []
+                st.rerun()
+
+# 이번 실행에서 바뀐 작성 내용을 임시 저장함
+autosave_draft(DRAFT_SPEC)
 
 # --- 저작권 표시 ---
 st.markdown("---")
@@ -0,0 +1,87 @@
+import time
+
+import streamlit as st
+
+from utils.llm_cache import get_response_cache
+from utils.profiling import report as startup_report
+from utils.scheduler import get_scheduler
+from utils.telemetry import load_events, summarize
+from utils.ui import is_admin_user
+
+st.set_page_config(
+    page_title="Gemini 호출 현황",
+    page_icon="📊",
+    layout="wide"
+)
+
+# --- 🔒 관리자만 볼 수 있음 (secrets.toml 의 admin_users = ["소속/이름", ...]) ---
+if not is_admin_user():
+    st.error("관리자만 볼 수 있는 페이지입니다.")
+    st.stop()
+
+WINDOWS = {"최근 1시간": 60 * 60, "최근 24시간": 24 * 60 * 60, "최근 7일": 7 * 24 * 60 * 60, "전체": None}
+
+
+# 기록 파일은 호출마다 늘어나므로 짧게만 캐시함
+@st.cache_data(ttl=30, show_spinner=False)
+def load_window(seconds):
+    return load_events(since=time.time() - seconds if seconds else None)
+
+
+st.title("📊 Gemini 호출 현황")
+col_window, col_refresh = st.columns([3, 1])
+window = col_window.selectbox("기간", list(WINDOWS), key="metrics_window")
+if col_refresh.button("🔄 새로고침", use_container_width=True):
+    load_window.clear()
+
+events = load_window(WINDOWS[window])
+if not events:
+    st.info("선택한 기간에 기록된 호출이 없습니다.")
+else:
+    called = [e for e in events if not e.get("cached")]
+    errors = [e for e in called if e.get("error")]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("호출 수", len(events))
+    m2.metric("캐시 사용", f"{(len(events) - len(called)) / len(events):.0%}")
+    m3.metric("오류율", f"{len(errors) / len(called):.1%}" if called else "-")
+    m4.metric("토큰(입력/출력)", f"{sum(e.get('prompt_tokens') or 0 for e in called):,} / "
+                                f"{sum(e.get('response_tokens') or 0 for e in called):,}")
+
+    st.subheader("프롬프트 종류별")
+    st.dataframe(summarize(events, "kind"), use_container_width=True, hide_index=True)
+    st.subheader("페이지별")
+    st.dataframe(summarize(events, "page"), use_container_width=True, hide_index=True)
+
+    if errors:
+        st.subheader("최근 오류")
+        st.dataframe([
+            {
+                "시각": time.strftime("%m/%d %H:%M:%S", time.localtime(e["ts"])),
+                "페이지": e.get("page"), "종류": e.get("kind"), "사용자": e.get("user"), "오류": e["error"],
+            }
+            for e in reversed(errors[-20:])
+        ], use_container_width=True, hide_index=True)
+
+# --- 현재 대기열·캐시 (이 프로세스 기준) ---
+st.markdown("---")
+col_queue, col_cache = st.columns(2)
+with col_queue:
+    st.subheader("요청 대기열")
+    snapshot = get_scheduler().snapshot()
+    st.caption(f"실행 중 {sum(snapshot['active'].values())} / {snapshot['max_concurrency']}, "
+               f"대기 {sum(snapshot['waiting'].values())}")
+    st.json(snapshot)
+with col_cache:
+    st.subheader("응답 캐시")
+    st.json(get_response_cache().stats())
+
+# --- 이 프로세스의 지연 import·초기화 시간 (utils.profiling) ---
+st.markdown("---")
+st.subheader("시작 시간")
+phases = startup_report()
+if phases:
+    st.caption("처음 쓸 때 불러온 모듈과 프로세스당 한 번 하는 초기화에 걸린 시간. "
+               "새 프로세스의 첫 화면 시간은 `python -m utils.profiling` 으로 잴 수 있습니다.")
+    st.dataframe(phases, use_container_width=True, hide_index=True)
+else:
+    st.caption("아직 기록된 지연 import·초기화가 없습니다.")
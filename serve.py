@@ -0,0 +1,61 @@
+"""
+운영 서버 실행기: 캐시를 미리 데운 뒤 Streamlit 서버를 연다.
+
+    python serve.py --ready-port 8502 --server.port 8501 --server.headless true
+
+--ready-port(환경 변수 IEP_READY_PORT, 기본 8502)를 뺀 나머지 인자는 그대로 `streamlit run main_app.py` 에 넘긴다.
+1) 준비 상태 서버(utils.warmup.ReadinessServer)를 먼저 열어 부하 분산기가 /ready 를 확인할 수 있게 하고
+2) 같은 프로세스에서 warm_up() 으로 성취기준 인덱스, 문서 템플릿, Gemini 클라이언트 등을 미리 준비한 다음
+3) Streamlit 서버를 연다. 데우기가 끝나기 전에는 앱 포트가 열리지 않으므로 교사 요청이 차가운 프로세스에 닿지 않는다.
+/ready 는 Streamlit 의 /_stcore/health 가 응답한 뒤에야 200 이 된다.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from utils.warmup import HEALTH_POLL_SECONDS, ReadinessServer, WarmupState, wait_until_serving, warm_up
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def wait_for_streamlit(state):
+    """Streamlit 이 설정(인자·config.toml)을 읽고 런타임을 만든 뒤, 그 설정의 /_stcore/health 를 기다린다."""
+    from streamlit import config, runtime
+
+    while not runtime.exists():
+        time.sleep(HEALTH_POLL_SECONDS)
+    base = (config.get_option("server.baseUrlPath") or "").strip("/")
+    url = f"http://127.0.0.1:{config.get_option('server.port')}/{base + '/' if base else ''}_stcore/health"
+    wait_until_serving(state, url)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="캐시를 데운 뒤 Streamlit 서버 실행")
+    parser.add_argument("--ready-port", type=int, default=int(os.environ.get("IEP_READY_PORT", "8502")),
+                        help="준비 상태(/ready, /live) 포트")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    os.chdir(APP_DIR)
+    from streamlit.web import bootstrap, cli
+
+    # 데우기 중 st.secrets 등이 설정을 먼저 읽으므로, streamlit run 과 같은 인자로 미리 읽어 둠
+    # (그러지 않으면 서버를 열 때 설정이 바뀌었다는 경고가 남음)
+    run_args = [os.path.join(APP_DIR, "main_app.py"), *streamlit_args]
+    params = cli.main_run.make_context("run", list(run_args)).params
+    bootstrap.load_config_options({k: v for k, v in params.items() if k not in ("target", "args")})
+
+    state = WarmupState()
+    ReadinessServer(state, port=args.ready_port).start()
+    print(f"[warmup] 준비 상태: http://0.0.0.0:{args.ready_port}/ready")
+
+    warm_up(state)
+    threading.Thread(target=wait_for_streamlit, args=(state,), name="wait-serving", daemon=True).start()
+
+    sys.argv = ["streamlit", "run", *run_args]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from utils import batch
+from utils.batch import load_students, output_filename, run_batch
+
+CSV_HEADER = "student_name,class_info,subject,curriculums,grades,months,ratings,eval_methods\n"
+
+
+def test_load_students_csv(tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text(
+        "﻿" + CSV_HEADER
+        + "홍길동,3-2,국어,기본교육과정,초등학교 3-4학년군; 초등학교 5-6학년군,3월;4월,"
+        + "\"4국01-01:예; 4국01-02 : 관찰 필요;\",\n",
+        encoding="utf-8"
+    )
+    [student] = load_students(str(path))
+    assert student["student_name"] == "홍길동"
+    assert student["grades"] == ["초등학교 3-4학년군", "초등학교 5-6학년군"]
+    assert student["months"] == ["3월", "4월"]
+    assert student["eval_methods"] == []
+    assert student["domains"] == []  # 없는 목록 열은 빈 목록
+    assert student["ratings"] == {"4국01-01": "예", "4국01-02": "관찰 필요"}
+
+
+def test_load_students_csv_rejects_bad_ratings(tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text(CSV_HEADER + "홍길동,3-2,국어,기본교육과정,초등학교 3-4학년군,,4국01-01 예,\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="ratings 형식 오류"):
+        load_students(str(path))
+
+
+def test_load_students_jsonl(tmp_path):
+    path = tmp_path / "students.jsonl"
+    path.write_text(json.dumps({"student_name": "가"}) + "\n\n" + json.dumps({"student_name": "나"}) + "\n",
+                    encoding="utf-8")
+    assert [s["student_name"] for s in load_students(str(path))] == ["가", "나"]
+    path.write_text('{"student_name": "가"}\n{oops\n', encoding="utf-8")
+    with pytest.raises(ValueError, match=":2 JSON 형식 오류"):
+        load_students(str(path))
+
+
+@pytest.fixture
+def fake_generate(monkeypatch):
+    calls = []
+    failing = set()
+
+    def generate(client, index, student, max_workers):
+        calls.append(student["student_name"])
+        if student["student_name"] in failing:
+            raise RuntimeError("생성 실패")
+        return f"docx:{student['student_name']}".encode("utf-8")
+
+    monkeypatch.setattr(batch, "generate_student_docx", generate)
+    return calls, failing
+
+
+def _statuses(results):
+    return {student["student_name"]: status for student, _, status, _ in results}
+
+
+def test_run_batch_skips_done_and_resumes_failed(tmp_path, fake_generate):
+    calls, failing = fake_generate
+    students = [{"student_name": name, "class_info": "3-1"} for name in ("가", "나", "다")]
+    out_dir = tmp_path / "out"
+
+    failing.add("나")
+    assert _statuses(run_batch(None, students, str(out_dir))) == {"가": "done", "나": "failed", "다": "done"}
+    # 실패한 학생은 파일도 임시 파일도 남기지 않음
+    assert sorted(p.name for p in out_dir.iterdir()) == sorted(output_filename(s) for s in students if s["student_name"] != "나")
+
+    failing.clear()
+    calls.clear()
+    assert _statuses(run_batch(None, students, str(out_dir))) == {"가": "skipped", "나": "done", "다": "skipped"}
+    assert calls == ["나"]
+    assert (out_dir / output_filename(students[1])).read_bytes() == "docx:나".encode("utf-8")
+
+    calls.clear()
+    assert set(_statuses(run_batch(None, students, str(out_dir), force=True)).values()) == {"done"}
+    assert sorted(calls) == ["가", "나", "다"]
+
+
+def test_run_batch_rejects_duplicate_output_names(tmp_path, fake_generate):
+    students = [{"student_name": "가", "class_info": "3-1"}, {"student_name": "가", "class_info": "3-1"}]
+    with pytest.raises(ValueError, match="student_id"):
+        list(run_batch(None, students, str(tmp_path)))
+    students[1]["student_id"] = "가-2"
+    assert set(_statuses(run_batch(None, students, str(tmp_path))).values()) == {"done"}
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from utils import curriculum
+from utils.curriculum import CurriculumIndex, standard_key
+
+
+def _write(data_dir, name, content):
+    path = data_dir / "기본교육과정" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    _write(tmp_path, "국어_초등학교 1-2학년군.json", json.dumps([
+        {"id": "2국01-01", "영역": "듣기", "내용": "듣는다."},
+        {"id": "2국02-01", "영역": "읽기", "내용": "읽는다."},
+        {"id": "2국01-02", "영역": "듣기", "내용": "또 듣는다."},
+    ], ensure_ascii=False))
+    return tmp_path
+
+
+def test_index_groups_items(data_dir):
+    index = CurriculumIndex(str(data_dir))
+    args = ("기본교육과정", "국어", "초등학교 1-2학년군")
+    assert index.has_file(*args)
+    assert index.domains(*args) == ("듣기", "읽기")
+    assert [item["id"] for item in index.domain_items(*args, "듣기")] == ["2국01-01", "2국01-02"]
+    assert index.available_grades(["기본교육과정"], "국어") == ["초등학교 1-2학년군"]
+    item = index.items(*args)[0]
+    assert index.item_by_key(standard_key(item)) is item
+    assert item["출처"] == "[기본교육과정] 초등학교 1-2학년군"
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "한글".encode("cp949"),          # UTF-8 이 아닌 파일
+    json.dumps({"id": "x"}),         # 목록이 아님
+    json.dumps(["x"]),               # 항목이 사전이 아님
+])
+def test_broken_file_is_skipped(data_dir, content):
+    _write(data_dir, "수학_초등학교 1-2학년군.json", content)
+    index = CurriculumIndex(str(data_dir))
+    assert index.has_file("기본교육과정", "국어", "초등학교 1-2학년군")
+    assert not index.has_file("기본교육과정", "수학", "초등학교 1-2학년군")
+    assert index.file_error("기본교육과정", "수학", "초등학교 1-2학년군")
+
+
+def test_unreadable_file_is_skipped(data_dir, monkeypatch):
+    path = _write(data_dir, "수학_초등학교 1-2학년군.json", "[]")
+
+    def failing_open(file, *args, **kwargs):
+        if file == str(path):
+            raise PermissionError(13, "Permission denied", file)
+        return open(file, *args, **kwargs)
+
+    monkeypatch.setattr(curriculum, "open", failing_open, raising=False)
+    index = CurriculumIndex(str(data_dir))
+    assert index.has_file("기본교육과정", "국어", "초등학교 1-2학년군")
+    assert "Permission denied" in index.file_error("기본교육과정", "수학", "초등학교 1-2학년군")
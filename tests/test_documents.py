@@ -0,0 +1,28 @@
+import io
+import zipfile
+
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from utils.documents import build_docx_zip, evaluation_report_filename, write_docx_zip
+
+
+def test_write_docx_zip_keeps_order_and_unique_names():
+    reports = [{"label": label, "semester": "1학기"} for label in ("가", "나", "가", "다/라", "가")]
+    fileobj = write_docx_zip(reports, io.BytesIO(), render=lambda r: r["label"].encode("utf-8"), max_workers=2)
+    with zipfile.ZipFile(fileobj) as archive:
+        names = archive.namelist()
+        assert [archive.read(name).decode("utf-8") for name in names] == [r["label"] for r in reports]
+    first = evaluation_report_filename(reports[0])
+    assert names[0] == first
+    assert names[2] == first.replace(".docx", "_2.docx")
+    assert names[4] == first.replace(".docx", "_3.docx")
+    assert len(set(names)) == len(names)
+    assert "/" not in names[3]
+
+
+def test_build_docx_zip_is_accepted_by_download_button():
+    reports = [{"label": "가", "semester": "1학기"}, {"label": "나", "semester": "2학기"}]
+    data = build_docx_zip(reports, render=lambda r: r["label"].encode("utf-8"))
+    payload, _ = convert_data_to_bytes_and_infer_mime(data, unsupported_error=RuntimeError("unsupported"))
+    with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+        assert [archive.read(name) for name in archive.namelist()] == ["가".encode("utf-8"), "나".encode("utf-8")]
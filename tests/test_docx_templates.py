@@ -0,0 +1,110 @@
+import io
+
+import pytest
+from docx import Document
+
+from utils import docx_templates
+from utils.docx_templates import DocxTemplate, get_template
+
+
+def _texts(data):
+    document = Document(io.BytesIO(data))
+    texts = [p.text for p in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            texts.append([cell.text for cell in row.cells])
+    return texts
+
+
+def _template(build):
+    document = docx_templates._base_document()
+    build(document)
+    file_stream = io.BytesIO()
+    document.save(file_stream)
+    return DocxTemplate(file_stream.getvalue())
+
+
+@pytest.fixture(autouse=True)
+def fresh_render_cache(monkeypatch):
+    monkeypatch.setattr(docx_templates, "_render_cache", docx_templates.RenderCache())
+
+
+def test_scalar_placeholders_and_line_breaks():
+    template = _template(lambda d: d.add_paragraph("이름: {{name}} / {{missing}}"))
+    texts = _texts(template.render({"name": "가\n나"}))
+    assert texts == ["이름: 가\n나 / "]
+
+
+def test_table_row_expansion():
+    def build(document):
+        table = document.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "월"
+        table.cell(1, 0).text = "{{rows.month}}"
+        table.cell(1, 1).text = "{{rows.goal}} ({{subject}})"
+
+    template = _template(build)
+    texts = _texts(template.render({"subject": "국어", "rows": [
+        {"month": "3월", "goal": "읽기"}, {"month": "4월", "goal": "쓰기"},
+    ]}))
+    assert texts[-3:] == [["월", ""], ["3월", "읽기 (국어)"], ["4월", "쓰기 (국어)"]]
+
+
+def test_empty_rows_remove_template_row():
+    def build(document):
+        table = document.add_table(rows=2, cols=1)
+        table.cell(0, 0).text = "머리글"
+        table.cell(1, 0).text = "{{rows.goal}}"
+
+    texts = _texts(_template(build).render({"rows": []}))
+    assert texts[-1:] == [["머리글"]]
+
+
+def test_sections_and_list_paragraphs():
+    def build(document):
+        document.add_paragraph("{{#sections}}")
+        document.add_paragraph("제목 {{sections.title}}")
+        document.add_paragraph("{{*sections.lines}}")
+        document.add_paragraph("{{/sections}}")
+        document.add_paragraph("끝")
+
+    texts = _texts(_template(build).render({"sections": [
+        {"title": "가", "lines": ["1", "2"]}, {"title": "나", "lines": []},
+    ]}))
+    assert texts == ["제목 가", "1", "2", "제목 나", "끝"]
+
+
+def test_user_text_with_braces_is_not_filled_again():
+    # 교사가 입력한 값에 든 {{...}} 는 자리표시자로 다루지 않음
+    context = {
+        "student_name": "{{class_info}}", "class_info": "3-1", "subject": "국어", "summary": "{{subject}}",
+        "rows": [{"area": "3월", "goal": "{{student_name}}", "content": "{{*x}}", "methods": "", "evaluation": ""}],
+    }
+    texts = _texts(get_template("iep").render(context))
+    assert "{{subject}}" in texts
+    assert ["3월", "{{student_name}}", "{{*x}}", "", ""] in texts
+    assert ["학생명", "{{class_info}}", "학년/반", "3-1"] in texts
+
+
+def test_meeting_list_lines_are_not_filled_again():
+    context = {
+        "datetime": "d", "location": "L", "meeting_types": "", "attendees": "",
+        "sections": [{"title": "T", "lines": ["{{location}}", "{{*resolution_lines}}"]}],
+        "resolution_lines": ["의결"],
+    }
+    texts = _texts(get_template("meeting").render(context))
+    assert texts.count("{{location}}") == 1
+    assert texts.count("{{*resolution_lines}}") == 1
+    assert texts.count("의결") == 1
+
+
+def test_render_does_not_change_template():
+    template = _template(lambda d: d.add_paragraph("{{name}}"))
+    assert _texts(template.render({"name": "가"})) == ["가"]
+    assert _texts(template.render({"name": "나"})) == ["나"]
+
+
+def test_render_cache_reuses_bytes():
+    template = _template(lambda d: d.add_paragraph("{{name}}"))
+    first = template.render({"name": "가"})
+    assert template.render({"name": "가"}) is first
+    assert docx_templates._render_cache.hits == 1
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from utils.drafts import DraftStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DraftStore(path=str(tmp_path / "drafts.sqlite"), debounce_seconds=60, max_delay_seconds=60, max_tracked=2)
+
+
+def test_only_changed_fields_are_queued(store):
+    assert store.schedule_save("교사", "p", "가", {"a": 1, "b": [1, 2]}) == 2
+    assert store.schedule_save("교사", "p", "가", {"a": 1, "b": [1, 2]}) == 0
+    assert store.schedule_save("교사", "p", "가", {"a": 2, "b": [1, 2]}) == 1
+    assert store.load("교사", "p", "가") == {"a": 2, "b": [1, 2]}
+    assert store.load("교사", "p", "나") == {}
+
+
+def test_tracked_hashes_are_bounded(store):
+    for label in ("가", "나", "다"):
+        store.schedule_save("교사", "p", label, {"a": 1})
+    assert len(store._written) == 2
+    # 잊힌 임시 저장은 다음 저장 때 전부 다시 씀
+    assert store.schedule_save("교사", "p", "가", {"a": 1}) == 1
+    assert store.schedule_save("교사", "p", "다", {"a": 1}) == 0
+
+
+def test_failed_write_is_reported_and_retried(store):
+    store.schedule_save("교사", "p", "가", {"a": 1})
+    conn = sqlite3.connect(store.path)
+    conn.execute("ALTER TABLE drafts RENAME TO drafts_moved")
+    conn.commit()
+    store.flush()
+    assert "drafts" in store.last_error("교사", "p", "가")
+
+    conn.execute("ALTER TABLE drafts_moved RENAME TO drafts")
+    conn.commit()
+    conn.close()
+    # 실패한 값은 해시를 잊었으므로 같은 값이라도 다시 대기열에 오름
+    assert store.schedule_save("교사", "p", "가", {"a": 1}) == 1
+    store.flush()
+    assert store.last_error("교사", "p", "가") is None
+    assert store.load("교사", "p", "가") == {"a": 1}
+
+
+def test_delete(store):
+    store.schedule_save("교사", "p", "가", {"a": 1})
+    assert store.exists("교사", "p", "가")
+    store.delete("교사", "p", "가")
+    assert not store.exists("교사", "p", "가")
+    assert store.load("교사", "p", "가") == {}
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from google.api_core import exceptions
+
+from utils import llm
+
+
+def test_import_does_not_load_google_sdk():
+    code = "import sys, utils.llm; print(any(m.startswith(('grpc', 'google.api_core')) for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parents[1])
+    assert result.stdout.strip() == "False"
+
+
+class _Response:
+    text = "응답"
+    usage_metadata = None
+
+
+class _FlakyModel:
+    def __init__(self, errors):
+        self.errors = list(errors)
+
+    def generate_content(self, prompt, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        return _Response()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(llm, "record_event", lambda event: None)
+    monkeypatch.setattr(llm, "backoff_delay", lambda attempt: 0)
+    return llm.GeminiClient("test-key", "test-model")
+
+
+def test_transient_errors_are_retried(client):
+    client._model = _FlakyModel([exceptions.ServiceUnavailable("busy"), ConnectionError()])
+    assert client.generate("p", "goal", use_cache=False) == "응답"
+
+
+def test_rejected_request_is_not_retried(client):
+    client._model = _FlakyModel([exceptions.PermissionDenied("bad key")])
+    with pytest.raises(llm.LLMError, match="거부"):
+        client.generate("p", "goal", use_cache=False)
+    assert client._model.errors == []
@@ -0,0 +1,109 @@
+import pytest
+
+from utils import llm, llm_cache
+from utils.llm_cache import LLMResponseCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(path=str(tmp_path / "cache.sqlite"), max_entries=3, ttl_seconds=60)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_response(cache):
+    assert cache.get("m", "프롬프트", "goal") is None
+    cache.put("m", "프롬프트", "goal", "응답")
+    assert cache.get("m", "프롬프트", "goal") == "응답"
+    assert cache.get("other-model", "프롬프트", "goal") is None
+    assert cache.stats()["process"]["goal"] == {"hits": 1, "misses": 2}
+
+
+def test_prompt_whitespace_is_normalized():
+    assert cache_key("m", "  가   나\n\t다  \n") == cache_key("m", "가 나\n다")
+    assert cache_key("m", "가 나") != cache_key("m", "가나")
+
+
+def test_expired_entries_are_dropped(cache, clock):
+    cache.put("m", "p", "goal", "응답")
+    clock[0] += 59
+    assert cache.get("m", "p", "goal") == "응답"
+    clock[0] += 2
+    assert cache.get("m", "p", "goal") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    for name in ("a", "b", "c"):
+        clock[0] += 1
+        cache.put("m", name, "goal", name)
+    clock[0] += 1
+    assert cache.get("m", "a", "goal") == "a"  # a 를 최근에 씀 → b 가 가장 오래됨
+    clock[0] += 1
+    cache.put("m", "d", "goal", "d")
+    assert cache.get("m", "b", "goal") is None
+    assert [cache.get("m", name, "goal") for name in ("a", "c", "d")] == ["a", "c", "d"]
+
+
+def test_disabled_kind_is_not_cached(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite"), disabled_kinds={"semester"})
+    cache.put("m", "p", "semester", "응답")
+    assert cache.get("m", "p", "semester") is None
+    assert cache.stats()["entries"] == 0
+    cache.put("m", "p", "goal", "응답")
+    assert cache.get("m", "p", "goal") == "응답"
+
+
+def test_empty_response_is_not_cached(cache):
+    cache.put("m", "p", "goal", "")
+    assert cache.stats()["entries"] == 0
+
+
+# --- GeminiClient 의 캐시 사용 ---
+class _Response:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class _FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        return _Response(f"응답 {self.calls}")
+
+
+@pytest.fixture
+def client(cache, monkeypatch):
+    monkeypatch.setattr(llm, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(llm, "record_event", lambda event: None)
+    gemini = llm.GeminiClient("test-key", "test-model")
+    gemini._model = _FakeModel()
+    return gemini
+
+
+def test_generate_reads_cache_unless_refresh(client):
+    assert client.generate("p", "goal") == "응답 1"
+    assert client.generate("p", "goal") == "응답 1"
+    # 다시 생성: 캐시를 건너뛰고 새 응답으로 캐시를 바꿈
+    assert client.generate("p", "goal", refresh=True) == "응답 2"
+    assert client.generate("p", "goal") == "응답 2"
+    assert client._model.calls == 2
+
+
+def test_generate_without_cache_does_not_store(client):
+    assert client.generate("p", "goal", use_cache=False) == "응답 1"
+    assert client.generate("p", "goal") == "응답 2"
+
+
+def test_generate_many_refresh(client):
+    client.generate("p", "goal")
+    results = {name: text for name, text, _ in client.generate_many({"a": "p"}, "goal", refresh=True)}
+    assert results == {"a": "응답 2"}
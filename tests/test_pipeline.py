@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from utils.pipeline import PipelineSkipped, Stage, run_pipeline
+
+
+def _run(stages, max_workers=4):
+    return {name: (result, error) for name, result, error in run_pipeline(stages, max_workers=max_workers)}
+
+
+def test_results_flow_to_dependent_stages():
+    stages = [
+        Stage("a", lambda deps: 1),
+        Stage("b", lambda deps: 2),
+        Stage("sum", lambda deps: deps["a"] + deps["b"], deps=("a", "b")),
+        Stage("double", lambda deps: deps["sum"] * 2, deps=("sum",)),
+    ]
+    outcome = _run(stages)
+    assert outcome == {"a": (1, None), "b": (2, None), "sum": (3, None), "double": (6, None)}
+
+
+def test_independent_stages_run_concurrently():
+    # 두 단계가 서로를 기다리므로, 동시에 실행되지 않으면 시간 안에 끝나지 않음
+    barrier = threading.Barrier(2, timeout=2)
+
+    def meet(deps):
+        barrier.wait()
+        return True
+
+    outcome = _run([Stage("a", meet), Stage("b", meet)], max_workers=2)
+    assert outcome == {"a": (True, None), "b": (True, None)}
+
+
+def test_failed_stage_skips_dependents_only():
+    def fail(deps):
+        raise RuntimeError("실패")
+
+    called = []
+    stages = [
+        Stage("goal", fail),
+        Stage("summary", lambda deps: "요약"),
+        Stage("content", lambda deps: called.append("content"), deps=("goal",)),
+        Stage("eval", lambda deps: called.append("eval"), deps=("goal", "content")),
+    ]
+    outcome = _run(stages)
+    assert isinstance(outcome["goal"][1], RuntimeError)
+    assert outcome["summary"] == ("요약", None)
+    assert isinstance(outcome["content"][1], PipelineSkipped)
+    assert isinstance(outcome["eval"][1], PipelineSkipped)
+    assert called == []
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="선행 단계가 없습니다"):
+        list(run_pipeline([Stage("a", lambda deps: 1, deps=("missing",))]))
+
+
+def test_cycle_is_detected():
+    stages = [
+        Stage("free", lambda deps: 1),
+        Stage("a", lambda deps: 1, deps=("b",)),
+        Stage("b", lambda deps: 1, deps=("a",)),
+    ]
+    finished = []
+    with pytest.raises(ValueError, match="순환 의존"):
+        for name, _, _ in run_pipeline(stages):
+            finished.append(name)
+    assert finished == ["free"]
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from utils.planning import (
+    CONTENT_PARSE_FAILED,
+    GOAL_PARSE_FAILED,
+    month_context_items,
+    normalize_month,
+    parse_content_plan,
+    parse_goal_plan,
+    parse_month_activities,
+    parse_month_goal,
+)
+
+MONTHS = ["3월", "4월"]
+
+
+def test_parse_goal_plan():
+    text = json.dumps({
+        "semester_goal": " 학기 목표 ",
+        "monthly_goals": [
+            {"month": "3 월", "goal": "3월 목표", "standards": ["A01", " ", "A02 "]},
+            {"month": "3월", "goal": "중복은 무시", "standards": []},
+            {"month": "9월", "goal": "대상이 아닌 월", "standards": []},
+        ],
+    }, ensure_ascii=False)
+    plan = parse_goal_plan(text, "1학기", MONTHS)
+    assert plan == {
+        "semester": "1학기",
+        "semester_goal": "학기 목표",
+        "months": {
+            "3월": {"goal": "3월 목표", "standards": ["A01", "A02"]},
+            "4월": {"goal": GOAL_PARSE_FAILED, "standards": []},
+        },
+    }
+
+
+def test_parse_goal_plan_strips_code_fence():
+    text = '```json\n{"semester_goal": "목표", "monthly_goals": []}\n```'
+    assert parse_goal_plan(text, "1학기", MONTHS)["semester_goal"] == "목표"
+
+
+@pytest.mark.parametrize("text", ["", "목표입니다", '{"semester_goal": ', "[1, 2]", '"문자열"'])
+def test_parse_goal_plan_rejects_malformed_json(text):
+    with pytest.raises(ValueError, match="교육목표"):
+        parse_goal_plan(text, "1학기", MONTHS)
+
+
+@pytest.mark.parametrize("data", [
+    {"semester_goal": None, "monthly_goals": None},
+    {"semester_goal": 3, "monthly_goals": "3월 목표"},
+    {"monthly_goals": ["3월", None, {"month": 3, "goal": ["목표"], "standards": "A01"}]},
+])
+def test_parse_goal_plan_tolerates_wrong_types(data):
+    plan = parse_goal_plan(json.dumps(data, ensure_ascii=False), "1학기", MONTHS)
+    assert plan["semester_goal"] == ""
+    assert plan["months"] == {month: {"goal": GOAL_PARSE_FAILED, "standards": []} for month in MONTHS}
+
+
+def test_parse_content_plan():
+    text = json.dumps({"monthly_activities": [
+        {"month": "4월", "activities": [{"name": " 활동 ", "description": "설명"}, "문자열 활동"]},
+        {"month": "3월", "activities": []},
+    ]}, ensure_ascii=False)
+    assert parse_content_plan(text, MONTHS) == {"3월": CONTENT_PARSE_FAILED, "4월": "**활동:** 설명"}
+
+
+@pytest.mark.parametrize("text", ["", "{", "null", "[]"])
+def test_parse_content_plan_rejects_malformed_json(text):
+    with pytest.raises(ValueError, match="교육내용"):
+        parse_content_plan(text, MONTHS)
+
+
+@pytest.mark.parametrize("data", [
+    {"monthly_activities": None},
+    {"monthly_activities": "활동"},
+    {"monthly_activities": [None, "3월", {"month": "3월", "activities": "활동"}]},
+])
+def test_parse_content_plan_tolerates_wrong_types(data):
+    assert parse_content_plan(json.dumps(data, ensure_ascii=False), MONTHS) == {
+        month: CONTENT_PARSE_FAILED for month in MONTHS
+    }
+
+
+def test_parse_month_results():
+    assert parse_month_goal('{"goal": " 목표 ", "standards": ["A01"]}') == {"goal": "목표", "standards": ["A01"]}
+    assert parse_month_activities('{"activities": [{"name": "가", "description": "나"}]}') == "**가:** 나"
+    assert parse_month_activities('{"activities": [{"name": null, "description": 1}]}') == "**:** "
+    with pytest.raises(ValueError):
+        parse_month_goal('{"goal": ""}')
+    with pytest.raises(ValueError):
+        parse_month_activities('{"activities": []}')
+
+
+def test_month_context_items_matches_bracketed_ids():
+    items = [{"id": "4국01-01", "content": "가"}, {"id": "4국01-02", "content": "나"}]
+    assert month_context_items(items, ["[4국01-02]"]) == items[1:]
+    assert month_context_items(items, [" 4국01-01 "]) == items[:1]
+    assert month_context_items(items, ["없음"]) == items
+
+
+@pytest.mark.parametrize("text, expected", [("3월", "3월"), ("03 월 목표", "3월"), ("12월", "12월"), ("봄", None), (None, None)])
+def test_normalize_month(text, expected):
+    assert normalize_month(text) == expected
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from utils import scheduler
+from utils.scheduler import FairScheduler, SchedulerTimeout
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(scheduler, "WAIT_POLL_SECONDS", 0.01)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "시간 안에 조건이 만족되지 않음"
+        time.sleep(0.005)
+
+
+def test_round_robin_between_users():
+    s = FairScheduler(max_concurrency=1)
+    s.acquire("holder")
+    order = []
+    order_lock = threading.Lock()
+
+    def worker(user):
+        s.acquire(user)
+        with order_lock:
+            order.append(user)
+        s.release(user)
+
+    threads = []
+    # a 가 먼저 세 건을 쌓고 b 가 한 건: b 는 a 의 두 번째 요청보다 먼저 나가야 함
+    for user in ("a", "a", "a", "b"):
+        thread = threading.Thread(target=worker, args=(user,))
+        thread.start()
+        threads.append(thread)
+        _wait_for(lambda: sum(s.snapshot()["waiting"].values()) == len(threads))
+
+    s.release("holder")
+    for thread in threads:
+        thread.join(timeout=2)
+    assert order == ["a", "b", "a", "a"]
+    assert s.snapshot()["active"] == {}
+
+
+def test_limits_concurrency():
+    s = FairScheduler(max_concurrency=2)
+    s.acquire("a")
+    s.acquire("b")
+    granted = threading.Event()
+
+    def worker():
+        s.acquire("c")
+        granted.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not granted.wait(0.05)
+    assert s.snapshot()["waiting"] == {"c": 1}
+    s.release("a")
+    assert granted.wait(2)
+    thread.join()
+    assert s.snapshot()["active"] == {"b": 1, "c": 1}
+
+
+def test_timeout_leaves_no_ticket():
+    s = FairScheduler(max_concurrency=1, queue_timeout=0.05)
+    s.acquire("a")
+    with pytest.raises(SchedulerTimeout):
+        s.acquire("b")
+    assert s.snapshot() == {"active": {"a": 1}, "waiting": {}, "max_concurrency": 1}
+
+
+def test_on_wait_exception_withdraws_waiting_ticket():
+    s = FairScheduler(max_concurrency=1, queue_timeout=5)
+    s.acquire("a")
+
+    def stop(ahead):
+        raise KeyboardInterrupt  # Streamlit 의 재실행·중단 예외처럼 BaseException 계열
+
+    with pytest.raises(KeyboardInterrupt):
+        s.acquire("b", on_wait=stop)
+    s.release("a")
+    assert s.snapshot() == {"active": {}, "waiting": {}, "max_concurrency": 1}
+
+
+def test_on_wait_exception_after_grant_releases_slot():
+    s = FairScheduler(max_concurrency=1, queue_timeout=5)
+    s.acquire("a")
+
+    def stop(ahead):
+        # 콜백이 도는 사이 자리가 나서 이미 배정된 뒤 예외가 나는 경우
+        s.release("a")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        s.acquire("b", on_wait=stop)
+    assert s.snapshot() == {"active": {}, "waiting": {}, "max_concurrency": 1}
+    s.acquire("c")
+    assert s.snapshot()["active"] == {"c": 1}
+
+
+def test_slot_releases_on_error():
+    s = FairScheduler(max_concurrency=1)
+    with pytest.raises(ValueError):
+        with s.slot("a"):
+            raise ValueError
+    assert s.snapshot()["active"] == {}
@@ -0,0 +1,48 @@
+import json
+import sqlite3
+
+import pytest
+
+from utils.curriculum import CurriculumIndex
+from utils.standards_db import build_match_query, build_standards_db
+
+
+@pytest.fixture
+def index(tmp_path):
+    data_dir = tmp_path / "data"
+    (data_dir / "기본교육과정").mkdir(parents=True)
+    (data_dir / "기본교육과정" / "국어_초등학교 1-2학년군.json").write_text(json.dumps([
+        {"id": "2국01-01", "영역": "듣기", "내용": "바른 자세로 듣는다.", "해설": ""},
+        {"id": "2국01-02", "영역": "말하기", "내용": "자신을 소개한다.", "해설": "소개하는 말"},
+    ], ensure_ascii=False), encoding="utf-8")
+    return CurriculumIndex(str(data_dir))
+
+
+def test_build_match_query():
+    assert build_match_query("소개 a") == '"소개" AND a*'
+    assert build_match_query("바른자세") == '"바른 른자 자세"'
+    assert build_match_query("  ") == ""
+
+
+def test_build_standards_db(tmp_path, index):
+    db_path = tmp_path / "standards.sqlite"
+    assert build_standards_db(index, str(db_path)) == 2
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT s.std_id FROM standards_fts JOIN standards AS s ON s.rowid = standards_fts.rowid "
+        "WHERE standards_fts MATCH ?", (build_match_query("소개"),)
+    ).fetchall()
+    conn.close()
+    assert rows == [("2국01-02",)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data", "standards.sqlite"]
+
+
+def test_failed_build_leaves_no_temp_file(tmp_path, index, monkeypatch):
+    def broken_files():
+        raise RuntimeError("읽기 실패")
+        yield
+
+    monkeypatch.setattr(index, "iter_files", broken_files)
+    with pytest.raises(RuntimeError):
+        build_standards_db(index, str(tmp_path / "standards.sqlite"))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data"]
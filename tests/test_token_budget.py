@@ -0,0 +1,67 @@
+import pytest
+
+from utils import digests
+from utils.token_budget import estimate_tokens, fit_items_to_budget
+
+
+@pytest.fixture(autouse=True)
+def no_saved_digests(monkeypatch):
+    monkeypatch.setattr(digests, "load_digests", lambda path=None: {})
+
+
+def _item(std_id, commentary=""):
+    return {"grade": "시험", "domain": "수", "id": std_id, "content": f"{std_id} 내용", "해설": commentary}
+
+
+def _render(items):
+    return "\n".join(f"{v['id']} {v['content']} {v['해설']}".strip() for v in items)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("abcd" * 10) == 11
+    assert estimate_tokens("가나다") == 3
+    assert estimate_tokens("a b\n c") == 1  # 공백은 세지 않음
+
+
+def test_within_budget_keeps_everything():
+    items = [_item("A01", "짧은 해설."), _item("A02")]
+    prompt, report = fit_items_to_budget(_render, items, budget=10_000)
+    assert prompt == _render(items)
+    assert (report.commentary_dropped, report.items_dropped, report.over_budget) == (0, 0, False)
+
+
+def test_long_commentary_uses_digest():
+    long_commentary = " ".join(["A01 내용과 관련된 설명이다."] + ["전혀 관계없는 긴 문장을 덧붙인다."] * 20)
+    prompt, report = fit_items_to_budget(_render, [_item("A01", long_commentary)], budget=10_000)
+    assert report.digests_used == 1
+    assert len(prompt) < len(long_commentary)
+    assert "A01 내용과 관련된 설명이다." in prompt
+
+
+def test_commentary_dropped_from_uncited_items_first():
+    items = [_item("A01", "가" * 100), _item("A02", "나" * 100), _item("A03", "다" * 100)]
+    full_tokens = estimate_tokens(_render(items))
+    # 해설 하나를 빼면 들어가는 예산
+    prompt, report = fit_items_to_budget(_render, items, cited_ids=["A03"], budget=full_tokens - 50)
+    assert report.commentary_dropped == 1
+    assert report.items_dropped == 0
+    assert "나" * 100 not in prompt  # 근거가 아닌 항목 중 뒤쪽부터 뺌
+    assert "가" * 100 in prompt and "다" * 100 in prompt
+    assert not report.over_budget
+
+
+def test_items_dropped_but_one_always_kept():
+    items = [_item("A01"), _item("A02"), _item("A03")]
+    prompt, report = fit_items_to_budget(_render, items, cited_ids=["A02"], budget=1)
+    assert report.items_dropped == 2
+    assert prompt == _render([items[1]])
+    assert report.over_budget
+    assert report.tokens == estimate_tokens(prompt)
+
+
+def test_summary_mentions_each_reduction():
+    items = [_item("A01", "가" * 100), _item("A02", "나" * 100)]
+    _, report = fit_items_to_budget(_render, items, budget=1)
+    text = report.summary()
+    assert "해설 생략 2개" in text and "성취기준 생략 1개" in text
@@ -0,0 +1,22 @@
+from utils import ui
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt, kind, **kwargs):
+        self.calls.append(("generate", kwargs.get("response_schema")))
+        return '{"goal": "목표"}'
+
+    def stream(self, prompt, kind, **kwargs):
+        self.calls.append(("stream", kwargs.get("response_schema")))
+        yield "문장"
+
+
+def test_structured_calls_do_not_stream_raw_json():
+    client = FakeClient()
+    schema = {"type": "object"}
+    assert ui.generate_with_progress(client, "p", "goal", "생성 중", response_schema=schema) == '{"goal": "목표"}'
+    assert ui.generate_with_progress(client, "p", "summary", "생성 중") == "문장"
+    assert client.calls == [("generate", schema), ("stream", None)]
@@ -0,0 +1 @@
+"""AI 기반 IEP 시스템의 페이지 공용 모듈 모음."""
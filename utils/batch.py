@@ -0,0 +1,241 @@
+"""
+학급 단위 IEP 일괄 생성 (화면 없이 실행)
+
+학생별 진단 결과 파일(CSV 또는 JSONL)을 읽어 ②~⑥ 생성 단계를 학생마다 파이프라인으로 돌리고,
+학생 한 명당 .docx 하나를 출력 폴더에 쓴다. 이미 만들어진 문서는 건너뛰므로
+중간에 멈춘 실행을 같은 명령으로 다시 돌리면 남은 학생만 생성한다.
+
+    GEMINI_API_KEY=... python -m utils.batch students.jsonl --out iep_output
+
+JSONL 한 줄(학생 한 명) 예시:
+    {"student_name": "홍길동", "class_info": "3-2", "subject": "국어",
+     "curriculums": ["기본교육과정"], "grades": ["초등학교 3-4학년군"], "semester": "1학기",
+     "months": ["3월", "4월"], "ratings": {"4국01-01": "예", "4국01-02": "아니오"},
+     "eval_methods": ["관찰누가기록"], "teaching_methods": ["직접 교수법"]}
+
+CSV 는 같은 이름의 열을 쓰고, 목록은 ';'로, ratings 는 'ID:평가;ID:평가' 형식으로 적는다.
+months, domains, eval_methods, teaching_methods 는 생략할 수 있다.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.curriculum import get_curriculum_index, standard_key
+from utils.documents import build_iep_docx, build_plan_rows, safe_filename_part
+from utils.llm import DEFAULT_MAX_WORKERS, get_client
+from utils.pipeline import run_pipeline
+from utils.planning import (
+    DEFAULT_EVAL_METHODS,
+    MONTHS_IN_SEMESTER,
+    RATING_VALUES,
+    build_monthly_plan,
+    build_planning_stages,
+    expand_ratings,
+)
+
+LIST_FIELDS = ("curriculums", "grades", "months", "domains", "eval_methods", "teaching_methods")
+DEFAULT_STUDENTS_PARALLEL = 2
+
+
+# --- 입력 파일 ---
+def _split_list(value):
+    return [part.strip() for part in (value or "").split(";") if part.strip()]
+
+
+def _parse_csv_ratings(value):
+    ratings = {}
+    for part in _split_list(value):
+        if ":" not in part:
+            raise ValueError(f"ratings 형식 오류: '{part}' (ID:평가 형식이어야 합니다)")
+        std_id, rating = part.split(":", 1)
+        ratings[std_id.strip()] = rating.strip()
+    return ratings
+
+
+def load_students(path):
+    """CSV 또는 JSONL 파일을 학생 사전 목록으로 읽는다."""
+    students = []
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                student = {key: (value or "").strip() for key, value in row.items() if key}
+                for field in LIST_FIELDS:
+                    student[field] = _split_list(student.get(field))
+                student["ratings"] = _parse_csv_ratings(student.get("ratings"))
+                students.append(student)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    students.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no} JSON 형식 오류: {e}") from e
+    return students
+
+
+def output_filename(student):
+    label = student.get("student_id") or f"{student.get('class_info', '')}_{student['student_name']}"
+    return f"IEP_{safe_filename_part(label)}.docx"
+
+
+# --- 학생 한 명 생성 ---
+def build_evaluation(index, student):
+    """
+    ratings({성취기준 ID: 평가})를 ① 현행수준 진단 탭과 같은 evaluation 구조로 바꾼다.
+    반환값: (evaluation, selected_domains)
+    """
+    ratings = student.get("ratings") or {}
+    invalid = {std_id: value for std_id, value in ratings.items() if value not in RATING_VALUES}
+    if invalid:
+        raise ValueError(f"평가 값은 {', '.join(RATING_VALUES)} 중 하나여야 합니다: {invalid}")
+
+    codes, domains = {}, []
+    for curriculum in student["curriculums"]:
+        for grade in student["grades"]:
+            for item in index.items(curriculum, student["subject"], grade):
+                if item["id"] not in ratings:
+                    continue
+                codes[standard_key(item)] = RATING_VALUES.index(ratings[item["id"]])
+                domain = item.get("영역", "기타")
+                if domain not in domains:
+                    domains.append(domain)
+
+    evaluation = expand_ratings(codes, index)
+    found = {v["id"] for v in evaluation.values()}
+    missing = [std_id for std_id in ratings if std_id not in found]
+    if missing:
+        raise ValueError(f"선택한 교육과정·학년군에 없는 성취기준 ID: {', '.join(missing)}")
+    return evaluation, (student.get("domains") or domains)
+
+
+def generate_student_docx(client, index, student, max_workers=DEFAULT_MAX_WORKERS):
+    """학생 한 명의 ②~⑥ 단계를 생성하고 IEP 문서 바이트를 반환한다. 한 단계라도 실패하면 예외를 낸다."""
+    evaluation, selected_domains = build_evaluation(index, student)
+    semester = student.get("semester") or "1학기"
+    months = student.get("months") or MONTHS_IN_SEMESTER[semester]
+    eval_methods = {month: student.get("eval_methods") or DEFAULT_EVAL_METHODS for month in months}
+
+    stages = build_planning_stages(
+        client, student["subject"], evaluation, selected_domains, semester, months, eval_methods
+    )
+    results = {}
+    for name, result, error in run_pipeline(stages, max_workers=max_workers):
+        if error is not None:
+            raise RuntimeError(f"'{name}' 단계 실패: {error}") from error
+        results[name] = result
+
+    monthly_plan = build_monthly_plan(results["goal"], results["content"], months)
+    for data in monthly_plan.values():
+        data["methods"] = student.get("teaching_methods") or []
+    evaluation_plan = {
+        month: {"methods": eval_methods[month], "criteria": results[f"eval:{month}"]} for month in months
+    }
+    plan_rows = build_plan_rows(student["subject"], monthly_plan, evaluation_plan)
+    return build_iep_docx(
+        student["student_name"], student.get("class_info", ""), student["subject"],
+        results.get("summary") or "", plan_rows
+    )
+
+
+def _write_atomic(path, data):
+    # 중간에 멈춰도 반쯤 쓴 파일이 완료된 문서로 보이지 않도록 임시 파일에 쓰고 이름을 바꿈
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# --- 일괄 실행 ---
+def run_batch(client, students, out_dir, students_parallel=DEFAULT_STUDENTS_PARALLEL,
+              max_workers=DEFAULT_MAX_WORKERS, force=False):
+    """
+    학생들을 students_parallel 명씩 동시에 생성한다. 학생마다 단계 동시 실행 수는 max_workers 이다.
+    끝나는 순서대로 (학생, 출력 경로, 상태, 오류)를 내보낸다. 상태는 "done", "skipped", "failed".
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = get_curriculum_index()
+
+    paths = [os.path.join(out_dir, output_filename(student)) for student in students]
+    duplicates = {path for path in paths if paths.count(path) > 1}
+    if duplicates:
+        raise ValueError(f"출력 파일 이름이 겹치는 학생이 있습니다. student_id 열을 지정해주세요: {', '.join(sorted(duplicates))}")
+
+    todo = []
+    for student, path in zip(students, paths):
+        if os.path.exists(path) and not force:
+            yield student, path, "skipped", None
+        else:
+            todo.append((student, path))
+
+    def work(student, path):
+        _write_atomic(path, generate_student_docx(client, index, student, max_workers))
+
+    with ThreadPoolExecutor(max_workers=max(1, students_parallel)) as executor:
+        futures = {executor.submit(work, student, path): (student, path) for student, path in todo}
+        for future in as_completed(futures):
+            student, path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                yield student, path, "failed", e
+            else:
+                yield student, path, "done", None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="학급 단위 IEP 문서 일괄 생성")
+    parser.add_argument("input", help="학생별 진단 결과 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--out", default="iep_output", help="IEP 문서를 저장할 폴더")
+    parser.add_argument("--students-parallel", type=int, default=DEFAULT_STUDENTS_PARALLEL,
+                        help="동시에 생성할 학생 수")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="학생 한 명 안에서 동시에 실행할 생성 단계 수")
+    parser.add_argument("--force", action="store_true", help="이미 만든 문서도 다시 생성")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        parser.error("GEMINI_API_KEY 환경 변수를 설정해주세요.")
+
+    students = load_students(args.input)
+    # 일괄 생성은 한 사용자로 세어, 같은 서버에서 화면을 쓰는 교사들의 차례를 막지 않음
+    client = get_client(api_key).for_user("batch", page="batch")
+    started = time.perf_counter()
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+    for done, (student, path, status, error) in enumerate(
+        run_batch(client, students, args.out, args.students_parallel, args.max_workers, args.force), start=1
+    ):
+        counts[status] += 1
+        message = f"[{done}/{len(students)}] {student.get('student_name', '')}: "
+        if status == "failed":
+            message += f"실패 - {error}"
+        elif status == "skipped":
+            message += f"이미 있음 ({path})"
+        else:
+            message += f"완료 ({path})"
+        print(message, flush=True)
+
+    print(
+        f"완료 {counts['done']}명, 건너뜀 {counts['skipped']}명, 실패 {counts['failed']}명 "
+        f"({time.perf_counter() - started:.1f}초)"
+    )
+    if counts["failed"]:
+        print("실패한 학생은 같은 명령을 다시 실행하면 이어서 생성합니다.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+성취기준 데이터(data/) 인덱스
+
+data/{교육과정}/{교과}_{학년군}.json 파일을 프로세스당 한 번만 읽어서
+(교육과정, 교과, 학년군, 영역) 단위로 조회할 수 있는 읽기 전용 인덱스를 만든다.
+인덱스는 모든 세션이 공유하며, data/ 아래 파일이 바뀌면 자동으로 다시 만든다.
+"""
+import json
+import os
+import threading
+import time
+
+from utils.profiling import startup_phase
+
+DATA_DIR = "data"
+
+SUBJECTS_BY_CURRICULUM = {
+    "기본교육과정": ["국어", "수학", "생활영어", "진로와직업", "체육", "정보통신활용", "보건"],
+    "공통교육과정": ["국어", "수학", "실과", "정보", "체육", "기술가정"]
+}
+
+CURRICULUM_SHORT_NAMES = {
+    "기본교육과정": "기본",
+    "공통교육과정": "공통"
+}
+
+ALL_POSSIBLE_GRADES = ["초등학교 1-2학년군", "초등학교 3-4학년군", "초등학교 5-6학년군", "중학교 1-3학년군"]
+
+# 파일 변경 여부를 확인하는 최소 간격(초). 라디오 클릭마다 디렉터리를 훑지 않도록 한다.
+REFRESH_CHECK_INTERVAL = 2.0
+
+
+def curriculum_file_path(curriculum, subject, grade, data_dir=DATA_DIR):
+    return f"{data_dir}/{curriculum}/{subject}_{grade}.json"
+
+
+def standard_key(item):
+    """성취기준 항목의 세션 키 '[교육과정] 학년군 ID'. ① 진단 결과와 해설 요약이 이 키를 쓴다."""
+    return f"[{item['출처']}] {item['id']}"
+
+
+def scan_data_signature(data_dir=DATA_DIR):
+    """data/ 아래 JSON 파일의 (경로, 수정 시각, 크기) 목록. 인덱스 재생성 여부 판단에 쓴다."""
+    signature = []
+    for curriculum in SUBJECTS_BY_CURRICULUM:
+        curriculum_dir = os.path.join(data_dir, curriculum)
+        if not os.path.isdir(curriculum_dir):
+            continue
+        for entry in os.scandir(curriculum_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                signature.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+class CurriculumIndex:
+    """성취기준 읽기 전용 인덱스. 반환되는 목록과 항목은 수정하지 않는다."""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.signature = scan_data_signature(data_dir)
+        self.errors = {}        # 파일 경로 -> 오류 메시지
+        self._grades = {}       # (교육과정, 교과) -> 학년군 집합
+        self._items = {}        # (교육과정, 교과, 학년군) -> 항목 튜플
+        self._domains = {}      # (교육과정, 교과, 학년군) -> 영역 튜플 (파일 등장 순서)
+        self._domain_items = {} # (교육과정, 교과, 학년군, 영역) -> 항목 튜플
+        self._by_key = {}       # standard_key -> 항목
+        self._build()
+
+    def _build(self):
+        for path, _, _ in self.signature:
+            curriculum = os.path.basename(os.path.dirname(path))
+            stem = os.path.splitext(os.path.basename(path))[0]
+            if "_" not in stem:
+                continue
+            subject, grade = stem.split("_", 1)
+
+            # 파일 하나가 깨져도 공용 인덱스 전체가 실패하지 않도록 그 파일만 건너뜀
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, list) or not all(isinstance(raw, dict) for raw in data):
+                    raise ValueError("성취기준 항목 목록이 아닙니다.")
+            except (OSError, ValueError) as e:
+                # ValueError 에는 json.JSONDecodeError 와 UnicodeDecodeError 가 포함됨
+                self.errors[curriculum_file_path(curriculum, subject, grade, self.data_dir)] = str(e)
+                continue
+
+            source = f"[{curriculum}] {grade}"
+            items = []
+            by_domain = {}
+            for raw in data:
+                item = dict(raw)
+                item['출처'] = source
+                domain = item.get('영역', '기타')
+                items.append(item)
+                by_domain.setdefault(domain, []).append(item)
+                self._by_key.setdefault(standard_key(item), item)
+
+            file_key = (curriculum, subject, grade)
+            self._grades.setdefault((curriculum, subject), set()).add(grade)
+            self._items[file_key] = tuple(items)
+            self._domains[file_key] = tuple(by_domain)
+            for domain, domain_items in by_domain.items():
+                self._domain_items[file_key + (domain,)] = tuple(domain_items)
+
+    def iter_files(self):
+        """(교육과정, 교과, 학년군, 항목 튜플)을 교육과정·교과·학년군 순서로 순회한다."""
+        for curriculum, subjects in SUBJECTS_BY_CURRICULUM.items():
+            for subject in subjects:
+                for grade in ALL_POSSIBLE_GRADES:
+                    items = self._items.get((curriculum, subject, grade))
+                    if items:
+                        yield curriculum, subject, grade, items
+
+    def has_file(self, curriculum, subject, grade):
+        return (curriculum, subject, grade) in self._items
+
+    def file_error(self, curriculum, subject, grade):
+        return self.errors.get(curriculum_file_path(curriculum, subject, grade, self.data_dir))
+
+    def available_grades(self, curriculums, subject):
+        """주어진 교육과정들에서 해당 교과 파일이 있는 학년군을 학년 순서대로 반환한다."""
+        grade_set = set()
+        for curriculum in curriculums:
+            grade_set |= self._grades.get((curriculum, subject), set())
+        return [grade for grade in ALL_POSSIBLE_GRADES if grade in grade_set]
+
+    def items(self, curriculum, subject, grade):
+        return self._items.get((curriculum, subject, grade), ())
+
+    def domains(self, curriculum, subject, grade):
+        return self._domains.get((curriculum, subject, grade), ())
+
+    def domain_items(self, curriculum, subject, grade, domain):
+        return self._domain_items.get((curriculum, subject, grade, domain), ())
+
+    def item_by_key(self, key):
+        """standard_key 로 항목을 찾는다. 없으면(파일이 바뀌어 사라진 경우) None."""
+        return self._by_key.get(key)
+
+
+_index = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_curriculum_index(data_dir=DATA_DIR):
+    """프로세스 공용 인덱스를 반환한다. data/ 파일이 바뀐 경우에만 다시 만든다."""
+    global _index, _index_checked_at
+
+    now = time.monotonic()
+    if _index is not None and _index.data_dir == data_dir and now - _index_checked_at < REFRESH_CHECK_INTERVAL:
+        return _index
+
+    with _index_lock:
+        if _index is None or _index.data_dir != data_dir or scan_data_signature(data_dir) != _index.signature:
+            with startup_phase("curriculum_index"):
+                _index = CurriculumIndex(data_dir)
+        _index_checked_at = time.monotonic()
+        return _index
@@ -0,0 +1,112 @@
+"""
+성취기준 해설 요약(digest)
+
+해설 원문은 수백 자에 이르는 경우가 있어 프롬프트에 그대로 넣으면 길어진다.
+성취기준 내용과 겹치는 낱말이 많은 문장을 골라 짧은 요약을 미리 만들어
+data/commentary_digests.json 에 함께 저장해 두고, 프롬프트에는 이 요약을 우선 쓴다.
+요약은 API 없이 원문 문장을 골라내는 방식이라 언제 다시 만들어도 결과가 같다.
+
+    python -m utils.digests   # data/ 의 성취기준이 바뀌면 다시 실행
+"""
+import json
+import os
+import re
+import threading
+
+from utils.curriculum import DATA_DIR, CurriculumIndex, standard_key
+
+DIGEST_PATH = os.path.join(DATA_DIR, "commentary_digests.json")
+DIGEST_MAX_CHARS = 120
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?다])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def digest_key(source, std_id):
+    """항목의 출처('[교육과정] 학년군')와 ID로 만든 키. ① 진단 탭의 평가 키와 같은 형식이다."""
+    return f"[{source}] {std_id}"
+
+
+def _bigrams(text):
+    grams = set()
+    for word in _WORD_RE.findall(text):
+        grams.update(word[i:i + 2] for i in range(max(1, len(word) - 1)))
+    return grams
+
+
+def build_digest(content, commentary, max_chars=DIGEST_MAX_CHARS):
+    """해설에서 성취기준 내용과 가장 많이 겹치는 문장부터 max_chars 안에서 골라 원래 순서대로 잇는다."""
+    commentary = " ".join((commentary or "").split())
+    if len(commentary) <= max_chars:
+        return commentary
+
+    sentences = [s for s in _SENTENCE_RE.split(commentary) if s.strip()]
+    content_grams = _bigrams(content or "")
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-len(_bigrams(sentences[i]) & content_grams), i)
+    )
+
+    chosen, length = [], 0
+    for i in ranked:
+        if length + len(sentences[i]) + (1 if chosen else 0) > max_chars:
+            continue
+        chosen.append(i)
+        length += len(sentences[i]) + (1 if len(chosen) > 1 else 0)
+
+    if not chosen:
+        # 한 문장도 들어가지 않으면 가장 관련 높은 문장을 잘라서 씀
+        return sentences[ranked[0]][:max_chars - 1].rstrip() + "…"
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def build_digests(index):
+    """인덱스의 모든 성취기준에 대한 {키: 요약}을 만든다. 해설이 없는 항목은 넣지 않는다."""
+    digests = {}
+    for _, _, _, items in index.iter_files():
+        for item in items:
+            if item.get("해설"):
+                digests[standard_key(item)] = build_digest(item.get("내용", ""), item["해설"])
+    return digests
+
+
+_digests = None
+_digests_mtime = None
+_digests_lock = threading.Lock()
+
+
+def load_digests(path=DIGEST_PATH):
+    """저장된 요약을 읽는다. 파일이 바뀌었을 때만 다시 읽으며, 파일이 없으면 빈 사전."""
+    global _digests, _digests_mtime
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    if _digests is None or mtime != _digests_mtime:
+        with _digests_lock:
+            if _digests is None or mtime != _digests_mtime:
+                if mtime is None:
+                    _digests = {}
+                else:
+                    with open(path, "r", encoding="utf-8") as f:
+                        _digests = json.load(f)
+                _digests_mtime = mtime
+    return _digests
+
+
+def get_digest(item):
+    """
+    평가 항목(① 진단 탭의 evaluation 값)의 해설 요약. 저장된 요약이 없으면
+    (성취기준 파일이 요약 생성 뒤에 바뀐 경우) 그 자리에서 만든다.
+    """
+    commentary = item.get("해설", "")
+    if not commentary:
+        return ""
+    digest = load_digests().get(digest_key(item["grade"], item["id"]))
+    return digest if digest is not None else build_digest(item.get("content", ""), commentary)
+
+
+if __name__ == "__main__":
+    index = CurriculumIndex()
+    digests = build_digests(index)
+    with open(DIGEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(digests, f, ensure_ascii=False, indent=0, sort_keys=True)
+    original = sum(len(item.get("해설", "")) for _, _, _, items in index.iter_files() for item in items)
+    print(f"{DIGEST_PATH}: 해설 {len(digests)}개 요약 ({original:,}자 → {sum(map(len, digests.values())):,}자)")
@@ -0,0 +1,180 @@
+"""
+IEP Word 문서 생성
+
+⑦ 최종 IEP 생성 탭과 일괄 생성 명령이 같은 표 구성과 서식으로 문서를 만들도록 모아 둔다.
+개별화교육평가 결과 보고서와 여러 보고서를 묶은 ZIP 도 여기서 만든다.
+서식은 utils.docx_templates 의 템플릿에 있고, 여기서는 채울 값만 만든다.
+python-docx 는 페이지 첫 화면에 필요 없으므로 문서를 처음 만들 때 불러온다.
+"""
+import io
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.profiling import lazy_import
+
+OTHER_METHOD_LABEL = "기타 (직접 작성)"
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DEFAULT_RENDER_WORKERS = 4
+
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def get_template(name):
+    return lazy_import("utils.docx_templates").get_template(name)
+
+
+def safe_filename_part(text):
+    """파일 이름에 쓸 수 없는 문자와 공백을 '_'로 바꾼다."""
+    return _UNSAFE_FILENAME_RE.sub('_', text).strip('_')
+
+
+def build_plan_rows(subject, monthly_plan, evaluation_plan):
+    """월별 계획과 평가계획을 문서·미리보기용 행 목록으로 만든다."""
+    plan_rows = []
+    for month, data in monthly_plan.items():
+        methods_list = data.get('methods', [])
+        other_method = data.get('other_method', '')
+        if OTHER_METHOD_LABEL in methods_list and other_method:
+            methods_list = [m if m != OTHER_METHOD_LABEL else other_method for m in methods_list]
+
+        eval_data = evaluation_plan.get(month, {})
+        eval_methods = ", ".join(eval_data.get('methods', []))
+        eval_criteria = eval_data.get('criteria', '').strip()
+        eval_text = f"▪︎ 평가 방법: {eval_methods}\n▪︎ 평가 초점:\n{eval_criteria}"
+
+        plan_rows.append({
+            "교과(영역)": f"{subject} ({month})",
+            "장기 교육 목표 및 수립 근거": data.get('goal', ''),
+            "교육 내용": data.get('content', ''),
+            "교육 방법": ", ".join(methods_list),
+            "평가 계획": eval_text
+        })
+    return plan_rows
+
+
+def build_iep_docx(student_name, class_info, subject, summary, plan_rows):
+    """IEP Word 문서를 만들어 .docx 바이트로 반환한다."""
+    return get_template("iep").render({
+        "student_name": student_name,
+        "class_info": class_info,
+        "subject": subject,
+        "summary": summary,
+        "rows": [
+            {"area": row['교과(영역)'], "goal": row['장기 교육 목표 및 수립 근거'], "content": row['교육 내용'],
+             "methods": row['교육 방법'], "evaluation": row['평가 계획']}
+            for row in plan_rows
+        ],
+    })
+
+
+# --- 개별화교육평가 결과 보고서 ---
+def build_evaluation_report(label, semester, months, evaluations, semester_text):
+    """
+    현재 화면의 평가 결과를 보고서 한 건으로 고정한다. 이후 화면을 초기화해도 내용이 바뀌지 않도록
+    필요한 값만 복사해 둔다.
+    """
+    return {
+        'label': label,
+        'semester': semester,
+        'created_at': datetime.now().strftime('%Y년 %m월 %d일'),
+        'months': [
+            {'month': month, 'goal': evaluations[month]['goal'],
+             'instructional': evaluations[month]['instructional'], 'evaluation': evaluations[month]['evaluation']}
+            for month in months if month in evaluations
+        ],
+        'semester_evaluation': semester_text,
+    }
+
+
+def build_evaluation_docx(report):
+    """보고서 한 건을 Word 문서로 만들어 .docx 바이트로 반환한다."""
+    return get_template("evaluation").render({
+        "student": [{"label": report['label']}] if report.get('label') else [],
+        "created_at": report['created_at'],
+        "months": report['months'],
+        "semester_summary": (
+            [{"semester": report['semester'], "text": report['semester_evaluation']}]
+            if report.get('semester_evaluation') else []
+        ),
+    })
+
+
+def evaluation_report_filename(report):
+    label = safe_filename_part(report.get('label') or '') or '학생'
+    return f"IEP_Evaluation_{label}_{report['semester']}.docx"
+
+
+def write_docx_zip(reports, fileobj, render=build_evaluation_docx, filename=evaluation_report_filename,
+                   max_workers=DEFAULT_RENDER_WORKERS):
+    """
+    보고서들을 작업 스레드에서 문서로 만들면서 끝나는 대로 fileobj 의 ZIP 에 차례로 써 넣는다.
+    만드는 동안 메모리에 올라가는 문서는 max_workers 의 두 배를 넘지 않고, fileobj 가 임시 파일이면
+    ZIP 자체도 디스크에 쌓인다. 다만 완성된 ZIP 을 st.download_button 에 넘기면 Streamlit 이 파일 전체를
+    읽어 세션의 미디어 파일로 메모리에 보관하므로, 내려받을 때는 ZIP 크기만큼 메모리가 든다.
+    """
+    used_names = set()
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+            ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        in_flight = deque()
+
+        def flush_oldest():
+            report, future = in_flight.popleft()
+            name = filename(report)
+            stem, ext = name.rsplit('.', 1)
+            suffix = 2
+            while name in used_names:
+                name = f"{stem}_{suffix}.{ext}"
+                suffix += 1
+            used_names.add(name)
+            archive.writestr(name, future.result())
+
+        for report in reports:
+            in_flight.append((report, executor.submit(render, report)))
+            if len(in_flight) >= max(1, max_workers) * 2:
+                flush_oldest()
+        while in_flight:
+            flush_oldest()
+    return fileobj
+
+
+def build_docx_zip(reports, **kwargs):
+    """
+    write_docx_zip 으로 만든 ZIP 의 bytes. st.download_button 의 data 콜러블은 bytes·BytesIO 같은
+    몇 가지 형식만 받으므로(임시 파일 객체는 거부됨) 이 값을 그대로 돌려준다.
+    """
+    return write_docx_zip(reports, io.BytesIO(), **kwargs).getvalue()
+
+
+# --- 협의회 회의록 ---
+def bullet_lines(content):
+    """글머리 기호 '- '를 떼고 빈 줄을 뺀 줄 목록."""
+    lines = []
+    for line in content.split("\n"):
+        clean = line.strip()
+        if clean.startswith("- "):
+            clean = clean[2:].strip()
+        if clean:
+            lines.append(clean)
+    return lines
+
+
+def build_meeting_docx(datetime_text, location, meeting_types, attendees, sections, resolution):
+    """
+    협의회 회의록을 .docx 바이트로 반환한다.
+    sections 는 [(소제목, 내용), ...] 이며 내용이 빈 항목은 넣지 않는다.
+    """
+    return get_template("meeting").render({
+        "datetime": datetime_text,
+        "location": location,
+        "meeting_types": ", ".join(meeting_types),
+        "attendees": attendees,
+        "sections": [
+            {"title": title, "lines": bullet_lines(content)}
+            for title, content in sections if content.strip()
+        ],
+        "resolution_lines": bullet_lines(resolution),
+    })
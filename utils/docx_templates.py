@@ -0,0 +1,409 @@
+"""
+.docx 템플릿 렌더러
+
+서식(글꼴, 제목, 표 스타일, 굵은 머리글)을 미리 입혀 둔 템플릿을 프로세스당 한 번 만들어 두고,
+문서마다 자리표시자만 채워 저장한다. 세 가지 문서(협의회 회의록, IEP, 평가 보고서)가
+같은 기본 서식을 공유한다.
+
+템플릿 문법 (자리표시자는 한 run 안에 있어야 한다)
+- {{key}}            : 문자열로 바꾼다. 줄바꿈은 줄 나눔(w:br)으로 넣는다.
+- 표의 한 행에 {{rows.field}} : context['rows'] 목록의 항목마다 그 행을 복제해 채운다.
+- {{#name}} … {{/name}} : 두 표시 문단 사이의 본문을 context['name'] 목록의 항목마다 반복한다.
+                          안에서는 {{name.field}} 로 항목 값을 쓴다.
+- {{*key}}           : 이 문단(스타일 포함)을 context[key] 문자열 목록의 줄마다 복제한다.
+
+같은 템플릿에 같은 값으로 만든 문서는 내용 해시로 메모리에 보관했다가 그대로 돌려준다.
+
+templates/<이름>.docx 가 있으면 내장 템플릿 대신 그 파일을 쓴다.
+`python -m utils.docx_templates --export templates` 로 내장 템플릿을 내보내 수정할 수 있다.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from copy import deepcopy
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from lxml import etree
+
+from utils.profiling import startup_phase
+
+TEMPLATE_DIR = os.environ.get("IEP_DOCX_TEMPLATE_DIR", "templates")
+FONT_NAME = "맑은 고딕"
+FONT_SIZE = Pt(11)
+
+# 만든 문서를 보관하는 메모리 상한 (기본 64MB)
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("IEP_DOCX_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+_SECTION_RE = re.compile(r"^\{\{([#/])(\w+)\}\}$")
+_LIST_RE = re.compile(r"^\{\{\*([\w.]+)\}\}$")
+
+_W_P, _W_T, _W_TR = qn("w:p"), qn("w:t"), qn("w:tr")
+
+
+# --- 채우기 ---
+def _text_of(element):
+    return "".join(t.text or "" for t in element.iter(_W_T))
+
+
+def _set_text(t, text):
+    """w:t 에 text 를 넣는다. 줄바꿈마다 같은 run 안에 w:br 과 새 w:t 를 이어 붙인다."""
+    lines = text.split("\n")
+    t.text = lines[0]
+    t.set(qn("xml:space"), "preserve")
+    after = t
+    for line in lines[1:]:
+        br = OxmlElement("w:br")
+        after.addnext(br)
+        new_t = OxmlElement("w:t")
+        new_t.text = line
+        new_t.set(qn("xml:space"), "preserve")
+        br.addnext(new_t)
+        after = new_t
+
+
+def _fill_scalars(element, context, filled=frozenset()):
+    """자리표시자를 값으로 바꾼다. filled 에 있는 w:t(이미 값이 들어간 글자)는 건드리지 않는다."""
+    for t in list(element.iter(_W_T)):
+        if t.text and "{{" in t.text and t not in filled:
+            _set_text(t, _PLACEHOLDER_RE.sub(lambda m: str(context.get(m.group(1), "")), t.text))
+
+
+def _scoped(name, item, context):
+    scoped = dict(context)
+    scoped.update({f"{name}.{field}": value for field, value in item.items()})
+    return scoped
+
+
+def _expand_rows(element, context, filled):
+    """목록 값을 가리키는 자리표시자가 있는 표 행을 항목 수만큼 복제해 채우고, 채운 w:t 를 filled 에 더한다."""
+    for tr in [tr for tr in element.iter(_W_TR)]:
+        names = {
+            key.split(".", 1)[0] for key in _PLACEHOLDER_RE.findall(_text_of(tr))
+            if "." in key and isinstance(context.get(key.split(".", 1)[0]), list)
+        }
+        if not names:
+            continue
+        name = names.pop()
+        for item in context[name]:
+            new_tr = deepcopy(tr)
+            _fill_scalars(new_tr, _scoped(name, item, context))
+            filled.update(new_tr.iter(_W_T))
+            tr.addprevious(new_tr)
+        tr.getparent().remove(tr)
+
+
+def _expand_lists(element, context, filled):
+    """{{*key}} 문단을 목록의 줄마다 복제한다. 첫 w:t 에 줄을 넣고 나머지 글자는 지운다."""
+    paragraphs = [element] if element.tag == _W_P else list(element.iter(_W_P))
+    for p in paragraphs:
+        if any(t in filled for t in p.iter(_W_T)):
+            continue
+        match = _LIST_RE.match(_text_of(p).strip())
+        if not match:
+            continue
+        for line in context.get(match.group(1)) or []:
+            new_p = deepcopy(p)
+            texts = list(new_p.iter(_W_T))
+            _set_text(texts[0], str(line))
+            for extra in texts[1:]:
+                extra.getparent().remove(extra)
+            filled.update(new_p.iter(_W_T))
+            p.addprevious(new_p)
+        p.getparent().remove(p)
+
+
+def _fill(elements, context, filled):
+    for element in elements:
+        _expand_rows(element, context, filled)
+    for element in elements:
+        # 목록 확장으로 element 자신이 빠질 수 있으므로 채우기는 남은 문단에만 함
+        parent = element.getparent()
+        _expand_lists(element, context, filled)
+        if element.getparent() is parent:
+            _fill_scalars(element, context, filled)
+
+
+def _expand_sections(body, context, filled):
+    """{{#name}} … {{/name}} 구간을 항목마다 복제해 채우고, 만든 요소 목록을 반환한다."""
+    generated = []
+    children = list(body)
+    i = 0
+    while i < len(children):
+        start = children[i]
+        match = _SECTION_RE.match(_text_of(start).strip()) if start.tag == _W_P else None
+        if not match or match.group(1) != "#":
+            i += 1
+            continue
+        name = match.group(2)
+        end_index = next(
+            j for j in range(i + 1, len(children))
+            if children[j].tag == _W_P and _text_of(children[j]).strip() == f"{{{{/{name}}}}}"
+        )
+        block = children[i + 1:end_index]
+        for item in context.get(name) or []:
+            copies = [deepcopy(element) for element in block]
+            for copy_element in copies:
+                start.addprevious(copy_element)
+            _fill(copies, _scoped(name, item, context), filled)
+            generated.extend(copies)
+        for element in [start, *block, children[end_index]]:
+            body.remove(element)
+        i = end_index + 1
+    return generated
+
+
+class RenderCache:
+    """내용 해시 -> 문서 바이트. 전체 크기가 max_bytes 를 넘으면 가장 오래 쓰이지 않은 문서부터 버린다."""
+
+    def __init__(self, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_render_cache = RenderCache()
+
+
+def _main_part_name(parts):
+    """패키지 관계(_rels/.rels)에서 본문 파트(보통 word/document.xml) 이름을 찾는다."""
+    rels = parse_xml(parts["_rels/.rels"])
+    for rel in rels:
+        if rel.get("Type", "").endswith("/officeDocument"):
+            return rel.get("Target").lstrip("/")
+    raise ValueError("docx 본문 파트를 찾을 수 없습니다.")
+
+
+class DocxTemplate:
+    """
+    템플릿을 처음 한 번만 풀어 둔다: 본문 XML 은 파싱한 트리로, 나머지 파트(스타일, 번호 매기기 등)는 바이트로.
+    render() 할 때마다 본문 트리만 복사해 채우고, 나머지 파트와 함께 다시 묶는다.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.digest = hashlib.sha256(data).hexdigest()
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self._parts = {info.filename: archive.read(info) for info in archive.infolist()}
+        self._main_part = _main_part_name(self._parts)
+        self._document_xml = parse_xml(self._parts[self._main_part])
+        self._copy_lock = threading.Lock()
+
+    def cache_key(self, context):
+        raw = json.dumps(context, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(f"{self.digest}\n{raw}".encode("utf-8")).hexdigest()
+
+    def render(self, context):
+        """context 로 채운 문서를 .docx 바이트로 반환한다. 템플릿과 값이 같으면 만들어 둔 문서를 그대로 쓴다."""
+        key = self.cache_key(context)
+        cached = _render_cache.get(key)
+        if cached is not None:
+            return cached
+        data = self._render(context)
+        _render_cache.put(key, data)
+        return data
+
+    def _render(self, context):
+        # 공유 트리는 읽기만 하지만, 여러 스레드가 동시에 복사하지 않도록 잠금 안에서 복사함
+        with self._copy_lock:
+            root = deepcopy(self._document_xml)
+        body = root.find(qn("w:body"))
+        # 행·목록으로 들어간 값(filled)은 다시 훑지 않음 — 교사가 입력한 글의 {{...}} 가 바뀌지 않도록.
+        # lxml 요소는 참조가 살아 있는 동안 같은 객체이므로 집합으로 구분할 수 있음
+        filled = set()
+        generated = set(_expand_sections(body, context, filled))
+        _fill([element for element in body if element not in generated], context, filled)
+
+        file_stream = io.BytesIO()
+        with zipfile.ZipFile(file_stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, raw in self._parts.items():
+                if name == self._main_part:
+                    raw = etree.tostring(root, encoding="UTF-8", standalone=True)
+                archive.writestr(name, raw)
+        return file_stream.getvalue()
+
+
+# --- 내장 템플릿 ---
+def _base_document():
+    document = Document()
+    style = document.styles["Normal"]
+    style.font.name = FONT_NAME
+    style.font.size = FONT_SIZE
+    return document
+
+
+def _bold_paragraph(document, text):
+    p = document.add_paragraph(text)
+    p.runs[0].font.bold = True
+    return p
+
+
+def _bold_cell(cell, text):
+    cell.text = text
+    cell.paragraphs[0].runs[0].font.bold = True
+
+
+def _build_iep_template():
+    document = _base_document()
+    title = document.add_heading("개별화교육계획(IEP)", level=0); title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    document.add_paragraph()
+
+    document.add_heading("1. 인적사항", level=1)
+    table_info = document.add_table(rows=2, cols=4); table_info.style = "Table Grid"
+    _bold_cell(table_info.cell(0, 0), "학생명"); table_info.cell(0, 1).text = "{{student_name}}"
+    _bold_cell(table_info.cell(0, 2), "학년/반"); table_info.cell(0, 3).text = "{{class_info}}"
+    _bold_cell(table_info.cell(1, 0), "교과"); table_info.cell(1, 1).text = "{{subject}}"
+    table_info.cell(1, 1).merge(table_info.cell(1, 3))
+    document.add_paragraph()
+
+    document.add_heading("2. 현행학습수준", level=1)
+    document.add_paragraph("{{summary}}")
+    document.add_paragraph()
+
+    document.add_heading("3. 학기별 교육 계획", level=1)
+    headers = ["교과(영역)", "교육 목표", "교육 내용", "교육 방법", "평가 계획"]
+    fields = ["area", "goal", "content", "methods", "evaluation"]
+    plan_table = document.add_table(rows=2, cols=len(headers)); plan_table.style = "Table Grid"
+    for i, (header, field) in enumerate(zip(headers, fields)):
+        _bold_cell(plan_table.rows[0].cells[i], header)
+        plan_table.rows[1].cells[i].text = f"{{{{rows.{field}}}}}"
+    return document
+
+
+def _build_evaluation_template():
+    document = _base_document()
+    title = document.add_heading("개별화교육평가 결과 보고서", level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    document.add_paragraph("{{#student}}")
+    document.add_paragraph("학생: {{student.label}}")
+    document.add_paragraph("{{/student}}")
+    document.add_paragraph("작성일: {{created_at}}\n")
+
+    document.add_paragraph("{{#months}}")
+    document.add_heading("{{months.month}} 평가", level=2)
+    document.add_paragraph("▪︎ 교육 목표: {{months.goal}}")
+    document.add_paragraph("▪︎ 주요 교육 내용:\n{{months.instructional}}")
+    document.add_paragraph("▪︎ 종합 평가 결과:\n{{months.evaluation}}\n")
+    document.add_paragraph("{{/months}}")
+
+    document.add_paragraph("{{#semester_summary}}")
+    document.add_heading("{{semester_summary.semester}} 종합 요약 평가", level=1)
+    document.add_paragraph("{{semester_summary.text}}")
+    document.add_paragraph("{{/semester_summary}}")
+    return document
+
+
+def _build_meeting_template():
+    document = _base_document()
+    title = document.add_heading("개별화교육지원팀 협의회 회의록", level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    document.add_paragraph()
+
+    # 1. 기본 정보
+    _bold_paragraph(document, "1. 협의회 기본 정보")
+    table = document.add_table(rows=4, cols=2)
+    table.style = "Table Grid"
+    for row, (label, key) in enumerate([("일시", "datetime"), ("장소", "location"),
+                                        ("방식", "meeting_types"), ("참석자", "attendees")]):
+        _bold_cell(table.cell(row, 0), label)
+        table.cell(row, 1).text = f"{{{{{key}}}}}"
+    document.add_paragraph()
+
+    # 2. 회의 내용
+    _bold_paragraph(document, "2. 회의 내용")
+    document.add_paragraph("{{#sections}}")
+    _bold_paragraph(document, "{{sections.title}}")
+    document.add_paragraph("{{*sections.lines}}", style="List Bullet")
+    document.add_paragraph("{{/sections}}")
+    document.add_paragraph()
+
+    # 3. 의결 사항
+    _bold_paragraph(document, "3. 의결 사항")
+    document.add_paragraph("{{*resolution_lines}}", style="List Bullet")
+    return document
+
+
+BUILTIN_TEMPLATES = {
+    "iep": _build_iep_template,
+    "evaluation": _build_evaluation_template,
+    "meeting": _build_meeting_template,
+}
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _template_bytes(name, template_dir):
+    path = os.path.join(template_dir, f"{name}.docx")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read(), os.path.getmtime(path)
+    file_stream = io.BytesIO()
+    BUILTIN_TEMPLATES[name]().save(file_stream)
+    return file_stream.getvalue(), None
+
+
+def get_template(name, template_dir=TEMPLATE_DIR):
+    """
+    이름에 해당하는 템플릿을 반환한다. 프로세스당 한 번만 만들거나 읽으며,
+    templates/ 의 파일은 수정 시각이 바뀌었을 때만 다시 읽는다.
+    """
+    path = os.path.join(template_dir, f"{name}.docx")
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    cached = _templates.get((name, template_dir))
+    if cached is None or cached[0] != mtime:
+        with _templates_lock:
+            cached = _templates.get((name, template_dir))
+            if cached is None or cached[0] != mtime:
+                with startup_phase(f"docx_template:{name}"):
+                    data, loaded_mtime = _template_bytes(name, template_dir)
+                    cached = (loaded_mtime, DocxTemplate(data))
+                _templates[(name, template_dir)] = cached
+    return cached[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="내장 .docx 템플릿 내보내기")
+    parser.add_argument("--export", default=TEMPLATE_DIR, help="템플릿을 저장할 폴더")
+    args = parser.parse_args()
+
+    os.makedirs(args.export, exist_ok=True)
+    for template_name, builder in BUILTIN_TEMPLATES.items():
+        out_path = os.path.join(args.export, f"{template_name}.docx")
+        builder().save(out_path)
+        print(out_path)
@@ -0,0 +1,253 @@
+"""
+작성 중인 내용 임시 저장(draft)
+
+생성 결과와 편집 내용을 사용자(승인된 소속/이름)·페이지·학생 이름별로 SQLite 파일에 저장해 두고,
+연결이 끊기거나 서버가 다시 시작된 뒤에 모델을 다시 부르지 않고 그대로 불러온다.
+
+- 항목(세션 키)마다 한 행씩 저장하며, 바뀐 항목만 다시 쓴다.
+- 내용은 JSON 을 zlib 로 압축해 저장한다.
+- 쓰기는 백그라운드 스레드가 모아서 한다. 마지막 변경 뒤 DEBOUNCE_SECONDS 동안 더 바뀌지 않거나
+  첫 변경 뒤 MAX_DELAY_SECONDS 가 지나면 그때까지의 최신 값만 한 번에 쓴다.
+- TTL_DAYS 가 지난 임시 저장은 파일을 열 때 지운다.
+- 쓰기에 실패하면 그 임시 저장의 오류를 last_error() 로 알려 주고(사이드바에 표시), 다음 변경 때 다시 쓴다.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DRAFTS_PATH = os.environ.get("IEP_DRAFTS_PATH", os.path.join(".cache", "drafts.sqlite"))
+DEBOUNCE_SECONDS = float(os.environ.get("IEP_DRAFTS_DEBOUNCE", "2"))
+MAX_DELAY_SECONDS = float(os.environ.get("IEP_DRAFTS_MAX_DELAY", "10"))
+TTL_DAYS = int(os.environ.get("IEP_DRAFTS_TTL_DAYS", "30"))
+# 바뀜 비교용 해시를 기억해 둘 임시 저장 수. 넘으면 가장 오래 쓰지 않은 것부터 잊고, 다음 저장 때 전부 다시 쓴다.
+MAX_TRACKED_DRAFTS = int(os.environ.get("IEP_DRAFTS_MAX_TRACKED", "512"))
+
+
+def encode_value(value):
+    """세션 값을 JSON 문자열로 바꾼다. 바뀜 여부 비교와 저장에 같은 문자열을 쓴다."""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+@dataclass(frozen=True)
+class DraftSpec:
+    """
+    페이지마다 임시 저장할 세션 키.
+    keys·prefixes 에 맞는 키를 저장하고, 불러올 때는 derived_prefixes 에 맞는 편집 상자 상태를 지워
+    저장된 원본 값으로 다시 그려지게 한다.
+    """
+    page: str
+    keys: tuple = ()
+    prefixes: tuple = ()
+    derived_prefixes: tuple = ()
+
+    def collect(self, state):
+        return {
+            key: state[key] for key in list(state.keys())
+            if key in self.keys or key.startswith(self.prefixes)
+        }
+
+    def is_derived(self, key):
+        return key.startswith(self.derived_prefixes)
+
+
+class DraftStore:
+    def __init__(self, path=DRAFTS_PATH, debounce_seconds=DEBOUNCE_SECONDS,
+                 max_delay_seconds=MAX_DELAY_SECONDS, ttl_days=TTL_DAYS, max_tracked=MAX_TRACKED_DRAFTS):
+        self.path = path
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_tracked = max(1, max_tracked)
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # 오래된 값이 새 값을 덮어쓰지 않도록 쓰기는 한 번에 하나씩
+        self._pending = {}  # (사용자, 페이지, 학생) -> {"fields": {키: JSON}, "first_at", "last_at"}
+        self._written = OrderedDict()  # (사용자, 페이지, 학생) -> {키: JSON 해시}  (마지막으로 넘겨받은 값, LRU)
+        self._errors = {}  # (사용자, 페이지, 학생) -> 마지막 쓰기 실패 메시지
+        self._writer = None
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS drafts (
+                owner TEXT, page TEXT, label TEXT, field TEXT,
+                payload BLOB, updated_at REAL,
+                PRIMARY KEY (owner, page, label, field)
+            );
+        """)
+        conn.execute("DELETE FROM drafts WHERE updated_at < ?", (time.time() - ttl_days * 24 * 60 * 60,))
+
+    def _conn(self):
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩 연다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _tracked(self, draft_key, hashes=None):
+        """draft_key 의 해시 사전(hashes 를 주면 그것으로 바꿈). _cond 를 잡은 채로 부른다."""
+        if hashes is not None:
+            self._written[draft_key] = hashes
+        written = self._written.setdefault(draft_key, {})
+        self._written.move_to_end(draft_key)
+        while len(self._written) > self.max_tracked:
+            self._written.popitem(last=False)
+        return written
+
+    # --- 저장 ---
+    def schedule_save(self, owner, page, label, values):
+        """
+        {세션 키: 값} 중 지난번과 달라진 항목만 쓰기 대기열에 올린다. 실제 쓰기는 백그라운드에서 한다.
+        값은 호출한 시점에 JSON 으로 고정되므로 이후 세션 값이 바뀌어도 영향이 없다.
+        반환값: 대기열에 올린 항목 수
+        """
+        draft_key = (owner, page, label)
+        changed = {}
+        with self._cond:
+            written = self._tracked(draft_key)
+            for field, value in values.items():
+                text = encode_value(value)
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if written.get(field) != digest:
+                    written[field] = digest
+                    changed[field] = text
+            if changed:
+                now = time.monotonic()
+                entry = self._pending.setdefault(draft_key, {"fields": {}, "first_at": now})
+                entry["fields"].update(changed)
+                entry["last_at"] = now
+                self._ensure_writer()
+                self._cond.notify()
+        return len(changed)
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="draft-writer", daemon=True)
+            self._writer.start()
+
+    def _due_keys(self, now):
+        return [
+            key for key, entry in self._pending.items()
+            if now - entry["last_at"] >= self.debounce_seconds or now - entry["first_at"] >= self.max_delay_seconds
+        ]
+
+    def _take(self, keys):
+        with self._cond:
+            return {key: self._pending.pop(key)["fields"] for key in keys if key in self._pending}
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                due = self._due_keys(time.monotonic())
+                while not due:
+                    self._cond.wait(timeout=min(self.debounce_seconds, 1.0) if self._pending else None)
+                    due = self._due_keys(time.monotonic())
+            with self._write_lock:
+                self._write(self._take(due))
+
+    def _write(self, batch):
+        if not batch:
+            return
+        now = time.time()
+        rows = [
+            (owner, page, label, field, zlib.compress(text.encode("utf-8")), now)
+            for (owner, page, label), fields in batch.items()
+            for field, text in fields.items()
+        ]
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO drafts (owner, page, label, field, payload, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # 다음 변경 때 다시 쓰도록 해시를 지우고, 화면에서 알 수 있게 오류를 남김
+            with self._cond:
+                for key in batch:
+                    self._written.pop(key, None)
+                    self._errors[key] = str(e)
+            return
+        with self._cond:
+            for key in batch:
+                self._errors.pop(key, None)
+
+    def last_error(self, owner, page, label):
+        """이 임시 저장의 마지막 쓰기 실패 메시지. 그 뒤 쓰기에 성공했으면 None."""
+        with self._cond:
+            return self._errors.get((owner, page, label))
+
+    def flush(self):
+        """대기 중인 변경을 지금 바로 쓴다."""
+        with self._write_lock:
+            with self._cond:
+                keys = list(self._pending)
+            self._write(self._take(keys))
+
+    # --- 조회 ---
+    def load(self, owner, page, label):
+        """저장된 {세션 키: 값}. 없으면 빈 사전."""
+        self.flush()
+        values = {}
+        for field, payload in self._conn().execute(
+            "SELECT field, payload FROM drafts WHERE owner = ? AND page = ? AND label = ?", (owner, page, label)
+        ):
+            values[field] = json.loads(zlib.decompress(payload).decode("utf-8"))
+        with self._cond:
+            self._tracked((owner, page, label), {
+                field: hashlib.sha1(encode_value(value).encode("utf-8")).hexdigest() for field, value in values.items()
+            })
+        return values
+
+    def list_drafts(self, owner, page):
+        """[(학생 이름, 마지막 저장 시각, 압축된 크기)] 최근 저장 순. 아직 쓰지 않은 변경은 들어가지 않는다."""
+        return self._conn().execute(
+            "SELECT label, MAX(updated_at), SUM(LENGTH(payload)) FROM drafts "
+            "WHERE owner = ? AND page = ? GROUP BY label ORDER BY MAX(updated_at) DESC",
+            (owner, page)
+        ).fetchall()
+
+    def exists(self, owner, page, label):
+        with self._cond:
+            if (owner, page, label) in self._pending:
+                return True
+        return self._conn().execute(
+            "SELECT 1 FROM drafts WHERE owner = ? AND page = ? AND label = ? LIMIT 1", (owner, page, label)
+        ).fetchone() is not None
+
+    def delete(self, owner, page, label):
+        key = (owner, page, label)
+        with self._cond:
+            self._pending.pop(key, None)
+            self._written.pop(key, None)
+            self._errors.pop(key, None)
+        self._conn().execute("DELETE FROM drafts WHERE owner = ? AND page = ? AND label = ?", key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_draft_store():
+    """프로세스 공용 임시 저장소를 반환한다. 프로세스가 끝날 때 남은 변경을 쓴다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DraftStore()
+                atexit.register(_store.flush)
+    return _store
@@ -0,0 +1,397 @@
+"""
+Gemini 호출 게이트웨이
+
+모든 페이지는 model.generate_content()를 직접 부르지 않고 이 모듈의 GeminiClient 를 거친다.
+- API 키마다 클라이언트를 하나만 만들어 재실행·세션 간에 재사용한다.
+- 키마다 토큰 버킷으로 분당 요청 수를 제한한다.
+- 429/5xx 같은 일시적 오류는 지터를 섞은 지수 백오프로 다시 시도한다.
+- 호출마다 전체 마감 시간(재시도 포함)을 지키고, 넘기면 LLMError 를 낸다.
+- 캐시에 없는 요청은 utils.scheduler 의 공정 분배 스케줄러에서 자리를 받은 뒤에 보낸다.
+  세션은 for_user() 로 사용자별 클라이언트를 받아 쓰며, 대기 중에는 on_wait(앞에 남은 요청 수)를 부른다.
+- 호출마다 지연 시간·크기·토큰 사용량·재시도·오류를 utils.telemetry 에 기록한다.
+- google.generativeai 와 그 오류 모듈(google.api_core, grpc)은 불러오는 데 오래 걸리므로 첫 요청을 보낼 때
+  불러온다(utils.profiling).
+- IEP_GEMINI_ENDPOINT 를 주면 그 주소로 REST 요청을 보낸다(부하 시험용 대역 서버, benchmarks/mock_gemini.py).
+kind 는 프롬프트 종류(예: "goal", "eval_focus")이며 캐시 정책과 통계 구분에 쓴다.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from utils.llm_cache import get_response_cache
+from utils.profiling import lazy_import, startup_phase
+from utils.scheduler import SchedulerTimeout, get_scheduler
+from utils.telemetry import record_event
+
+MODEL_NAME = "gemini-2.0-flash"
+
+# 동시에 보내는 Gemini 요청 수 기본값
+DEFAULT_MAX_WORKERS = 4
+
+# for_user() 없이 부른 요청이 들어가는 대기열
+DEFAULT_USER = "default"
+
+RATE_LIMIT_PER_MINUTE = float(os.environ.get("IEP_LLM_RATE_PER_MINUTE", "60"))
+RATE_LIMIT_BURST = int(os.environ.get("IEP_LLM_RATE_BURST", "10"))
+MAX_RETRIES = int(os.environ.get("IEP_LLM_MAX_RETRIES", "4"))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 20.0
+ATTEMPT_TIMEOUT_SECONDS = float(os.environ.get("IEP_LLM_ATTEMPT_TIMEOUT", "60"))
+CALL_DEADLINE_SECONDS = float(os.environ.get("IEP_LLM_CALL_DEADLINE", "120"))
+# 예: http://127.0.0.1:8765 . 비워 두면 Google 기본 주소(gRPC)를 쓴다
+GEMINI_ENDPOINT = os.environ.get("IEP_GEMINI_ENDPOINT", "").strip()
+
+
+def google_exceptions():
+    """google.api_core.exceptions. grpc 까지 함께 불러오므로 오류를 가려야 할 때 불러온다."""
+    return lazy_import("google.api_core.exceptions")
+
+
+def transient_errors():
+    """다시 시도할 일시적 오류 종류."""
+    errors = google_exceptions()
+    return (
+        errors.TooManyRequests,      # 429 (ResourceExhausted 포함)
+        errors.InternalServerError,  # 500
+        errors.BadGateway,           # 502
+        errors.ServiceUnavailable,   # 503
+        errors.GatewayTimeout,       # 504 (DeadlineExceeded 포함)
+        ConnectionError,
+        TimeoutError,
+    )
+
+
+class LLMError(Exception):
+    """재시도 후에도 실패한 Gemini 호출. 메시지는 화면에 그대로 보여줄 수 있는 문장이다."""
+
+
+class TokenBucket:
+    """분당 rate_per_minute 개의 토큰을 채우고, 최대 burst 개까지 모아 두는 요청 제한기."""
+
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline):
+        """토큰 하나를 얻을 때까지 기다린다. 마감 시각(monotonic)까지 얻지 못하면 False."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def backoff_delay(attempt):
+    """attempt 번째 재시도 전 대기 시간. 지수적으로 늘리되 절반~전체 범위에서 무작위로 고른다."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class CallRecord:
+    """호출 한 건의 기록. finish() 에서 utils.telemetry 로 이벤트를 한 번 남긴다."""
+
+    def __init__(self, model_name, prompt, kind, user, page, stream):
+        self.event = {
+            "page": page, "kind": kind, "user": user, "model": model_name, "stream": stream,
+            "prompt_chars": len(prompt),
+        }
+        self.retries = 0
+        self.started = time.monotonic()
+        self.granted = None
+
+    def mark_granted(self):
+        self.granted = time.monotonic()
+
+    def finish(self, text=None, usage=None, error=None, cached=False):
+        # 캐시 응답이나 차례를 받기 전에 끝난 호출은 대기 시간 없이 전체를 지연 시간으로 셈
+        now = time.monotonic()
+        granted = self.granted if self.granted is not None else self.started
+        record_event(dict(
+            self.event,
+            cached=cached,
+            queue_ms=round((granted - self.started) * 1000, 1),
+            latency_ms=round((now - granted) * 1000, 1),
+            response_chars=len(text or ""),
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            response_tokens=getattr(usage, "candidates_token_count", None),
+            retries=self.retries,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+        ))
+
+
+@contextmanager
+def scheduled(user, on_wait=None):
+    """공정 분배 스케줄러의 자리를 받아 요청을 실행한다. 대기 시간이 넘으면 LLMError."""
+    scheduler = get_scheduler()
+    try:
+        scheduler.acquire(user, on_wait)
+    except SchedulerTimeout as e:
+        raise LLMError("Gemini 요청이 많아 차례를 기다리다 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.") from e
+    try:
+        yield
+    finally:
+        scheduler.release(user)
+
+
+class GeminiClient:
+    def __init__(self, api_key, model_name=MODEL_NAME):
+        self.api_key = api_key
+        # genai.GenerativeModel 과 같은 방식으로 이름을 맞춤 (캐시 키에 쓰므로 모델을 만들기 전에도 필요함)
+        self._model_name = model_name if "/" in model_name else f"models/{model_name}"
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.limiter = TokenBucket(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST)
+
+    @property
+    def model(self):
+        """처음 요청할 때 google.generativeai 를 불러와 모델을 만든다."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._build_model()
+        return self._model
+
+    def _build_model(self):
+        genai = lazy_import("google.generativeai")
+        glm = lazy_import("google.ai.generativelanguage")
+        with startup_phase("gemini_client"):
+            model = genai.GenerativeModel(self._model_name)
+            # genai.configure()는 프로세스 전역 설정이라 사용자별 키가 섞일 수 있으므로
+            # 키마다 별도 서비스 클라이언트를 만들어 모델에 연결한다.
+            client_options = {"api_key": self.api_key}
+            if GEMINI_ENDPOINT:
+                client_options["api_endpoint"] = GEMINI_ENDPOINT
+            model._client = glm.GenerativeServiceClient(
+                client_options=client_options, transport="rest" if GEMINI_ENDPOINT else None
+            )
+        return model
+
+    @property
+    def model_name(self):
+        return self._model_name
+
+    def _cache_model(self, response_schema):
+        # 같은 프롬프트라도 JSON 스키마가 바뀌면 다른 응답으로 본다.
+        if response_schema is None:
+            return self.model_name
+        digest = hashlib.sha256(json.dumps(response_schema, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return f"{self.model_name}#json:{digest}"
+
+    @staticmethod
+    def _generation_config(response_schema):
+        if response_schema is None:
+            return None
+        return {"response_mime_type": "application/json", "response_schema": response_schema}
+
+    def _with_retries(self, request, deadline, record=None):
+        """request(timeout)을 일시적 오류에 한해 재시도한다. record 가 있으면 재시도 횟수를 센다."""
+        errors = google_exceptions()
+        transient = transient_errors()
+        attempt = 0
+        while True:
+            if not self.limiter.acquire(deadline):
+                raise LLMError("Gemini 요청이 많아 대기 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.")
+
+            remaining = deadline - time.monotonic()
+            try:
+                return request(min(ATTEMPT_TIMEOUT_SECONDS, max(1.0, remaining)))
+            except transient as e:
+                delay = backoff_delay(attempt)
+                attempt += 1
+                if attempt > MAX_RETRIES or time.monotonic() + delay > deadline:
+                    if isinstance(e, errors.TooManyRequests):
+                        raise LLMError("Gemini 사용 한도를 초과했습니다. 잠시 후 다시 시도해 주세요.") from e
+                    raise LLMError(f"Gemini 응답이 지연되거나 일시적인 오류가 발생했습니다: {e}") from e
+                if record is not None:
+                    record.retries += 1
+                time.sleep(delay)
+            except errors.GoogleAPICallError as e:
+                raise LLMError(f"Gemini 요청이 거부되었습니다: {e}") from e
+
+    def for_user(self, user, page=None):
+        """한 사용자(세션) 몫의 요청으로 묶은 클라이언트. 요청은 그 사용자의 대기열을 거친다."""
+        return UserClient(self, user, page)
+
+    def generate(self, prompt, kind, use_cache=True, response_schema=None, user=DEFAULT_USER, on_wait=None,
+                 page=None, refresh=False):
+        """
+        프롬프트에 대한 응답 문자열을 반환한다. 같은 모델·프롬프트의 응답이 캐시에 있으면 그대로 쓴다.
+        response_schema 를 주면 그 스키마를 따르는 JSON 문자열로 응답을 받는다.
+        refresh=True 이면('다시 생성') 캐시를 읽지 않고 새로 받아 캐시를 새 응답으로 바꾼다.
+        use_cache=False 이면 캐시를 읽지도 쓰지도 않는다.
+        """
+        record = CallRecord(self.model_name, prompt, kind, user, page, stream=False)
+        cache = get_response_cache()
+        cache_model = self._cache_model(response_schema)
+        if use_cache and not refresh:
+            cached = cache.get(cache_model, prompt, kind)
+            if cached is not None:
+                record.finish(cached, cached=True)
+                return cached
+
+        try:
+            with scheduled(user, on_wait):
+                # 마감 시간은 대기열에서 차례를 받은 뒤부터 잰다
+                record.mark_granted()
+                deadline = time.monotonic() + CALL_DEADLINE_SECONDS
+                response = self._with_retries(
+                    lambda timeout: self.model.generate_content(
+                        prompt,
+                        generation_config=self._generation_config(response_schema),
+                        request_options={"timeout": timeout}
+                    ),
+                    deadline,
+                    record
+                )
+                text = response.text
+        except Exception as e:
+            record.finish(error=e)
+            raise
+        record.finish(text, usage=getattr(response, "usage_metadata", None))
+        if use_cache:
+            cache.put(cache_model, prompt, kind, text)
+        return text
+
+    def stream(self, prompt, kind, use_cache=True, response_schema=None, user=DEFAULT_USER, on_wait=None,
+               page=None, refresh=False):
+        """
+        응답을 도착하는 대로 조각 단위로 내보내는 제너레이터. 끝까지 받으면 전체 응답을 캐시에 저장한다.
+        스케줄러의 자리는 마지막 조각을 받을 때까지 가지고 있는다. use_cache·refresh 는 generate() 와 같다.
+        """
+        record = CallRecord(self.model_name, prompt, kind, user, page, stream=True)
+        cache = get_response_cache()
+        cache_model = self._cache_model(response_schema)
+        if use_cache and not refresh:
+            cached = cache.get(cache_model, prompt, kind)
+            if cached is not None:
+                record.finish(cached, cached=True)
+                yield cached
+                return
+
+        def first_chunk(timeout):
+            iterator = iter(self.model.generate_content(
+                prompt,
+                stream=True,
+                generation_config=self._generation_config(response_schema),
+                request_options={"timeout": timeout}
+            ))
+            return next(iterator, None), iterator
+
+        chunks = []
+        usage = None
+        try:
+            with scheduled(user, on_wait):
+                record.mark_granted()
+                # 재시도는 첫 조각을 받기 전까지만 한다. 이미 화면에 나간 조각은 되돌릴 수 없기 때문이다.
+                deadline = time.monotonic() + CALL_DEADLINE_SECONDS
+                chunk, iterator = self._with_retries(first_chunk, deadline, record)
+                errors = google_exceptions()
+                try:
+                    while chunk is not None:
+                        # 토큰 사용량은 마지막 조각에 담겨 옴
+                        usage = getattr(chunk, "usage_metadata", None) or usage
+                        text = chunk.text
+                        if text:
+                            chunks.append(text)
+                            yield text
+                        chunk = next(iterator, None)
+                except errors.GoogleAPICallError as e:
+                    raise LLMError(f"Gemini 응답을 받는 중 연결이 끊겼습니다: {e}") from e
+        except BaseException as e:
+            # 화면 쪽에서 중간에 멈춘 경우(GeneratorExit)도 기록함
+            record.finish("".join(chunks), usage=usage, error=e)
+            raise
+
+        record.finish("".join(chunks), usage=usage)
+        if use_cache:
+            cache.put(cache_model, prompt, kind, "".join(chunks))
+
+    def generate_many(self, prompts, kind, max_workers=DEFAULT_MAX_WORKERS, use_cache=True, response_schema=None,
+                      user=DEFAULT_USER, page=None, refresh=False):
+        """
+        여러 프롬프트를 제한된 스레드 풀에서 동시에 보낸다.
+        prompts 는 {이름: 프롬프트} 이며, 끝나는 순서대로 (이름, 응답, 예외)를 내보낸다.
+        한 요청이 실패해도 나머지는 계속 진행하고, 실패한 요청은 응답 None 과 예외를 돌려준다.
+        Streamlit 함수는 작업 스레드에서 부를 수 없으므로 화면 갱신은 호출한 쪽에서 한다.
+        """
+        if not prompts:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+            futures = {
+                executor.submit(
+                    self.generate, prompt, kind, use_cache, response_schema, user, None, page, refresh
+                ): name
+                for name, prompt in prompts.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    yield name, future.result(), None
+                except Exception as e:
+                    yield name, None, e
+
+
+class UserClient:
+    """
+    GeminiClient 를 한 사용자 몫으로 묶은 것. generate/stream/generate_many 는 GeminiClient 와 같고
+    요청이 모두 user 의 대기열로 들어간다. 파이프라인 작업 스레드에 넘겨도 같은 사용자로 센다.
+    page 는 호출 기록에 남길 페이지 이름이다.
+    """
+
+    def __init__(self, client, user, page=None):
+        self.client = client
+        self.user = user
+        self.page = page
+
+    @property
+    def model_name(self):
+        return self.client.model_name
+
+    def generate(self, prompt, kind, use_cache=True, response_schema=None, on_wait=None, refresh=False):
+        return self.client.generate(
+            prompt, kind, use_cache, response_schema, user=self.user, on_wait=on_wait, page=self.page, refresh=refresh
+        )
+
+    def stream(self, prompt, kind, use_cache=True, response_schema=None, on_wait=None, refresh=False):
+        return self.client.stream(
+            prompt, kind, use_cache, response_schema, user=self.user, on_wait=on_wait, page=self.page, refresh=refresh
+        )
+
+    def generate_many(self, prompts, kind, max_workers=DEFAULT_MAX_WORKERS, use_cache=True, response_schema=None,
+                      refresh=False):
+        return self.client.generate_many(
+            prompts, kind, max_workers, use_cache, response_schema, user=self.user, page=self.page, refresh=refresh
+        )
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key, model_name=MODEL_NAME):
+    """API 키·모델별 공용 클라이언트를 반환한다. 재실행과 세션이 바뀌어도 같은 객체를 쓴다."""
+    key = (api_key, model_name)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = GeminiClient(api_key, model_name)
+                _clients[key] = client
+    return client
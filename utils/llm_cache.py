@@ -0,0 +1,161 @@
+"""
+Gemini 응답 캐시
+
+모델 이름과 정규화한 프롬프트의 해시를 키로 응답 문자열을 SQLite 파일에 저장한다.
+파일 하나를 모든 세션과 프로세스가 함께 쓰므로, 같은 프롬프트를 다시 보내면
+API를 호출하지 않고 저장된 응답을 바로 돌려준다.
+
+- 최대 항목 수를 넘으면 가장 오래 쓰이지 않은 항목부터 지운다(LRU).
+- 저장 후 TTL이 지난 항목은 조회 시 버린다.
+- DISABLED_KINDS 에 들어 있는 프롬프트 종류는 캐시하지 않는다.
+- 종류별 적중/실패 횟수를 프로세스 내부와 DB 양쪽에 센다.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.environ.get("IEP_LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite"))
+MAX_ENTRIES = int(os.environ.get("IEP_LLM_CACHE_MAX_ENTRIES", "2000"))
+TTL_SECONDS = int(os.environ.get("IEP_LLM_CACHE_TTL", str(7 * 24 * 60 * 60)))
+
+# 쉼표로 구분한 프롬프트 종류. 예: IEP_LLM_CACHE_DISABLED_KINDS="objective_items,semester"
+DISABLED_KINDS = {
+    kind.strip() for kind in os.environ.get("IEP_LLM_CACHE_DISABLED_KINDS", "").split(",") if kind.strip()
+}
+
+_SPACES_RE = re.compile(r"[ \t]+")
+
+
+def normalize_prompt(prompt):
+    """들여쓰기·줄 끝 공백·앞뒤 빈 줄 차이는 같은 프롬프트로 본다."""
+    lines = [_SPACES_RE.sub(" ", line.strip()) for line in prompt.strip().splitlines()]
+    return "\n".join(lines)
+
+
+def cache_key(model_name, prompt):
+    raw = f"{model_name}\n{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, ttl_seconds=TTL_SECONDS,
+                 disabled_kinds=DISABLED_KINDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disabled_kinds = set(disabled_kinds)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {}  # 프롬프트 종류 -> {"hits": n, "misses": n}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT, kind TEXT, response TEXT,
+                created_at REAL, accessed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+            CREATE TABLE IF NOT EXISTS stats (
+                kind TEXT PRIMARY KEY, hits INTEGER DEFAULT 0, misses INTEGER DEFAULT 0
+            );
+        """)
+
+    def _conn(self):
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩 연다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enabled_for(self, kind):
+        return kind not in self.disabled_kinds
+
+    def _count(self, kind, field):
+        with self._lock:
+            counter = self._counters.setdefault(kind, {"hits": 0, "misses": 0})
+            counter[field] += 1
+        self._conn().execute(
+            f"INSERT INTO stats (kind, {field}) VALUES (?, 1) "
+            f"ON CONFLICT(kind) DO UPDATE SET {field} = {field} + 1",
+            (kind,)
+        )
+
+    def get(self, model_name, prompt, kind):
+        """저장된 응답을 반환한다. 없거나 만료되었으면 None."""
+        if not self.enabled_for(kind):
+            return None
+
+        key = cache_key(model_name, prompt)
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count(kind, "misses")
+            return None
+
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(kind, "hits")
+        return row[0]
+
+    def put(self, model_name, prompt, kind, response):
+        if not self.enabled_for(kind) or not response:
+            return
+
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, kind, response, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key(model_name, prompt), model_name, kind, response, now, now)
+        )
+        self._evict(conn)
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self):
+        """프로세스 내부 카운터와 DB 누적 카운터를 함께 반환한다."""
+        with self._lock:
+            process = {kind: dict(counter) for kind, counter in self._counters.items()}
+        shared = {
+            kind: {"hits": hits, "misses": misses}
+            for kind, hits, misses in self._conn().execute("SELECT kind, hits, misses FROM stats")
+        }
+        entries = self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"process": process, "shared": shared, "entries": entries}
+
+    def clear(self):
+        self._conn().execute("DELETE FROM responses")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """프로세스 공용 캐시 객체를 반환한다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
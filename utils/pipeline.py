@@ -0,0 +1,69 @@
+"""
+의존 관계가 있는 생성 단계를 최대한 동시에 실행하는 파이프라인
+
+각 단계는 선행 단계의 결과 사전을 받아 값을 돌려주는 함수이다.
+선행 단계가 모두 끝난 단계부터 스레드 풀에 올리므로, 서로 독립적인 단계는 함께 실행된다.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.llm import DEFAULT_MAX_WORKERS
+
+
+class PipelineSkipped(Exception):
+    """선행 단계가 실패해서 실행하지 않은 단계."""
+
+
+class Stage:
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func      # func({선행 단계 이름: 결과}) -> 결과
+        self.deps = tuple(deps)
+
+
+def run_pipeline(stages, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    단계를 의존 순서에 맞춰 실행하고, 끝나는 순서대로 (단계 이름, 결과, 예외)를 내보낸다.
+    실패한 단계에 의존하는 단계는 실행하지 않고 PipelineSkipped 예외와 함께 내보낸다.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in names]
+        if unknown:
+            raise ValueError(f"'{stage.name}' 단계의 선행 단계가 없습니다: {', '.join(unknown)}")
+
+    pending = {stage.name: stage for stage in stages}
+    results, failed = {}, set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            # 건너뛴 단계에 의존하는 단계도 같은 차례에 정리되도록 변화가 없을 때까지 반복함
+            changed = True
+            while changed:
+                changed = False
+                for name, stage in list(pending.items()):
+                    failed_deps = [dep for dep in stage.deps if dep in failed]
+                    if failed_deps:
+                        del pending[name]
+                        failed.add(name)
+                        changed = True
+                        yield name, None, PipelineSkipped(f"선행 단계 실패: {', '.join(failed_deps)}")
+                    elif all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        running[executor.submit(stage.func, {dep: results[dep] for dep in stage.deps})] = name
+
+            if not running:
+                if pending:
+                    raise ValueError(f"순환 의존 관계가 있습니다: {', '.join(pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    failed.add(name)
+                    yield name, None, e
+                else:
+                    yield name, results[name], None
@@ -0,0 +1,265 @@
+"""
+개별화교육계획(IEP) 수립 단계의 공용 로직
+
+진단 결과 분류, 생성 결과 후처리, 구조화된(JSON) 목표·내용 응답 해석, 그리고
+① 진단 이후의 생성 단계를 하나의 파이프라인으로 묶는 함수를 모아 둔다.
+Streamlit 에 의존하지 않으므로 페이지와 일괄 생성 양쪽에서 쓴다.
+"""
+import json
+import re
+
+from utils.curriculum import get_curriculum_index
+from utils.pipeline import Stage
+from utils.prompts import (
+    CONTENT_RESPONSE_SCHEMA,
+    GOAL_RESPONSE_SCHEMA,
+    build_content_prompt,
+    build_eval_plan_prompt,
+    build_goal_prompt,
+    build_summary_prompt,
+)
+from utils.token_budget import fit_items_to_budget
+
+MONTHS_IN_SEMESTER = {"1학기": ["3월", "4월", "5월", "6월", "7월"], "2학기": ["8월", "9월", "10월", "11월", "12월"]}
+
+EVAL_METHODS = [
+    "관찰누가기록", "포트폴리오", "학습지/과제물 분석",
+    "질의응답", "발표", "프로젝트", "자기평가/동료평가"
+]
+
+DEFAULT_EVAL_METHODS = ["관찰누가기록"]
+
+# ① 진단 평가 값. 세션에는 {standard_key: 이 목록의 위치} 만 저장함
+RATING_VALUES = ("예", "아니오", "관찰 필요")
+
+GOAL_PARSE_FAILED = "생성 결과 없음: ③교육목표 탭에서 다시 생성해주세요."
+CONTENT_PARSE_FAILED = "생성 결과 없음: ④교육내용 탭에서 다시 생성해주세요."
+
+
+# --- 진단 결과 ---
+def expand_ratings(ratings, index=None):
+    """
+    세션의 간단한 진단 결과 {standard_key: 평가 코드}를 프롬프트·표에 쓰는 항목 사전
+    {key: {'grade', 'domain', 'id', 'content', 'value', '해설'}}으로 펼친다.
+    내용·해설은 공용 인덱스에서 가져오며, 인덱스에 없는 키(파일이 바뀐 경우)는 건너뛴다.
+    """
+    if index is None:
+        index = get_curriculum_index()
+    evaluation = {}
+    for key, code in ratings.items():
+        item = index.item_by_key(key)
+        if item is None:
+            continue
+        evaluation[key] = {
+            "grade": item['출처'], "domain": item.get('영역', '기타'), "id": item['id'],
+            "content": item['내용'], "value": RATING_VALUES[code], "해설": item.get("해설", "")
+        }
+    return evaluation
+
+
+def achieved_items(evaluation, selected_domains):
+    """② 현행수준 작성 대상: '예'로 체크된 항목."""
+    return [v for v in evaluation.values() if v.get('value') == "예" and v.get('domain') in selected_domains]
+
+
+def target_items(evaluation, selected_domains):
+    """③ 교육목표 수립 대상: '아니오' 또는 '관찰 필요'로 체크된 항목."""
+    return [v for v in evaluation.values() if v.get('value') in ["아니오", "관찰 필요"] and v.get('domain') in selected_domains]
+
+
+def learning_items(evaluation, selected_domains):
+    """④ 교육내용 생성에 참고할 항목: '예'가 아닌 모든 항목."""
+    return [v for v in evaluation.values() if v.get('value') != "예" and v.get('domain') in selected_domains]
+
+
+# --- 생성 결과 후처리 ---
+def clean_summary(text):
+    return text.replace('*', '').replace('#', '').strip()
+
+
+def normalize_month(text):
+    """'3 월', '3월 목표' 처럼 표기가 흔들려도 '3월'로 맞춘다. 월을 찾지 못하면 None."""
+    match = re.search(r'(\d{1,2})\s*월', text or "")
+    return f"{int(match.group(1))}월" if match else None
+
+
+def _load_json(text, step_label):
+    # 스키마를 지정해도 드물게 코드 블록으로 감싸서 오는 경우가 있어 벗겨낸 뒤 읽는다.
+    raw = text.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`")
+        raw = raw[raw.find("{"):] if "{" in raw else raw
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{step_label} 생성 결과를 읽지 못했습니다. 다시 생성해주세요. ({e})") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"{step_label} 생성 결과의 형식이 올바르지 않습니다. 다시 생성해주세요.")
+    return data
+
+
+def _dict_entries(value):
+    """목록 속 사전 항목만 고른다. 스키마와 다른 값(문자열, null 등)은 빈 목록으로 본다."""
+    return [entry for entry in value if isinstance(entry, dict)] if isinstance(value, list) else []
+
+
+def _clean_text(value):
+    return value.strip() if isinstance(value, str) else ''
+
+
+def _clean_standards(value):
+    return [str(s).strip() for s in value if str(s).strip()] if isinstance(value, list) else []
+
+
+def parse_goal_plan(text, semester, months):
+    """
+    GOAL_RESPONSE_SCHEMA 형식의 응답을 읽어 교육목표 구조로 바꾼다.
+        {'semester': 학기, 'semester_goal': 문장, 'months': {월: {'goal': 문장, 'standards': [ID, ...]}}}
+    응답에 빠진 월은 GOAL_PARSE_FAILED 로 채운다.
+    """
+    data = _load_json(text, "교육목표")
+    by_month = {}
+    for entry in _dict_entries(data.get('monthly_goals')):
+        month = normalize_month(_clean_text(entry.get('month')))
+        if month in months and month not in by_month:
+            by_month[month] = {
+                'goal': _clean_text(entry.get('goal')) or GOAL_PARSE_FAILED,
+                'standards': _clean_standards(entry.get('standards')),
+            }
+    return {
+        'semester': semester,
+        'semester_goal': _clean_text(data.get('semester_goal')),
+        'months': {month: by_month.get(month, {'goal': GOAL_PARSE_FAILED, 'standards': []}) for month in months},
+    }
+
+
+def format_activities(activities):
+    return "\n".join(f"**{_clean_text(a.get('name'))}:** {_clean_text(a.get('description'))}" for a in activities)
+
+
+def parse_content_plan(text, months):
+    """CONTENT_RESPONSE_SCHEMA 형식의 응답을 읽어 {월: 주요 학습 활동 글}로 바꾼다. 빠진 월은 CONTENT_PARSE_FAILED."""
+    data = _load_json(text, "교육내용")
+    by_month = {}
+    for entry in _dict_entries(data.get('monthly_activities')):
+        month = normalize_month(_clean_text(entry.get('month')))
+        activities = _dict_entries(entry.get('activities'))
+        if month in months and month not in by_month and activities:
+            by_month[month] = format_activities(activities)
+    return {month: by_month.get(month, CONTENT_PARSE_FAILED) for month in months}
+
+
+# --- 한 달만 다시 생성 ---
+def _standard_id(value):
+    """'[4국01-01]'처럼 대괄호나 공백이 붙어 온 ID 에서 성취기준 ID 만 남긴다."""
+    return str(value).strip().strip("[]").strip()
+
+
+def month_context_items(items, standards):
+    """그 달의 근거 성취기준에 해당하는 항목만 고른다. 하나도 맞지 않으면 전체를 쓴다."""
+    wanted = {_standard_id(s) for s in standards}
+    matched = [v for v in items if _standard_id(v['id']) in wanted]
+    return matched or items
+
+
+def parse_month_goal(text):
+    """MONTH_GOAL_RESPONSE_SCHEMA 형식의 응답을 {'goal', 'standards'}로 바꾼다."""
+    data = _load_json(text, "월별 목표")
+    goal = _clean_text(data.get('goal'))
+    if not goal:
+        raise ValueError("월별 목표가 비어 있습니다. 다시 생성해주세요.")
+    return {'goal': goal, 'standards': _clean_standards(data.get('standards'))}
+
+
+def parse_month_activities(text):
+    """MONTH_CONTENT_RESPONSE_SCHEMA 형식의 응답을 주요 학습 활동 글로 바꾼다."""
+    data = _load_json(text, "월별 교육내용")
+    activities = _dict_entries(data.get('activities'))
+    if not activities:
+        raise ValueError("주요 학습 활동이 비어 있습니다. 다시 생성해주세요.")
+    return format_activities(activities)
+
+
+# --- 구조화된 계획의 글 보기 ---
+def format_goal_text(goal_plan):
+    """교육목표 구조를 기존 '[1학기 학기 목표]', '[3월 목표]' 형식의 글로 보여준다."""
+    parts = [f"[{goal_plan['semester']} 학기 목표]\n{goal_plan['semester_goal']}"]
+    for month, data in goal_plan['months'].items():
+        part = f"[{month} 목표]\n{data['goal']}"
+        if data.get('standards'):
+            part += f"\n근거 성취기준: {', '.join(data['standards'])}"
+        parts.append(part)
+    return "\n\n".join(parts)
+
+
+def format_content_text(content_plan):
+    return "\n\n".join(f"### {month} 주요 학습 활동\n{text}" for month, text in content_plan.items())
+
+
+def build_monthly_plan(goal_plan, content_plan, months):
+    """③·④ 결과를 {월: {'goal', 'content'}}로 묶는다."""
+    return {
+        month: {
+            'goal': goal_plan['months'].get(month, {}).get('goal', GOAL_PARSE_FAILED),
+            'content': content_plan.get(month, CONTENT_PARSE_FAILED),
+        }
+        for month in months
+    }
+
+
+def budgeted_content_prompt(goal_text, goal_plan, items):
+    """
+    ④ 교육내용 프롬프트를 토큰 예산 안에서 만든다. 해설은 미리 만든 요약으로 바꾸고,
+    그래도 길면 목표의 근거 성취기준이 아닌 항목부터 줄인다. 반환값: (프롬프트, BudgetReport)
+    """
+    cited = [std for data in goal_plan['months'].values() for std in data.get('standards', [])]
+    return fit_items_to_budget(lambda kept: build_content_prompt(goal_text, kept), items, cited)
+
+
+# --- 전체 생성 파이프라인 ---
+def build_planning_stages(client, subject, evaluation, selected_domains, semester, months, eval_methods,
+                          refresh=False):
+    """
+    ① 진단 결과로부터 나머지 생성 단계를 의존 관계와 함께 구성한다.
+
+        summary ─┐
+        goal ────┴─ content ─ eval:3월, eval:4월, ... (월별 동시)
+
+    eval_methods 는 {월: 평가 방법 목록} 이다.
+    단계 결과: summary 는 후처리된 문자열, goal 은 parse_goal_plan() 구조,
+    content 는 parse_content_plan() 구조, eval:{월} 은 평가초점 문자열.
+    refresh=True 이면(이미 만든 계획을 다시 생성) 캐시된 응답을 쓰지 않는다.
+    """
+    achieved = achieved_items(evaluation, selected_domains)
+    targets = target_items(evaluation, selected_domains)
+    learning = learning_items(evaluation, selected_domains)
+
+    def run_summary(_):
+        if not achieved:
+            return None
+        return clean_summary(client.generate(build_summary_prompt(subject, achieved), "summary", refresh=refresh))
+
+    def run_goal(_):
+        prompt = build_goal_prompt(subject, semester, months, targets)
+        output = client.generate(prompt, "goal", response_schema=GOAL_RESPONSE_SCHEMA, refresh=refresh)
+        return parse_goal_plan(output, semester, months)
+
+    def run_content(deps):
+        prompt, _ = budgeted_content_prompt(format_goal_text(deps['goal']), deps['goal'], learning)
+        output = client.generate(prompt, "content", response_schema=CONTENT_RESPONSE_SCHEMA, refresh=refresh)
+        return parse_content_plan(output, months)
+
+    def make_eval_stage(month):
+        def run_eval(deps):
+            plan = build_monthly_plan(deps['goal'], deps['content'], [month])[month]
+            prompt = build_eval_plan_prompt(plan['goal'], plan['content'], eval_methods[month])
+            return client.generate(prompt, "eval_plan", refresh=refresh)
+        return Stage(f"eval:{month}", run_eval, deps=("goal", "content"))
+
+    stages = [
+        Stage("summary", run_summary),
+        Stage("goal", run_goal),
+        Stage("content", run_content, deps=("goal",)),
+    ]
+    stages.extend(make_eval_stage(month) for month in months)
+    return stages
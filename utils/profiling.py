@@ -0,0 +1,159 @@
+"""
+시작 시간 측정(startup profiler)
+
+무거운 의존성(google.generativeai, python-docx)은 페이지를 처음 그릴 때가 아니라 처음 쓸 때 불러온다.
+lazy_import() 로 불러온 모듈의 import 시간과, 프로세스당 한 번 하는 초기화(성취기준 인덱스,
+Gemini 클라이언트, 문서 템플릿)를 startup_phase() 로 재어 프로세스 안에 기록해 둔다.
+- report()  : [{"name", "kind", "ms", "at_s"}] (at_s 는 이 모듈을 불러온 뒤 몇 초에 끝났는지)
+- 관리자 페이지(pages/4_llm_metrics.py)가 이 기록을 보여준다.
+
+새 프로세스에서 페이지를 처음 실행해 첫 화면까지 걸린 시간과 모듈별 import 시간(-X importtime)을 보려면:
+    python -m utils.profiling pages/2_iep_planning.py --top 15
+    python -m utils.profiling main_app.py pages/1_iep_meeting.py --json
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROCESS_STARTED = time.perf_counter()
+
+_records = []
+_records_lock = threading.Lock()
+
+
+@contextmanager
+def startup_phase(name, kind="init"):
+    """with 블록에 걸린 시간을 kind("import"/"init") 기록으로 남긴다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        finished = time.perf_counter()
+        with _records_lock:
+            _records.append({
+                "name": name,
+                "kind": kind,
+                "ms": round((finished - started) * 1000, 1),
+                "at_s": round(finished - PROCESS_STARTED, 3),
+            })
+
+
+def lazy_import(module_name):
+    """모듈을 반환한다. 아직 불러오지 않았으면 지금 불러오고 그 시간을 기록한다."""
+    if module_name in sys.modules:
+        # 다른 스레드가 불러오는 중이면 import_module 이 끝날 때까지 기다려 줌
+        return importlib.import_module(module_name)
+    with startup_phase(module_name, kind="import"):
+        return importlib.import_module(module_name)
+
+
+def report():
+    """지금까지의 기록(오래된 순)."""
+    with _records_lock:
+        return list(_records)
+
+
+# --- 새 프로세스에서 첫 실행 재기 ---
+_CHILD_CODE = """
+import json, os, sys, time
+sys.path.insert(0, os.getcwd())
+from streamlit.testing.v1 import AppTest
+loaded = set(sys.modules)
+at = AppTest.from_file(os.path.abspath(sys.argv[1]), default_timeout=600)
+at.secrets["GEMINI_API_KEY"] = "profiling"
+started = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - started
+from utils.profiling import report
+print("@@PROFILE@@" + json.dumps({
+    "first_run_ms": round(elapsed * 1000, 1),
+    "exceptions": [str(e.value) for e in at.exception],
+    "preloaded": sorted(loaded),
+    "phases": report(),
+}))
+"""
+
+
+def parse_importtime(stderr, skip=()):
+    """-X importtime 출력에서 {모듈: (자체 µs, 누적 µs)}. skip 에 있는 모듈은 뺀다."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            modules.setdefault(name, (int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue  # 머리글 줄
+    return {name: times for name, times in modules.items() if name not in skip}
+
+
+def profile_script(script, python=sys.executable):
+    """script 를 새 프로세스에서 한 번 실행해 첫 실행 시간, 실행 중 import 시간, 초기화 기록을 반환한다."""
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", _CHILD_CODE, script],
+        capture_output=True, text=True, env=dict(os.environ, PYTHONWARNINGS="ignore")
+    )
+    marker = next((line for line in completed.stdout.splitlines() if line.startswith("@@PROFILE@@")), None)
+    if marker is None:
+        raise RuntimeError(f"{script} 실행 실패:\n{completed.stderr[-2000:]}")
+    result = json.loads(marker[len("@@PROFILE@@"):])
+
+    # AppTest 준비 전에 이미 불러온 모듈은 빼고, 페이지 실행 중 불러온 것만 셈
+    modules = parse_importtime(completed.stderr, skip=set(result.pop("preloaded")))
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0) + self_us
+    result["script"] = script
+    result["import_ms"] = round(sum(self_us for self_us, _ in modules.values()) / 1000, 1)
+    result["packages"] = sorted(
+        ({"package": name, "ms": round(us / 1000, 1)} for name, us in packages.items()), key=lambda row: -row["ms"]
+    )
+    result["modules"] = sorted(
+        ({"module": name, "self_ms": round(s / 1000, 1), "cumulative_ms": round(c / 1000, 1)}
+         for name, (s, c) in modules.items()),
+        key=lambda row: -row["cumulative_ms"]
+    )
+    return result
+
+
+def print_profile(result, top):
+    print(f"\n== {result['script']}: 첫 실행 {result['first_run_ms']:.0f} ms (그중 import {result['import_ms']:.0f} ms)")
+    if result["exceptions"]:
+        print(f"  (실행 중 예외: {result['exceptions'][0]})")
+    print("  패키지별 import:")
+    for row in result["packages"][:top]:
+        print(f"    {row['package']:<32}{row['ms']:>10.1f} ms")
+    if result["phases"]:
+        print("  지연 import · 초기화:")
+        for row in result["phases"]:
+            print(f"    {row['kind']:<7}{row['name']:<32}{row['ms']:>8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 첫 실행(콜드 스타트) 시간 측정")
+    parser.add_argument("scripts", nargs="*", default=[
+        "main_app.py", "pages/1_iep_meeting.py", "pages/2_iep_planning.py", "pages/3_iep_evaluation.py"
+    ])
+    parser.add_argument("--top", type=int, default=10, help="보여줄 패키지 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    results = [profile_script(script) for script in args.scripts]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for result in results:
+            print_profile(result, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
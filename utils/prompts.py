@@ -0,0 +1,224 @@
+"""
+페이지와 일괄 생성 기능이 함께 쓰는 Gemini 프롬프트
+"""
+
+
+def build_eval_plan_prompt(goal, content, methods):
+    """⑥ 평가계획 수립: 월별 목표·내용과 선택한 평가 방법으로 평가초점을 요청하는 프롬프트."""
+    selected_methods_text = ", ".join(methods)
+    return f"""
+    당신은 개별화교육계획(IEP) 전문가입니다.
+    아래는 학생의 월별 교육 목표와 내용이며, 이를 평가하기 위한 방법으로 '{selected_methods_text}'가 선택되었습니다.
+
+    - **월별 교육 목표**: {goal}
+    - **주요 교육 내용**: {content}
+    - **선택된 평가 방법**: {selected_methods_text}
+
+    **[과업 지시]**
+    선택된 평가 방법에 가장 적합한 **'평가 초점'**을 구체적인 질문 또는 확인 항목의 형태로 3~4가지 제안해 주세요.
+
+    **[출력 규칙]**
+    - 마크다운 리스트(`- `) 형식으로 평가 초점만 간결하게 작성하세요.
+    - 각 항목은 학생의 성취 여부를 명확히 확인할 수 있는 내용이어야 합니다.
+    """
+
+
+def build_month_eval_prompt(goal, focus_ratings):
+    """개별화교육평가: 월별 목표와 (평가 초점, 성취 수준) 목록으로 종합 평가 문구를 요청하는 프롬프트."""
+    full_eval_data = ""
+    for item, rating_label in focus_ratings:
+        full_eval_data += f"- 평가 초점: {item} / 성취 수준: {rating_label}\n"
+
+    # 월별 평가 생성 시 '단순 나열' 방지를 위한 정교화된 프롬프트
+    return f"""
+    당신은 특수교육 전문가임. 제공된 자료로 학생 성취도를 전문적인 관찰 언어로 서술함.
+    [작성 규칙]
+    1. '초점+척도'를 단순히 합친 문장을 나열하지 마십시오.
+    2. 비슷한 수행 수준을 보인 항목들을 유기적으로 묶어서 하나의 문단으로 구성하십시오.
+    3. 강점과 보완점을 대조하는 연결어를 사용하여 문장의 흐름을 자연스럽게 만드십시오.
+    4. 모든 문장은 반드시 '~함', '~임', '~하였음'과 같은 명사형 종결 어미를 사용하십시오.
+
+    목표: {goal}
+    관찰 데이터:
+    {full_eval_data}
+    """
+
+
+def build_summary_prompt(subject, achieved_items):
+    """② 현행수준 작성: '예'로 체크된 성취기준으로 현행학습수준 문단을 요청하는 프롬프트."""
+    input_text = "\n".join(f"- ({v['domain']} 영역) {v['content']}" for v in achieved_items)
+    return f"""
+    당신은 특수교사를 돕는 IEP 작성 전문가입니다. 다음은 특수교육 대상학생의 {subject} 교과 성취기준 평가 결과 중 '예'로 체크된 항목입니다.
+    이를 바탕으로 학생의 강점을 보여주는 '현행학습수준'을 **하나의 자연스러운 종합 문단**으로 작성해 주세요.
+
+    **[학생이 성취한 기준 목록]**
+    {input_text}
+
+    **[출력 규칙]**
+    - 각 영역(예: 읽기, 쓰기)의 강점들을 자연스럽게 연결하여 하나의 완성된 글로 작성하세요.
+    - **절대로 영역별로 목록을 나누거나 글머리 기호('-', '*')를 사용하지 마세요.**
+    - 학생의 강점을 나타내는 긍정적인 어조를 사용하세요.
+    - '~을 할 수 있으며, ~하는 능력을 보임.'과 같이 완전한 문장 형태로 자연스럽게 서술하세요.
+    """
+
+
+# ③·④ 단계는 JSON 스키마를 지정해 구조화된 응답으로 받는다.
+GOAL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "semester_goal": {"type": "string"},
+        "monthly_goals": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "month": {"type": "string"},
+                    "goal": {"type": "string"},
+                    "standards": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["month", "goal", "standards"],
+            },
+        },
+    },
+    "required": ["semester_goal", "monthly_goals"],
+}
+
+CONTENT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "monthly_activities": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "month": {"type": "string"},
+                    "activities": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "description": {"type": "string"},
+                            },
+                            "required": ["name", "description"],
+                        },
+                    },
+                },
+                "required": ["month", "activities"],
+            },
+        },
+    },
+    "required": ["monthly_activities"],
+}
+
+
+def build_goal_prompt(subject, semester, months, target_items):
+    """③ 교육목표 수립: 미도달 성취기준으로 학기·월별 목표를 요청하는 프롬프트. 응답은 GOAL_RESPONSE_SCHEMA 를 따른다."""
+    criteria_text = "\n".join(f"- {v['id']} {v['content']}" for v in target_items)
+    months_text = ', '.join(months)
+    return f"""
+    당신은 IEP 교육목표를 작성하는 특수교육 전문가입니다.
+
+    **[분석 자료]**
+    - 교과: {subject}, 대상 학기: {semester}, 목표 수립 월: {months_text}
+    - 미도달 성취기준: {criteria_text}
+
+    **[과업 지시]**
+    1. **학기 목표 생성**: 미도달 성취기준 전체를 아우르는 **{semester} 학기 목표**를 생성합니다.
+    2. **월별 목표 생성**: **{months_text}** 각각에 해당하는 **월별 목표**를 구체적으로 생성합니다. 이때, 목표는 학생이 달성해야 할 '성취 상태'를 나타내도록 **'~할 수 있다', '~한다'** 와 같이 측정 가능한 **학생 중심**의 결과로 서술해 주세요.
+
+    **[출력 형식 규칙]**
+    - semester_goal 에는 학기 목표 문장을 씁니다.
+    - monthly_goals 에는 {months_text} 순서대로 한 항목씩 넣고, month 는 '3월'처럼 씁니다.
+    - goal 에는 월별 목표 문장을, standards 에는 관련 성취기준 ID(예: 6국어01-02)를 넣습니다.
+    - **절대로 '#', '*'와 같은 특수기호는 사용하지 마세요.**
+
+    **[goal 예시]**
+    자신의 외모, 감정, 행동을 나타내는 간단한 단어와 짧은 문장을 사용하여 자신을 소개할 수 있다. 또한, 그림 자료를 통해 제시된 짧은 문장의 주요 내용을 파악할 수 있다.
+    """
+
+
+def build_content_prompt(goal_output, learning_items):
+    """④ 교육내용 생성: 수립된 목표와 관련 성취기준·해설로 월별 학습 활동을 요청하는 프롬프트. 응답은 CONTENT_RESPONSE_SCHEMA 를 따른다."""
+    criteria_text_for_content = "\n".join(
+        f"- {v['id']} {v['content']}" + (f"\n  (해설: {v['해설']})" if v.get('해설') else "")
+        for v in learning_items
+    )
+    return f"""
+    당신은 학생 중심의 학습 활동을 설계하는 교육 전문가입니다. 아래 교육 목표를 달성하기 위해 학생이 직접 수행할 '주요 학습 활동' 목록을 생성해야 합니다.
+
+    **[참고 자료]**
+    1. **수립된 교육 목표:** {goal_output}
+    2. **관련 성취기준 및 해설:** {criteria_text_for_content}
+
+    **[과업 지시]**
+    - 각 월별 목표를 달성하기 위한 **학생 중심의 주요 학습 활동을 3가지씩 제안**합니다.
+    - 교사의 지도 내용이 아닌, 학생의 입장에서 수행하는 과제를 서술합니다.
+    - **모든 활동 설명은 '~하기'와 같은 명사형으로 끝나야 합니다.** (예: '...답하는 활동을 합니다.' (X) -> '...답하기' (O))
+
+    **[출력 형식 규칙]**
+    - monthly_activities 에는 교육 목표에 나온 월마다 한 항목씩 넣고, month 는 '3월'처럼 씁니다.
+    - activities 의 각 항목은 name(활동명)과 description(활동 설명)으로 나누어 씁니다.
+    - **절대로 `*`, `-`, `#` 와 같은 특수 기호를 사용하지 마세요.**
+
+    **[activities 예시]**
+    - name: 주인공 되어보기 / description: 그림책이나 짧은 이야기 글을 읽고, 주인공이 되어 인터뷰 질문에 답하기
+    - name: 새로운 결말 상상하기 / description: 이야기의 결말을 자신만의 생각으로 새롭게 바꾸어 글이나 그림으로 표현하기
+    """
+
+
+# 한 달만 다시 생성할 때 쓰는 작은 스키마와 프롬프트
+MONTH_GOAL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "goal": {"type": "string"},
+        "standards": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["goal", "standards"],
+}
+
+MONTH_CONTENT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "activities": CONTENT_RESPONSE_SCHEMA["properties"]["monthly_activities"]["items"]["properties"]["activities"],
+    },
+    "required": ["activities"],
+}
+
+
+def build_month_goal_prompt(subject, semester_goal, month, current_goal, target_items):
+    """③ 교육목표 수립: 한 달의 목표만 다시 요청하는 프롬프트. 응답은 MONTH_GOAL_RESPONSE_SCHEMA 를 따른다."""
+    criteria_text = "\n".join(f"- {v['id']} {v['content']}" for v in target_items)
+    return f"""
+    당신은 IEP 교육목표를 작성하는 특수교육 전문가입니다.
+    교과 {subject}의 학기 목표 아래에서 **{month} 목표 하나만** 새로 작성해 주세요.
+
+    - 학기 목표: {semester_goal}
+    - 기존 {month} 목표(교사가 바꾸고 싶어 함): {current_goal}
+    - 관련 미도달 성취기준:
+    {criteria_text}
+
+    **[출력 규칙]**
+    - goal 에는 '~할 수 있다', '~한다'로 끝나는 측정 가능한 학생 중심 목표를 기존 목표와 다르게 씁니다.
+    - standards 에는 근거 성취기준 ID를 넣습니다.
+    - '#', '*' 같은 특수기호는 쓰지 마세요.
+    """
+
+
+def build_month_content_prompt(month, semester_goal, month_goal, learning_items):
+    """④ 교육내용 생성: 한 달의 주요 학습 활동만 다시 요청하는 프롬프트. 응답은 MONTH_CONTENT_RESPONSE_SCHEMA 를 따른다."""
+    criteria_text = "\n".join(f"- {v['id']} {v['content']}" for v in learning_items)
+    return f"""
+    당신은 학생 중심의 학습 활동을 설계하는 교육 전문가입니다.
+    아래 학기 목표 안에서 {month} 목표를 달성하기 위해 학생이 직접 수행할 주요 학습 활동 3가지를 새로 제안해 주세요.
+
+    - 학기 목표: {semester_goal}
+    - {month} 목표: {month_goal}
+    - 관련 성취기준:
+    {criteria_text}
+
+    **[출력 규칙]**
+    - activities 의 각 항목은 name(활동명)과 description(활동 설명)으로 나누어 씁니다.
+    - 활동 설명은 '~하기'와 같은 명사형으로 끝냅니다.
+    - `*`, `-`, `#` 같은 특수 기호는 쓰지 마세요.
+    """
@@ -0,0 +1,147 @@
+"""
+Gemini 요청 공정 분배(fair-share) 스케줄러
+
+프로세스 안의 모든 Gemini 호출은 실제 요청 전에 이 스케줄러에서 자리(slot)를 받는다.
+- 동시에 나가는 요청 수를 MAX_CONCURRENCY 로 제한한다(모든 API 키·세션 합계).
+- 사용자마다 대기열을 따로 두고, 자리가 나면 사용자를 돌아가며(round-robin) 한 건씩 내보낸다.
+  한 사용자가 요청을 많이 쌓아도 다른 사용자는 자기 차례를 바로 받는다.
+- 자리가 없으면 예외를 내지 않고 기다리며, 기다리는 동안 on_wait(앞에 남은 요청 수)를 불러
+  화면에 대기 순서를 보여줄 수 있게 한다. QUEUE_TIMEOUT_SECONDS 를 넘기면 SchedulerTimeout.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+MAX_CONCURRENCY = int(os.environ.get("IEP_LLM_MAX_CONCURRENCY", "8"))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get("IEP_LLM_QUEUE_TIMEOUT", "600"))
+WAIT_POLL_SECONDS = 0.5
+
+
+class SchedulerTimeout(Exception):
+    """대기열에서 QUEUE_TIMEOUT_SECONDS 안에 자리를 받지 못함."""
+
+
+class _Ticket:
+    __slots__ = ("granted",)
+
+    def __init__(self):
+        self.granted = False
+
+
+class FairScheduler:
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, queue_timeout=QUEUE_TIMEOUT_SECONDS):
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # 사용자 -> 대기 중인 ticket deque. 앞쪽 사용자가 다음 차례
+        self._active = {}             # 사용자 -> 실행 중인 요청 수
+
+    def _dispatch(self):
+        # 자리가 남는 동안 차례가 된 사용자의 맨 앞 요청을 내보내고, 그 사용자는 맨 뒤로 보냄
+        granted = False
+        while sum(self._active.values()) < self.max_concurrency and self._queues:
+            user, queue = next(iter(self._queues.items()))
+            queue.popleft().granted = True
+            self._active[user] = self._active.get(user, 0) + 1
+            granted = True
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+        if granted:
+            self._cond.notify_all()
+
+    def _position(self, user, ticket):
+        """ticket 앞에 먼저 나갈 요청 수(round-robin 순서를 따라 센 값)."""
+        own = self._queues[user]
+        index = own.index(ticket)
+        ahead, before_user = index, True
+        for other, queue in self._queues.items():
+            if other == user:
+                before_user = False
+                continue
+            ahead += min(len(queue), index + (1 if before_user else 0))
+        return ahead
+
+    def _withdraw(self, user, ticket):
+        """대기 중인 ticket 을 대기열에서 뺀다. 잠금을 잡은 채로 부른다."""
+        queue = self._queues[user]
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[user]
+
+    def acquire(self, user, on_wait=None):
+        ticket = _Ticket()
+        deadline = time.monotonic() + self.queue_timeout
+        last_reported = None
+        with self._cond:
+            self._queues.setdefault(user, deque()).append(ticket)
+            self._dispatch()
+        try:
+            while True:
+                with self._cond:
+                    if not ticket.granted:
+                        self._cond.wait(timeout=WAIT_POLL_SECONDS)
+                    if ticket.granted:
+                        return
+                    if time.monotonic() > deadline:
+                        self._withdraw(user, ticket)
+                        raise SchedulerTimeout(f"{self.queue_timeout:.0f}초 동안 차례가 오지 않았습니다.")
+                    ahead = self._position(user, ticket)
+                # 화면 갱신 콜백은 잠금 밖에서 부름
+                if on_wait is not None and ahead != last_reported:
+                    on_wait(ahead)
+                    last_reported = ahead
+        except SchedulerTimeout:
+            raise
+        except BaseException:
+            # on_wait 가 예외를 낸 경우(Streamlit 재실행·중단 등): 자리를 받지 못했으면 대기열에서 빼고,
+            # 그사이 자리를 받았으면 돌려준 뒤 예외를 그대로 올림
+            with self._cond:
+                granted = ticket.granted
+                if not granted:
+                    self._withdraw(user, ticket)
+            if granted:
+                self.release(user)
+            raise
+
+    def release(self, user):
+        with self._cond:
+            self._active[user] -= 1
+            if not self._active[user]:
+                del self._active[user]
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, user, on_wait=None):
+        """자리를 받아 with 블록을 실행하고, 끝나면(예외 포함) 자리를 돌려준다."""
+        self.acquire(user, on_wait)
+        try:
+            yield
+        finally:
+            self.release(user)
+
+    def snapshot(self):
+        """{'active': {사용자: 실행 중}, 'waiting': {사용자: 대기 중}, 'max_concurrency': n}"""
+        with self._cond:
+            return {
+                "active": dict(self._active),
+                "waiting": {user: len(queue) for user, queue in self._queues.items()},
+                "max_concurrency": self.max_concurrency,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 공용 스케줄러를 반환한다."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FairScheduler()
+    return _scheduler
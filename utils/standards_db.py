@@ -0,0 +1,194 @@
+"""
+성취기준 검색용 SQLite/FTS5 데이터베이스
+
+data/ 아래 성취기준 JSON 전체를 하나의 SQLite 파일로 컴파일하고,
+'내용'과 '해설'을 FTS5로 색인해 교육과정·학년군을 가리지 않고 바로 검색할 수 있게 한다.
+한국어는 띄어쓰기 단위로 잘라서는 검색이 잘 되지 않으므로
+글자 2-gram으로 쪼갠 텍스트를 색인하고, 검색어도 같은 방식으로 쪼개 구(phrase)로 찾는다.
+
+오프라인 빌드:
+    python -m utils.standards_db
+검색 확인:
+    python -m utils.standards_db --search "낱말 읽기"
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+from utils.curriculum import DATA_DIR, CurriculumIndex, get_curriculum_index
+from utils.profiling import startup_phase
+
+DB_PATH = os.path.join(DATA_DIR, "achievement_standards.sqlite")
+SCHEMA_VERSION = "1"
+
+_WORD_RE = re.compile(r"\w+")
+_build_lock = threading.Lock()
+
+
+def to_ngrams(text):
+    """텍스트를 단어별 글자 2-gram 토큰 문자열로 바꾼다. 한 글자 단어는 그대로 둔다."""
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return " ".join(tokens)
+
+
+def build_match_query(query):
+    """검색어를 FTS5 MATCH 식으로 바꾼다. 단어마다 2-gram 구를 만들고 AND로 묶는다."""
+    clauses = []
+    for word in _WORD_RE.findall(query.lower()):
+        if len(word) == 1:
+            clauses.append(f"{word}*")
+        else:
+            clauses.append('"' + " ".join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return " AND ".join(clauses)
+
+
+def signature_digest(index):
+    return hashlib.sha1(repr(index.signature).encode("utf-8")).hexdigest()
+
+
+def _write_db(path, index):
+    """path 의 빈 SQLite 파일에 성취기준 표와 검색 색인을 쓴다. 반환값: 성취기준 수"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE standards (
+                rowid INTEGER PRIMARY KEY,
+                curriculum TEXT, subject TEXT, grade TEXT, domain TEXT,
+                std_id TEXT, content TEXT, commentary TEXT
+            );
+            CREATE INDEX idx_standards_file ON standards (curriculum, subject, grade);
+            CREATE INDEX idx_standards_id ON standards (std_id);
+            CREATE VIRTUAL TABLE standards_fts USING fts5(
+                id_ngrams, content_ngrams, commentary_ngrams, tokenize='unicode61'
+            );
+        """)
+        rows = []
+        for curriculum, subject, grade, items in index.iter_files():
+            for item in items:
+                rows.append((
+                    curriculum, subject, grade, item.get('영역', '기타'),
+                    item.get('id', ''), item.get('내용', ''), item.get('해설', '')
+                ))
+        conn.executemany(
+            "INSERT INTO standards (curriculum, subject, grade, domain, std_id, content, commentary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.executemany(
+            "INSERT INTO standards_fts (rowid, id_ngrams, content_ngrams, commentary_ngrams) VALUES (?, ?, ?, ?)",
+            [(rowid, to_ngrams(row[4]), to_ngrams(row[5]), to_ngrams(row[6])) for rowid, row in enumerate(rows, start=1)]
+        )
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("schema_version", SCHEMA_VERSION), ("data_signature", signature_digest(index))]
+        )
+        conn.execute("INSERT INTO standards_fts (standards_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def build_standards_db(index=None, db_path=DB_PATH):
+    """성취기준 인덱스를 SQLite 파일로 컴파일한다. 임시 파일에 만든 뒤 교체하므로 읽는 쪽은 끊기지 않는다."""
+    index = index or CurriculumIndex()
+    db_dir = os.path.dirname(db_path) or "."
+    fd, tmp_path = tempfile.mkstemp(suffix=".sqlite", dir=db_dir)
+    os.close(fd)
+    try:
+        count = _write_db(tmp_path, index)
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        # 만들다 실패하면 반쯤 만든 임시 파일을 data/ 에 남기지 않음
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def _read_meta(db_path):
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        return {}
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.DatabaseError:
+        return {}
+    finally:
+        conn.close()
+
+
+def ensure_standards_db(db_path=DB_PATH):
+    """DB 파일이 없거나 data/ 내용과 어긋나 있으면 다시 만든다."""
+    index = get_curriculum_index()
+    expected = {"schema_version": SCHEMA_VERSION, "data_signature": signature_digest(index)}
+    if os.path.exists(db_path) and _read_meta(db_path) == expected:
+        return db_path
+
+    with _build_lock:
+        if not (os.path.exists(db_path) and _read_meta(db_path) == expected):
+            with startup_phase("standards_db"):
+                build_standards_db(index, db_path)
+    return db_path
+
+
+def search_standards(query, limit=50, db_path=DB_PATH):
+    """'내용'·'해설'·ID에서 검색어를 찾아 관련도 순으로 반환한다."""
+    match_query = build_match_query(query)
+    if not match_query:
+        return []
+
+    conn = sqlite3.connect(f"file:{ensure_standards_db(db_path)}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            """
+            SELECT s.curriculum, s.subject, s.grade, s.domain, s.std_id, s.content, s.commentary
+            FROM standards_fts
+            JOIN standards AS s ON s.rowid = standards_fts.rowid
+            WHERE standards_fts MATCH ?
+            ORDER BY bm25(standards_fts, 10.0, 5.0, 1.0)
+            LIMIT ?
+            """,
+            (match_query, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        {
+            "교육과정": curriculum, "교과": subject, "학년군": grade, "영역": domain,
+            "id": std_id, "내용": content, "해설": commentary
+        }
+        for curriculum, subject, grade, domain, std_id, content, commentary in rows
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="성취기준 검색 DB 빌드 및 검색")
+    parser.add_argument("--db", default=DB_PATH, help="생성할 SQLite 파일 경로")
+    parser.add_argument("--search", help="빌드 후 실행할 검색어")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = build_standards_db(db_path=args.db)
+    print(f"{args.db}: 성취기준 {count}개 색인 완료 ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    if args.search:
+        started = time.perf_counter()
+        results = search_standards(args.search, db_path=args.db)
+        elapsed = (time.perf_counter() - started) * 1000
+        for row in results:
+            print(f"[{row['교육과정']}] {row['교과']} {row['학년군']} {row['id']} {row['내용']}")
+        print(f"검색 결과 {len(results)}건 ({elapsed:.1f} ms)")
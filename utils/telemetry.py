@@ -0,0 +1,93 @@
+"""
+Gemini 호출 기록(telemetry)
+
+GeminiClient 가 호출마다 한 줄짜리 이벤트를 JSONL 파일에 남긴다.
+    {"ts", "page", "kind", "user", "model", "stream", "cached", "latency_ms", "queue_ms",
+     "prompt_chars", "response_chars", "prompt_tokens", "response_tokens", "retries", "error"}
+latency_ms 는 대기열에서 차례를 받은 뒤부터 응답을 다 받을 때까지, queue_ms 는 차례를 기다린 시간이다.
+파일이 EVENTS_MAX_BYTES 를 넘으면 '.1' 로 한 번 돌려 두며, 읽을 때는 두 파일을 함께 읽는다.
+관리자 페이지(pages/4_llm_metrics.py)가 summarize() 로 종류별 지연 시간 백분위와 오류율을 보여준다.
+"""
+import json
+import math
+import os
+import threading
+import time
+
+EVENTS_PATH = os.environ.get("IEP_LLM_EVENTS_PATH", os.path.join(".cache", "llm_events.jsonl"))
+EVENTS_MAX_BYTES = int(os.environ.get("IEP_LLM_EVENTS_MAX_BYTES", str(50 * 1024 * 1024)))
+
+_write_lock = threading.Lock()
+
+
+def record_event(event, path=EVENTS_PATH):
+    """이벤트 한 건을 JSONL 한 줄로 덧붙인다. 기록 실패가 생성 요청을 막지 않도록 오류는 삼킨다."""
+    line = json.dumps(dict(event, ts=event.get("ts") or time.time()), ensure_ascii=False) + "\n"
+    try:
+        with _write_lock:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) > EVENTS_MAX_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        pass
+
+
+def load_events(path=EVENTS_PATH, since=None):
+    """저장된 이벤트 목록(오래된 순). since(UNIX 시각)를 주면 그 뒤의 이벤트만."""
+    events = []
+    for file_path in (path + ".1", path):
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 쓰는 도중에 읽은 마지막 줄
+                if since is None or event.get("ts", 0) >= since:
+                    events.append(event)
+    return events
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위. 값이 없으면 None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(events, group_by="kind"):
+    """
+    group_by(기본 프롬프트 종류)별 집계 행 목록. 지연 시간 백분위는 캐시를 거치지 않고
+    성공한 호출만으로 계산한다. 호출 수가 많은 순서.
+    """
+    groups = {}
+    for event in events:
+        groups.setdefault(event.get(group_by) or "-", []).append(event)
+
+    rows = []
+    for name, group in groups.items():
+        called = [e for e in group if not e.get("cached")]
+        ok = [e for e in called if not e.get("error")]
+        latencies = [e["latency_ms"] for e in ok if e.get("latency_ms") is not None]
+        rows.append({
+            group_by: name,
+            "calls": len(group),
+            "cache_hits": len(group) - len(called),
+            "errors": len(called) - len(ok),
+            "error_rate": (len(called) - len(ok)) / len(called) if called else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "queue_p95_ms": percentile([e.get("queue_ms") or 0 for e in called], 95),
+            "retries": sum(e.get("retries") or 0 for e in called),
+            "avg_prompt_chars": sum(e.get("prompt_chars") or 0 for e in group) / len(group),
+            "prompt_tokens": sum(e.get("prompt_tokens") or 0 for e in called),
+            "response_tokens": sum(e.get("response_tokens") or 0 for e in called),
+        })
+    rows.sort(key=lambda row: -row["calls"])
+    return rows
@@ -0,0 +1,92 @@
+"""
+프롬프트 토큰 예산
+
+보내기 전에 프롬프트 크기를 어림하고, 예산을 넘으면 우선순위가 낮은 참고 자료부터 줄인다.
+토큰 수는 글자 수로 어림한 값이다(영문·숫자 약 4자, 한글 등 그 밖의 글자 약 1.5자당 1토큰).
+"""
+import os
+from dataclasses import dataclass
+
+from utils.digests import get_digest
+
+ASCII_CHARS_PER_TOKEN = 4.0
+OTHER_CHARS_PER_TOKEN = 1.5
+
+# ④ 교육내용 프롬프트 예산 (어림 토큰 수)
+CONTENT_PROMPT_TOKEN_BUDGET = int(os.environ.get("IEP_CONTENT_PROMPT_TOKEN_BUDGET", "6000"))
+
+
+def estimate_tokens(text):
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128 and not ch.isspace())
+    other_chars = sum(1 for ch in text if ord(ch) >= 128)
+    return int(ascii_chars / ASCII_CHARS_PER_TOKEN + other_chars / OTHER_CHARS_PER_TOKEN) + 1
+
+
+@dataclass
+class BudgetReport:
+    tokens: int
+    budget: int
+    digests_used: int = 0
+    commentary_dropped: int = 0
+    items_dropped: int = 0
+
+    @property
+    def over_budget(self):
+        return self.tokens > self.budget
+
+    def summary(self):
+        parts = [f"프롬프트 약 {self.tokens:,} 토큰 (예산 {self.budget:,})"]
+        if self.digests_used:
+            parts.append(f"해설 요약 {self.digests_used}개 사용")
+        if self.commentary_dropped:
+            parts.append(f"해설 생략 {self.commentary_dropped}개")
+        if self.items_dropped:
+            parts.append(f"성취기준 생략 {self.items_dropped}개")
+        return " · ".join(parts)
+
+
+def fit_items_to_budget(render, items, cited_ids=(), budget=CONTENT_PROMPT_TOKEN_BUDGET):
+    """
+    render(items) 로 만든 프롬프트가 예산 안에 들도록 항목의 참고 자료를 줄인다.
+        1. 해설 원문 대신 미리 만든 해설 요약을 쓴다.
+        2. 그래도 넘으면 우선순위가 낮은 항목부터 해설을 뺀다.
+        3. 그래도 넘으면 우선순위가 낮은 항목부터 성취기준 자체를 뺀다(최소 한 개는 남김).
+    우선순위는 cited_ids(목표의 근거 성취기준)에 든 항목이 높고, 같은 무리에서는 앞쪽 항목이 높다.
+    반환값: (프롬프트, BudgetReport)
+    """
+    working = []
+    digests_used = 0
+    for item in items:
+        digest = get_digest(item)
+        if digest and digest != item.get("해설", ""):
+            digests_used += 1
+        working.append(dict(item, 해설=digest))
+
+    cited = set(cited_ids)
+    # 우선순위가 낮은 항목부터 줄이도록 뒤에서부터, 근거 성취기준이 아닌 항목을 먼저 둠
+    trim_order = sorted(range(len(working)), key=lambda i: (working[i]["id"] in cited, -i))
+
+    prompt = render(working)
+    tokens = estimate_tokens(prompt)
+    report = BudgetReport(tokens, budget, digests_used=digests_used)
+
+    for i in trim_order:
+        if tokens <= budget:
+            break
+        if working[i].get("해설"):
+            working[i]["해설"] = ""
+            report.commentary_dropped += 1
+            prompt = render(working)
+            tokens = estimate_tokens(prompt)
+
+    dropped = set()
+    for i in trim_order:
+        if tokens <= budget or len(dropped) == len(working) - 1:
+            break
+        dropped.add(i)
+        prompt = render([v for j, v in enumerate(working) if j not in dropped])
+        tokens = estimate_tokens(prompt)
+    report.items_dropped = len(dropped)
+
+    report.tokens = tokens
+    return prompt, report
@@ -0,0 +1,198 @@
+"""
+여러 페이지가 함께 쓰는 Streamlit 화면 요소
+"""
+import time
+import uuid
+
+import streamlit as st
+
+from utils.drafts import get_draft_store
+from utils.llm import LLMError, get_client
+
+STREAMING_KEY = "llm_streaming"
+
+# 임시 저장: 사이드바의 학생 이름, 이 세션이 이어서 쓰기로 한 임시 저장 이름, 불러오기 알림
+DRAFT_LABEL_KEY = "draft_label"
+DRAFT_CLAIMED_KEY = "_draft_claimed"
+DRAFT_NOTICE_KEY = "_draft_notice"
+
+
+def get_api_key():
+    """메인 화면에서 입력한 키를 우선 쓰고, 없으면 secrets.toml 의 GEMINI_API_KEY 를 쓴다."""
+    if st.session_state.get("user_api_key"):
+        return st.session_state.user_api_key
+    try:
+        return st.secrets.get("GEMINI_API_KEY")
+    except Exception:
+        # secrets.toml 자체가 없는 경우
+        return None
+
+
+def session_user():
+    """요청 대기열을 나누는 사용자 이름. 사용자 확인을 했으면 승인된 사용자, 아니면 세션마다 만든 이름."""
+    if st.session_state.get("approved_user"):
+        return st.session_state.approved_user
+    if "_llm_user" not in st.session_state:
+        st.session_state._llm_user = f"session:{uuid.uuid4().hex[:8]}"
+    return st.session_state._llm_user
+
+
+def is_admin_user():
+    """승인된 사용자가 secrets.toml 의 admin_users 목록("소속/이름")에 있는지."""
+    user = st.session_state.get("approved_user")
+    if not user:
+        return False
+    try:
+        return user in st.secrets.get("admin_users", [])
+    except Exception:
+        return False
+
+
+def require_gemini_client(missing_message, page=None):
+    """
+    현재 세션의 API 키에 해당하는 공용 클라이언트를 이 세션 사용자 몫으로 묶어 반환한다.
+    page 는 호출 기록에 남길 페이지 이름이다. 키가 없으면 안내 후 페이지를 멈춘다.
+    """
+    api_key = get_api_key()
+    if not api_key:
+        st.error(missing_message)
+        st.stop()
+    return get_client(api_key).for_user(session_user(), page)
+
+
+def _queue_message(ahead):
+    return f"⏳ 요청이 많아 차례를 기다리고 있습니다. (앞에 {ahead}건)"
+
+
+def render_streaming_toggle():
+    st.sidebar.toggle(
+        "⚡ 생성 결과 실시간 표시",
+        value=True,
+        key=STREAMING_KEY,
+        help="켜 두면 Gemini가 만드는 문장을 도착하는 대로 바로 보여줍니다."
+    )
+
+
+def generate_with_progress(client, prompt, kind, spinner_text, placeholder=None, response_schema=None, refresh=False):
+    """
+    스트리밍 모드에서는 응답을 placeholder(없으면 현재 위치)에 실시간으로 보여주고,
+    끝나면 자리를 비운 뒤 전체 문자열을 반환한다. 스트리밍을 끄면 기존처럼 스피너 뒤에서 기다린다.
+    재시도 후에도 실패하면 오류를 화면에 표시하고 None 을 반환한다.
+    response_schema 를 주면 JSON 문자열을 받는다. 날 JSON 조각은 교사에게 보여줄 글이 아니므로
+    이때는 스트리밍 설정과 관계없이 스피너 뒤에서 기다린다.
+    '다시 생성'처럼 새 응답이 필요할 때는 refresh=True 로 캐시를 읽지 않고 새 응답을 받아 캐시를 바꾼다.
+    """
+    if response_schema is not None or not st.session_state.get(STREAMING_KEY, True):
+        wait_box = st.empty()
+        try:
+            with st.spinner(spinner_text):
+                return client.generate(
+                    prompt, kind, response_schema=response_schema, refresh=refresh,
+                    on_wait=lambda ahead: wait_box.caption(_queue_message(ahead))
+                )
+        except LLMError as e:
+            st.error(str(e))
+            return None
+        finally:
+            wait_box.empty()
+
+    target = placeholder if placeholder is not None else st.empty()
+
+    def clear_wait_box(chunks, wait_box):
+        # 첫 조각이 오면 차례를 받은 것이므로 대기 안내를 지움
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                wait_box.empty()
+            yield chunk
+
+    try:
+        with target.container():
+            st.caption(spinner_text)
+            wait_box = st.empty()
+            text = st.write_stream(clear_wait_box(
+                client.stream(
+                    prompt, kind, refresh=refresh,
+                    on_wait=lambda ahead: wait_box.caption(_queue_message(ahead))
+                ),
+                wait_box
+            ))
+        target.empty()
+        return text if isinstance(text, str) else "".join(str(part) for part in text)
+    except LLMError as e:
+        target.empty()
+        st.error(str(e))
+        return None
+
+
+# --- 임시 저장 ---
+def _resume_draft(spec, owner, label):
+    # 버튼 콜백은 페이지를 그리기 전에 실행되므로 위젯 키도 여기서 바로 채울 수 있음
+    values = get_draft_store().load(owner, spec.page, label)
+    for key in [k for k in st.session_state.keys() if spec.is_derived(k)]:
+        del st.session_state[key]
+    for key, value in values.items():
+        st.session_state[key] = value
+    st.session_state[DRAFT_LABEL_KEY] = label
+    st.session_state[DRAFT_CLAIMED_KEY] = label
+    st.session_state[DRAFT_NOTICE_KEY] = f"'{label}' 작성 내용을 불러왔습니다."
+
+
+def _delete_draft(spec, owner, label):
+    get_draft_store().delete(owner, spec.page, label)
+    if st.session_state.get(DRAFT_CLAIMED_KEY) == label:
+        del st.session_state[DRAFT_CLAIMED_KEY]
+    st.session_state[DRAFT_NOTICE_KEY] = f"'{label}' 임시 저장을 삭제했습니다."
+
+
+def render_draft_panel(spec):
+    """
+    사이드바에 임시 저장 이름 입력과 저장된 작성 내용 불러오기·삭제를 그린다.
+    사용자 확인(메인 화면)을 거친 세션에서만 쓸 수 있다.
+    """
+    owner = st.session_state.get("approved_user")
+    st.sidebar.markdown("---")
+    if not owner:
+        st.sidebar.caption("💾 메인 화면에서 사용자 확인을 하면 작성 내용이 학생별로 임시 저장됩니다.")
+        return
+
+    store = get_draft_store()
+    label = st.sidebar.text_input(
+        "💾 임시 저장할 학생 이름", key=DRAFT_LABEL_KEY,
+        help="입력하면 생성·편집한 내용이 이 이름으로 자동 저장되어, 연결이 끊겨도 다시 불러올 수 있습니다."
+    ).strip()
+    if DRAFT_NOTICE_KEY in st.session_state:
+        st.sidebar.success(st.session_state.pop(DRAFT_NOTICE_KEY))
+    if label and st.session_state.get(DRAFT_CLAIMED_KEY) != label and store.exists(owner, spec.page, label):
+        st.sidebar.warning(f"'{label}' 이름으로 저장된 내용이 있습니다. 아래에서 불러오기 전에는 자동 저장하지 않습니다.")
+    save_error = label and store.last_error(owner, spec.page, label)
+    if save_error:
+        st.sidebar.error(f"'{label}' 임시 저장에 실패했습니다. 다음에 내용이 바뀌면 다시 저장합니다. ({save_error})")
+
+    drafts = store.list_drafts(owner, spec.page)
+    if drafts:
+        saved_at = {name: updated_at for name, updated_at, _ in drafts}
+        choice = st.sidebar.selectbox(
+            "저장된 작성 내용", list(saved_at),
+            format_func=lambda name: f"{name} ({time.strftime('%m/%d %H:%M', time.localtime(saved_at[name]))})",
+            key="draft_resume_choice"
+        )
+        col_resume, col_delete = st.sidebar.columns(2)
+        col_resume.button("📂 불러오기", key="btn_draft_resume", on_click=_resume_draft, args=(spec, owner, choice))
+        col_delete.button("🗑️ 삭제", key="btn_draft_delete", on_click=_delete_draft, args=(spec, owner, choice))
+
+
+def autosave_draft(spec):
+    """
+    현재 세션의 작성 내용을 임시 저장 대기열에 올린다(바뀐 항목만, 실제 쓰기는 몇 초 모아서 백그라운드에서).
+    이미 저장된 이름은 이 세션에서 불러온 뒤에만 이어서 쓴다. 빈 세션이 저장된 내용을 덮어쓰지 않도록 하기 위함.
+    """
+    owner = st.session_state.get("approved_user")
+    label = st.session_state.get(DRAFT_LABEL_KEY, "").strip()
+    if not owner or not label:
+        return
+    store = get_draft_store()
+    if st.session_state.get(DRAFT_CLAIMED_KEY) != label:
+        if store.exists(owner, spec.page, label):
+            return
+        st.session_state[DRAFT_CLAIMED_KEY] = label
+    store.schedule_save(owner, spec.page, label, spec.collect(st.session_state))
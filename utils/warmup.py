@@ -0,0 +1,192 @@
+"""
+서버 시작 시 미리 데우기(warm-up)와 준비 상태 확인
+
+재배포 직후 첫 교사가 무거운 import, Gemini 클라이언트 생성, data/ 전체 읽기, 첫 python-docx 문서 생성을
+한꺼번에 떠안지 않도록, serve.py 가 Streamlit 서버를 열기 전에 같은 프로세스에서 warm_up() 을 돌린다.
+각 단계의 시간은 utils.profiling 에 kind="warmup" 으로 남아 관리자 페이지에서 볼 수 있다.
+
+ReadinessServer 는 부하 분산기가 확인할 작은 HTTP 서버다.
+    GET /ready : 데우기가 끝나고 Streamlit 서버가 응답하면 200, 그 전에는 503 (본문은 진행 상황 JSON)
+    GET /live  : 프로세스가 살아 있으면 항상 200
+"""
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.profiling import startup_phase
+
+HEALTH_POLL_SECONDS = 0.5
+
+
+# --- 데우기 단계 ---
+def _warm_curriculum():
+    from utils.curriculum import get_curriculum_index
+    from utils.digests import load_digests
+
+    get_curriculum_index()
+    load_digests()
+
+
+def _warm_standards_db():
+    from utils.standards_db import ensure_standards_db
+
+    ensure_standards_db()
+
+
+def _warm_documents():
+    # 템플릿을 만들고 문서를 한 번씩 써 보아 python-docx·lxml 첫 사용 비용을 미리 치름
+    from utils.documents import build_evaluation_docx, build_evaluation_report, build_iep_docx, build_meeting_docx
+
+    build_iep_docx("", "", "", "", [])
+    build_evaluation_docx(build_evaluation_report("", "1학기", [], {}, ""))
+    build_meeting_docx("", "", [], "", [], "")
+
+
+def _warm_llm():
+    # 키가 있으면 그 키의 공용 클라이언트까지 만들고, 없으면(교사가 각자 키를 넣는 경우) 라이브러리만 불러 둠
+    from utils.llm import get_client
+    from utils.llm_cache import get_response_cache
+    from utils.profiling import lazy_import
+
+    get_response_cache()
+    api_key = default_api_key()
+    if api_key:
+        get_client(api_key).model
+    else:
+        lazy_import("google.generativeai")
+        lazy_import("google.ai.generativelanguage")
+
+
+def _warm_drafts():
+    from utils.drafts import get_draft_store
+
+    get_draft_store()
+
+
+WARMUP_STEPS = (
+    ("curriculum", _warm_curriculum),
+    ("standards_db", _warm_standards_db),
+    ("documents", _warm_documents),
+    ("llm", _warm_llm),
+    ("drafts", _warm_drafts),
+)
+
+
+def default_api_key():
+    """GEMINI_API_KEY 환경 변수, 없으면 secrets.toml 의 값. 둘 다 없으면 None."""
+    if os.environ.get("GEMINI_API_KEY"):
+        return os.environ["GEMINI_API_KEY"]
+    try:
+        import streamlit as st
+
+        return st.secrets.get("GEMINI_API_KEY")
+    except Exception:
+        # secrets.toml 자체가 없는 경우
+        return None
+
+
+class WarmupState:
+    """데우기 진행 상황. 준비 상태 서버와 데우기 스레드가 함께 쓴다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = []        # [{"name", "ms", "error"}]
+        self.warmed = False
+        self.serving = False   # Streamlit 서버가 응답하기 시작함
+        self.started = time.time()
+
+    def add_step(self, name, ms, error):
+        with self._lock:
+            self.steps.append({"name": name, "ms": round(ms, 1), "error": error})
+
+    def set(self, **flags):
+        with self._lock:
+            for name, value in flags.items():
+                setattr(self, name, value)
+
+    @property
+    def ready(self):
+        return self.warmed and self.serving
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "ready": self.warmed and self.serving,
+                "warmed": self.warmed,
+                "serving": self.serving,
+                "uptime_s": round(time.time() - self.started, 1),
+                "steps": list(self.steps),
+            }
+
+
+def warm_up(state=None, log=print):
+    """
+    WARMUP_STEPS 를 차례로 실행한다. 한 단계가 실패해도 나머지는 계속하며(그 기능은 처음 쓸 때 다시 시도됨)
+    오류는 state 와 log 에 남긴다. 반환값: state
+    """
+    state = state or WarmupState()
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        error = None
+        try:
+            with startup_phase(name, kind="warmup"):
+                step()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        ms = (time.perf_counter() - started) * 1000
+        state.add_step(name, ms, error)
+        log(f"[warmup] {name}: {ms:.0f} ms" + (f" (실패: {error})" if error else ""))
+    state.set(warmed=True)
+    return state
+
+
+def wait_until_serving(state, health_url, timeout=None):
+    """Streamlit 의 /_stcore/health 가 200 을 줄 때까지 기다렸다가 state.serving 을 켠다."""
+    deadline = time.monotonic() + timeout if timeout else None
+    while deadline is None or time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(health_url, timeout=2) as response:
+                if response.status == 200:
+                    state.set(serving=True)
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(HEALTH_POLL_SECONDS)
+    return False
+
+
+class ReadinessServer:
+    def __init__(self, state, host="0.0.0.0", port=8502):
+        self.state = state
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+                if path == "/live":
+                    status, body = 200, {"live": True}
+                elif path == "/ready":
+                    body = state.snapshot()
+                    status = 200 if body["ready"] else 503
+                else:
+                    status, body = 404, {"error": "not found"}
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, name="readiness", daemon=True).start()
+        return self